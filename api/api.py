@@ -1,9 +1,20 @@
-from flask import Flask, request, jsonify
-import joblib
-import pandas as pd
+from flask import Flask, request, jsonify, Response, g
 import numpy as np
-from sklearn.preprocessing import StandardScaler
 import os
+import json
+import threading
+import time
+import warnings
+
+from features import FeaturePipeline, load_feature_spec, spec_categories
+from tree_engine import TreeEnsemble, load_tree_ensemble
+from linear_model import FusedLogisticRegression
+from prediction_cache import PredictionCache
+from lookup_table import LookupTable, table_fingerprint
+from metrics import MetricsRegistry
+from model_registry import ARTIFACTS, ModelRegistry
+from model_set import MODEL_KEYS, ModelSet, ModelUnavailableError, parse_model_list, parse_weights
+from validation import RequestSchema, ValidationError
 
 # Create Flask app
 app = Flask(__name__)
@@ -12,226 +23,722 @@ app = Flask(__name__)
 base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 models_path = os.path.join(base_path, 'models')
 
-# Load all three models
-rf_model = joblib.load(os.path.join(models_path, 'random_forest.pkl'))
-xgb_model = joblib.load(os.path.join(models_path, 'xgboost.pkl'))
-lr_model = joblib.load(os.path.join(models_path, 'logistic_regression.pkl'))
-
-# Load the saved scaler for Logistic Regression
-scaler = joblib.load(os.path.join(models_path, 'standard_scaler.pkl'))
-
-# Get the expected feature names
-try:
-    # For Random Forest, feature names should be available
-    feature_names = rf_model.feature_names_in_
-except AttributeError:
-    # Fallback features based on the notebook
-    feature_names = ['age', 'dietary_habits', 'degree', 'academic_pressure', 
-                    'cgpa', 'study_satisfaction', 'work/study_hours', 
-                    'sleep_duration', 'financial_stress', 'suicidal_thoughts', 
-                    'illness_history', 'academic_stress_combo', 'burnout_index', 
-                    'wellness_score']
-
-# Preprocessing functions for each model
+# Fallback features in the training column order from the notebook
+DEFAULT_FEATURE_NAMES = ['age', 'academic_pressure', 'cgpa', 'study_satisfaction',
+                         'sleep_duration', 'dietary_habits', 'degree',
+                         'suicidal_thoughts', 'work/study_hours', 'financial_stress',
+                         'illness_history', 'academic_stress_combo', 'burnout_index',
+                         'wellness_score']
+
+# API_MODELS selects the models to load (default: all three). A model whose
+# file is missing is left out and the ensemble averages the others.
+# The scaler is always loaded: Logistic Regression needs it, and its
+# mean/scale describe the training distribution for the probe batch.
+serving_models = parse_model_list(os.getenv('API_MODELS', ','.join(MODEL_KEYS)))
+
+# The model files are read in parallel by the registry (see initialize()).
+# MODEL_LOAD_WORKERS=1 loads them one after another; MODEL_MMAP=0 reads the
+# pickles into memory instead of memory-mapping their arrays.
+registry = ModelRegistry(
+    models_path,
+    {key: ARTIFACTS[key] for key in serving_models + ['scaler']},
+    max_workers=int(os.getenv('MODEL_LOAD_WORKERS', '0')) or None,
+    mmap=os.getenv('MODEL_MMAP', '1') == '1'
+)
+
+# How requests are encoded: category codes, derived features and column
+# order, written by training next to the models (training/feature_spec.py)
+feature_spec_path = os.getenv('FEATURE_SPEC_PATH', os.path.join(models_path, 'feature_spec.json'))
+
+# Loaded models and compiled scorers, filled in by initialize()
+rf_model = xgb_model = lr_model = scaler = None
+feature_names = DEFAULT_FEATURE_NAMES
+feature_spec = None
+feature_pipeline = None
+request_schema = None
+rf_engine = xgb_engine = lr_fused = None
+lookup_table = None
+
+# Loaded/enabled models and ensemble weights, filled in by initialize()
+model_set = None
+
+# Readiness: set once the models are loaded and compiled
+models_ready = threading.Event()
+load_error = None
+startup_seconds = None
+
+# The tree models were fitted on a DataFrame; scoring them on the plain
+# NumPy row is intentional, so silence sklearn's feature-name warning
+warnings.filterwarnings('ignore', message='X does not have valid feature names')
+
+def make_probe_batch(n_rows=256):
+    """
+    Synthetic rows around the training distribution (scaler mean/scale),
+    used to check the fast scorers against the original models at load time.
+    """
+    rng = np.random.default_rng(42)
+    return np.round(rng.normal(feature_pipeline.mean, feature_pipeline.scale_ * 1.5,
+                               size=(n_rows, len(feature_pipeline.mean))))
+
+def check_equivalence(name, fast_scorer, reference_scorer, tolerance=1e-6):
+    """
+    Raise if fast_scorer and reference_scorer disagree on the probe batch.
+    """
+    probe = make_probe_batch()
+    max_diff = np.abs(fast_scorer(probe) - reference_scorer(probe)).max()
+    if max_diff > tolerance:
+        raise ValueError(f"{name} differs from the original model by {max_diff:.2e}")
+
+def compile_tree_engine(name, model):
+    """
+    Compile a tree model into the NumPy TreeEnsemble engine.
+    The engine is checked against the library's predict_proba on a probe batch
+    around the training distribution; on any failure the library is used instead.
+    Set TREE_BACKEND=library to skip the engine entirely.
+    A compact export (scripts/export_forest.py) already is an engine, checked
+    when it was exported, and is used as is.
+    """
+    if isinstance(model, TreeEnsemble):
+        return model
+    if os.getenv('TREE_BACKEND', 'numpy').lower() == 'library':
+        return None
+    try:
+        engine = load_tree_ensemble(model)
+        check_equivalence(name, engine.predict_proba, lambda X: model.predict_proba(X)[:, 1])
+        return engine
+    except Exception as e:
+        app.logger.warning(f"Using library predict_proba for {name}: {str(e)}")
+        return None
+
+def compile_linear_scorer(model, scaler):
+    """
+    Fold the scaler into the Logistic Regression weights.
+    Falls back to scaler.transform + predict_proba if the fused scorer
+    does not reproduce sklearn's probabilities.
+    """
+    try:
+        fused = FusedLogisticRegression.from_sklearn(model, scaler)
+        check_equivalence('Logistic Regression', fused.predict_proba,
+                          lambda X: model.predict_proba(scaler.transform(X))[:, 1])
+        return fused
+    except Exception as e:
+        app.logger.warning(f"Using sklearn predict_proba for Logistic Regression: {str(e)}")
+        return None
+
+# The engine wins on single rows and small batches; past this many rows the
+# libraries' multithreaded predictors are faster (see benchmarks/bench_tree_engine.py)
+tree_engine_max_batch = int(os.getenv('TREE_ENGINE_MAX_BATCH', '256'))
+
+# Cache of model outputs keyed on the encoded feature row; the form inputs
+# are small discrete domains, so repeat submissions are common.
+# PREDICTION_CACHE_SIZE=0 disables it.
+prediction_cache = PredictionCache(
+    max_size=int(os.getenv('PREDICTION_CACHE_SIZE', '10000')),
+    ttl=float(os.getenv('PREDICTION_CACHE_TTL', '3600'))
+)
+
+def load_lookup_table():
+    """
+    Optional precomputed-grid mode: LOOKUP_TABLE_PATH points at a table built
+    by scripts/build_lookup_table.py. Returns None when unset or unusable,
+    including when it was built from other model files or another feature
+    spec than the ones loaded (its header records their hashes).
+    """
+    path = os.getenv('LOOKUP_TABLE_PATH')
+    if not path:
+        return None
+    try:
+        table = LookupTable.load(path)
+        if table.feature_names != list(feature_names):
+            raise ValueError("table was built for a different feature layout")
+        expected = table_fingerprint(models_path, registry.sources, table.model_keys, feature_spec_path, feature_spec)
+        if table.fingerprint != expected:
+            raise ValueError("table was built from different model files or a different feature spec; "
+                             "rebuild it with scripts/build_lookup_table.py")
+        app.logger.info(f"Loaded lookup table {path} ({table.table.shape[0]} cells)")
+        return table
+    except Exception as e:
+        app.logger.warning(f"Lookup table disabled: {str(e)}")
+        return None
+
+def resolve_feature_names(*models):
+    """
+    Training column order as recorded by the first model that kept it.
+    """
+    for model in models:
+        names = getattr(model, 'feature_names_in_', None)
+        if names is None and isinstance(model, TreeEnsemble):
+            names = model.feature_names
+        if names is not None:
+            return names
+    return DEFAULT_FEATURE_NAMES
+
+def initialize():
+    """
+    Load the model artifacts (in parallel) and compile the fast scorers.
+    Sets models_ready when the API can serve predictions.
+    """
+    global rf_model, xgb_model, lr_model, scaler, feature_names, feature_spec, feature_pipeline, request_schema
+    global rf_engine, xgb_engine, lr_fused, lookup_table, model_set, startup_seconds
+
+    started = time.perf_counter()
+    registry.load()
+    for key, error in registry.errors.items():
+        app.logger.warning(f"Model artifact {key} unavailable: {error}")
+
+    rf_model = registry.get('rf')
+    xgb_model = registry.get('xgb')
+    scaler = registry.get('scaler')
+    # Logistic Regression was trained on standardized features; without the scaler it can't serve
+    lr_model = registry.get('lr') if scaler is not None else None
+
+    loaded = [key for key, model in (('rf', rf_model), ('xgb', xgb_model), ('lr', lr_model)) if model is not None]
+    if not loaded:
+        raise RuntimeError("No model could be loaded: " + "; ".join(
+            f"{key}: {error}" for key, error in registry.errors.items()))
+
+    # ENSEMBLE_WEIGHTS="rf=1,xgb=2,lr=1" weights the ensemble (default: equal);
+    # MODEL_CONFIG_PATH names a JSON file that disables or reweights models at runtime
+    model_set = ModelSet(loaded, parse_weights(os.getenv('ENSEMBLE_WEIGHTS')), os.getenv('MODEL_CONFIG_PATH'))
+    if len(loaded) < len(serving_models):
+        app.logger.warning(f"Serving a degraded ensemble of {', '.join(loaded)}")
+
+    # Get the expected feature names (Random Forest keeps them from the training DataFrame)
+    feature_names = resolve_feature_names(rf_model, xgb_model, scaler)
+
+    # The models can only be served with the encoding they were trained with
+    feature_spec = load_feature_spec(feature_spec_path)
+    if list(feature_spec['feature_names']) != list(feature_names):
+        raise RuntimeError(f"Feature spec {feature_spec_path} does not match the models' feature layout")
+
+    # Compile the preprocessing once: every request is encoded straight into a
+    # NumPy row in feature_names order and shared by every loaded model
+    feature_pipeline = FeaturePipeline(feature_names, feature_spec, scaler)
+    request_schema = RequestSchema(feature_spec)
+
+    # Flat NumPy tree engines for the tree models (None when falling back to the library)
+    rf_engine = compile_tree_engine('Random Forest', rf_model) if rf_model is not None else None
+    xgb_engine = compile_tree_engine('XGBoost', xgb_model) if xgb_model is not None else None
+
+    # Logistic Regression as a single dot product with the scaler folded in
+    lr_fused = compile_linear_scorer(lr_model, scaler) if lr_model is not None else None
+
+    lookup_table = load_lookup_table()
+
+    startup_seconds = time.perf_counter() - started
+    app.logger.info(f"Models ready in {startup_seconds:.2f}s "
+                    f"(files loaded in {registry.total_seconds:.2f}s)")
+    models_ready.set()
+
+def initialize_in_background():
+    """
+    Load the models on a background thread so the process answers /health
+    (liveness) immediately; /health/ready reports 503 until they are loaded.
+    """
+    def run():
+        global load_error
+        try:
+            initialize()
+        except Exception as e:
+            load_error = str(e)
+            app.logger.error(f"Model loading failed: {load_error}")
+
+    threading.Thread(target=run, name='model-init', daemon=True).start()
+
+def wait_until_ready():
+    """
+    Block until the models are loaded; raise if loading failed.
+    """
+    while not models_ready.wait(0.1):
+        if load_error is not None:
+            raise RuntimeError(load_error)
+
+# MODEL_LOADING=eager (default) loads the models while this module is
+# imported; MODEL_LOADING=background starts serving first
+if os.getenv('MODEL_LOADING', 'eager').lower() == 'background':
+    initialize_in_background()
+else:
+    initialize()
+
+# Request metrics, served in the Prometheus text format at /metrics.
+# Every histogram is created here so the hot path only calls observe().
+metrics = MetricsRegistry()
+STAGE_LATENCY = {
+    stage: metrics.histogram('api_stage_latency_seconds',
+                             'Time spent in each stage of a prediction request', {'stage': stage})
+    for stage in ('parse', 'preprocess', 'score', 'ensemble', 'serialize')
+}
+MODEL_LATENCY = {
+    model_key: metrics.histogram('api_model_latency_seconds',
+                                 'Time spent in predict_proba per model call', {'model': model_key})
+    for model_key in ('rf', 'xgb', 'lr')
+}
+BATCH_RECORDS = metrics.histogram('api_batch_records', 'Records per /predict/batch request',
+                                  buckets=(1, 10, 50, 100, 500, 1000, 5000, 10000))
+
+def collect_cache_metrics():
+    """
+    Prediction cache and lookup table counters, read at scrape time.
+    """
+    samples = []
+    cache = prediction_cache.stats()
+    for name in ('hits', 'misses', 'evictions', 'expirations'):
+        samples.append((f'api_prediction_cache_{name}_total', 'counter',
+                        f'Prediction cache {name}', {}, cache[name]))
+    samples.append(('api_prediction_cache_entries', 'gauge', 'Rows held in the prediction cache',
+                    {}, cache['size']))
+    if lookup_table is not None:
+        table = lookup_table.stats()
+        for name in ('hits', 'misses'):
+            samples.append((f'api_lookup_table_{name}_total', 'counter',
+                            f'Lookup table {name}', {}, table[name]))
+    return samples
+
+metrics.add_collector(collect_cache_metrics)
+
 def preprocess_data_base(data_dict):
     """
-    Base preprocessing function that handles common preprocessing steps.
-    Returns a DataFrame with the proper structure based on the training data.
+    Base preprocessing shared by all models.
+    Returns a (1, n_features) NumPy row in training column order.
+    Random Forest and XGBoost use it as is (encoded, non-standardized).
     """
-    # Create feature map dictionaries
-    sleep_map = {
-        "Less than 5 hours": 0,
-        "5-6 hours": 1,
-        "7-8 hours": 2,
-        "More than 8 hours": 3,
-        "Others": 4
-    }
-    
-    binary_map = {'Yes': 1, 'No': 0}
-    
-    dietary_map = {
-        "Regular": 3,
-        "Irregular": 1,
-        "Vegetarian": 4,
-        "Non-vegetarian": 2,
-        "Vegan": 0
-    }
-    
-    degree_map = {
-        "Bachelor's": 0,
-        "Master's": 1,
-        "PhD": 2,
-        "Others": 3
-    }
+    return feature_pipeline.transform_one(data_dict)
 
-    # Create feature dictionary with proper mapping and types
-    features = {
-        'age': data_dict.get('age'),
-        'dietary_habits': dietary_map.get(data_dict.get('dietary_habits', ''), 0),
-        'degree': degree_map.get(data_dict.get('degree', ''), 0),
-        'academic_pressure': data_dict.get('academic_pressure'),
-        'cgpa': data_dict.get('cgpa'),
-        'study_satisfaction': data_dict.get('study_satisfaction'),
-        'work/study_hours': data_dict.get('work_study_hours'),
-        'sleep_duration': sleep_map.get(data_dict.get('sleep_duration', ''), 1),
-        'financial_stress': data_dict.get('financial_stress'),
-        'suicidal_thoughts': binary_map.get(data_dict.get('suicidal_thoughts', ''), 0),
-        'illness_history': binary_map.get(data_dict.get('illness_history', ''), 0)
-    }
-    
-    # Create derived features exactly as done in the notebook
-    features['academic_stress_combo'] = features['academic_pressure'] * features['financial_stress']
-    features['burnout_index'] = features['academic_pressure'] * features['work/study_hours']
-    features['wellness_score'] = features['study_satisfaction'] + features['sleep_duration'] + features['dietary_habits']
-    
-    # Convert to DataFrame
-    input_df = pd.DataFrame([features])
-    
-    # Ensure the column order matches the training order
-    if isinstance(feature_names, np.ndarray) or isinstance(feature_names, list):
-        # Ensure all required features are present
-        for feat in feature_names:
-            if feat not in input_df.columns:
-                input_df[feat] = 0  # Default value for missing features
-        # Reorder columns to match training order
-        input_df = input_df[feature_names]
-    
-    return input_df
-
-def preprocess_for_random_forest(data_dict):
-    """
-    Preprocessing pipeline for Random Forest model.
-    Random Forest was trained on encoded but non-standardized features.
-    """
-    return preprocess_data_base(data_dict)
-
-def preprocess_for_xgboost(data_dict):
-    """
-    Preprocessing pipeline for XGBoost model.
-    XGBoost was trained on encoded but non-standardized features.
-    """
-    return preprocess_data_base(data_dict)
-
-def preprocess_for_logistic_regression(data_dict):
-    """
-    Preprocessing pipeline for Logistic Regression model.
+def preprocess_for_logistic_regression(features):
+    """
     Logistic Regression was trained on standardized features.
+    Applies the saved scaler's mean/scale to an already encoded row or batch.
     """
-    # First get the base preprocessing
-    input_df = preprocess_data_base(data_dict)
-    
-    # Apply the saved scaler that was used during training
-    input_scaled = scaler.transform(input_df)
-    
-    return input_scaled
+    return feature_pipeline.scale(features)
+
+def preprocess_batch(records):
+    """
+    Vectorized preprocessing for a list of input records.
+    Returns an (n_records, n_features) matrix in training column order.
+    """
+    return feature_pipeline.transform_batch(records)
+
+def get_risk_assessment(prediction):
+    """
+    Map a depression probability to a risk level and a short message.
+    """
+    if prediction < 0.3:
+        return "Low", "Continue maintaining healthy habits!"
+    elif prediction < 0.7:
+        return "Moderate", "Consider talking to someone you trust about your feelings."
+    else:
+        return "High", "We recommend seeking professional help."
+
+# Scoring functions: encoded feature matrix -> probability of depression per row
+def score_random_forest(features):
+    # A compact export has no library model to hand big batches to
+    if rf_engine is not None and (len(features) <= tree_engine_max_batch or rf_engine is rf_model):
+        return rf_engine.predict_proba(features)
+    return rf_model.predict_proba(features)[:, 1]
+
+def score_xgboost(features):
+    if xgb_engine is not None and len(features) <= tree_engine_max_batch:
+        return xgb_engine.predict_proba(features)
+    return xgb_model.predict_proba(features)[:, 1]
+
+def score_logistic_regression(features):
+    if lr_fused is not None:
+        return lr_fused.predict_proba(features)
+    return lr_model.predict_proba(preprocess_for_logistic_regression(features))[:, 1]
+
+MODEL_SCORERS = {
+    'rf': score_random_forest,
+    'xgb': score_xgboost,
+    'lr': score_logistic_regression
+}
+
+# model_choice values that select a single model
+MODEL_CHOICES = {
+    "Random Forest": 'rf',
+    "XGBoost": 'xgb',
+    "Logistic Regression": 'lr'
+}
+
+def parse_flag(value, default=True):
+    """
+    Interpret a JSON boolean or a query-string flag ("false", "0", "no").
+    """
+    if value is None:
+        return default
+    if isinstance(value, str):
+        return value.strip().lower() not in ('false', '0', 'no', 'off')
+    return bool(value)
+
+def models_needed(model_choices, full_response, active):
+    """
+    Return the model keys that have to run to answer the given model choices.
+    The full response needs every enabled model and the ensemble needs its
+    members; otherwise only the selected ones are evaluated.
+    Raises ModelUnavailableError for a choice that can't be served.
+    """
+    needed = []
+    for choice in model_choices:
+        key = MODEL_CHOICES.get(choice)
+        if key is None:
+            if not active.ensemble_models:
+                raise ModelUnavailableError("No model is enabled for the ensemble")
+            keys = active.ensemble_models
+        elif key not in active.enabled:
+            raise ModelUnavailableError(f"{choice} is not available; enabled models: "
+                                        f"{', '.join(active.enabled)}")
+        else:
+            keys = (key,)
+        for model_key in keys:
+            if model_key not in needed:
+                needed.append(model_key)
+    if full_response:
+        return list(active.enabled)
+    return needed
+
+def run_models(features, model_keys):
+    """
+    Score the encoded features with each requested model only.
+    """
+    preds = {}
+    for key in model_keys:
+        started = time.perf_counter()
+        preds[key] = MODEL_SCORERS[key](features)
+        MODEL_LATENCY[key].observe(time.perf_counter() - started)
+    return preds
+
+def run_models_cached(features, model_keys):
+    """
+    Score a single encoded row, reusing cached model outputs.
+    Only the models missing from the cache are evaluated; on a full hit
+    no model runs at all.
+    """
+    if not prediction_cache.enabled:
+        return run_models(features, model_keys)
+
+    key = prediction_cache.make_key(features)
+    cached, missing = prediction_cache.lookup(key, model_keys)
+    if missing:
+        computed = {model_key: float(values[0]) for model_key, values in run_models(features, missing).items()}
+        prediction_cache.store(key, computed)
+        cached.update(computed)
+    return {model_key: [cached[model_key]] for model_key in model_keys}
+
+def score_request(features, model_keys):
+    """
+    Score a single encoded row: precomputed lookup table first (when loaded),
+    then the prediction cache, then live inference for off-grid rows.
+    """
+    if lookup_table is not None:
+        predictions = lookup_table.lookup(features[0], model_keys)
+        if predictions is not None:
+            return {model_key: [predictions[model_key]] for model_key in model_keys}
+    return run_models_cached(features, model_keys)
+
+def score_rows(features, model_keys):
+    """
+    score_request for a batch of encoded rows, as the ASGI micro-batcher
+    collects them: rows on the lookup table's grid are answered from it,
+    the prediction cache fills in what it holds, and each model runs once
+    on the rows it is still missing.
+    """
+    preds = {model_key: np.empty(features.shape[0]) for model_key in model_keys}
+    pending = range(features.shape[0])
+    if lookup_table is not None:
+        off_grid = []
+        for i in pending:
+            predictions = lookup_table.lookup(features[i], model_keys)
+            if predictions is None:
+                off_grid.append(i)
+                continue
+            for model_key in model_keys:
+                preds[model_key][i] = predictions[model_key]
+        pending = off_grid
+
+    cache_keys = {}
+    missing_rows = {model_key: [] for model_key in model_keys}
+    for i in pending:
+        if not prediction_cache.enabled:
+            for model_key in model_keys:
+                missing_rows[model_key].append(i)
+            continue
+        cache_keys[i] = prediction_cache.make_key(features[i:i + 1])
+        cached, missing = prediction_cache.lookup(cache_keys[i], model_keys)
+        for model_key in model_keys:
+            if model_key in cached:
+                preds[model_key][i] = cached[model_key]
+        for model_key in missing:
+            missing_rows[model_key].append(i)
+
+    computed = {}
+    for model_key, rows in missing_rows.items():
+        if not rows:
+            continue
+        values = run_models(features[rows], [model_key])[model_key]
+        preds[model_key][rows] = values
+        for i, value in zip(rows, values):
+            computed.setdefault(i, {})[model_key] = float(value)
+    for i, predictions in computed.items():
+        if i in cache_keys:
+            prediction_cache.store(cache_keys[i], predictions)
+    return preds
+
+def build_prediction(preds, i, model_choice, full_response, active):
+    """
+    Build the response for row i from the per-model prediction arrays.
+    Only models that ran appear; models_used lists the ones behind primary_prediction.
+    """
+    key = MODEL_CHOICES.get(model_choice)
+    if key is not None:
+        primary_pred = preds[key][i]
+        models_used = [key]
+    else:
+        primary_pred = active.ensemble(preds, i)
+        models_used = list(active.ensemble_models)
+
+    # Determine risk level based on primary prediction
+    risk_level, message = get_risk_assessment(primary_pred)
+
+    result = {}
+    if full_response:
+        for model_key in active.enabled:
+            result[f'{model_key}_prediction'] = float(preds[model_key][i])
+        if active.ensemble_models:
+            result['ensemble_prediction'] = float(active.ensemble(preds, i))
+    elif key is not None:
+        result[f'{key}_prediction'] = float(primary_pred)
+    else:
+        result['ensemble_prediction'] = float(primary_pred)
+
+    result.update({
+        'primary_prediction': float(primary_pred),
+        'selected_model': model_choice,
+        'models_used': models_used,
+        'risk_level': risk_level,
+        'message': message
+    })
+    return result
+
+def predict_records(records, default_choice='Ensemble (All Models)', default_full_response=True, cached=False):
+    """
+    Score a list of request records in one vectorized pass.
+    Each record may carry its own model_choice and full_response; every model
+    needed by any record runs once on the whole batch. With cached=True the
+    records are single requests batched together and are scored like
+    /predict scores them: lookup table and prediction cache first (score_rows).
+    """
+    active = model_set.current()
+    model_choices = [record.get('model_choice', default_choice) for record in records]
+    full_responses = [parse_flag(record.get('full_response'), default_full_response) for record in records]
+
+    needed = []
+    for model_choice, full_response in zip(model_choices, full_responses):
+        for model_key in models_needed([model_choice], full_response, active):
+            if model_key not in needed:
+                needed.append(model_key)
+
+    # Preprocess the whole batch once and run each needed model once on it
+    started = time.perf_counter()
+    batch_features = preprocess_batch(records)
+    preprocessed = time.perf_counter()
+    preds = score_rows(batch_features, needed) if cached else run_models(batch_features, needed)
+    scored = time.perf_counter()
+
+    # Build one result per record, in input order
+    results = [build_prediction(preds, i, model_choice, full_response, active)
+               for i, (model_choice, full_response) in enumerate(zip(model_choices, full_responses))]
+
+    STAGE_LATENCY['preprocess'].observe(preprocessed - started)
+    STAGE_LATENCY['score'].observe(scored - preprocessed)
+    STAGE_LATENCY['ensemble'].observe(time.perf_counter() - scored)
+    return results
+
+NDJSON_MIMETYPES = ('application/x-ndjson', 'application/jsonl')
+
+def parse_batch_records(body, mimetype):
+    """
+    Read a /predict/batch body (bytes) as either a JSON array (optionally
+    wrapped in {"records": [...]}) or, for an NDJSON mimetype,
+    newline-delimited JSON (one record per line). Shared by the Flask and
+    ASGI servers.
+    """
+    if mimetype in NDJSON_MIMETYPES:
+        return [json.loads(line) for line in body.decode('utf-8').splitlines() if line.strip()]
+
+    try:
+        data = json.loads(body)
+    except ValueError:
+        data = None
+    if isinstance(data, dict):
+        data = data.get('records')
+    if not isinstance(data, list):
+        raise ValueError("Expected a JSON array of records or {\"records\": [...]}")
+    return data
+
+def serialize_batch(predictions, mimetype):
+    """
+    (body, mimetype) of a /predict/batch response: NDJSON in, NDJSON out.
+    """
+    if mimetype in NDJSON_MIMETYPES:
+        return '\n'.join(json.dumps(p) for p in predictions) + '\n', 'application/x-ndjson'
+    return json.dumps({'predictions': predictions, 'count': len(predictions)}), 'application/json'
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    started = g.get('request_started')
+    if started is not None:
+        labels = {'endpoint': request.url_rule.rule if request.url_rule else 'unmatched'}
+        metrics.histogram('api_request_latency_seconds', 'End-to-end request latency',
+                          labels).observe(time.perf_counter() - started)
+        labels['status'] = str(response.status_code)
+        metrics.counter('api_requests_total', 'Requests served', labels).inc()
+    return response
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    # Per-process metrics: under gunicorn each worker reports its own
+    return Response(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+def not_ready_response():
+    if load_error is not None:
+        return jsonify({'status': 'failed', 'error': load_error}), 503
+    return jsonify({'status': 'loading', 'error': 'Models are still loading'}), 503
+
+def feature_spec_status():
+    if feature_pipeline is None:
+        return None
+    return {
+        'version': feature_pipeline.spec_version,
+        'created': feature_pipeline.spec_created,
+        'path': feature_spec_path
+    }
+
+@app.route('/features', methods=['GET'])
+def feature_categories():
+    # The accepted values of every categorical input, in code order
+    if not models_ready.is_set():
+        return not_ready_response()
+    return jsonify({'spec_version': feature_spec['spec_version'], 'categories': spec_categories(feature_spec)})
 
 @app.route('/health', methods=['GET'])
 def health_check():
+    # Liveness: answers as soon as the process is up, ready or not.
     # Also return the feature names for debugging
-    return jsonify({'status': 'ok', 'message': 'API is running', 'features': feature_names.tolist() if hasattr(feature_names, 'tolist') else feature_names})
+    return jsonify({
+        'status': 'ok',
+        'message': 'API is running',
+        'ready': models_ready.is_set(),
+        'startup_seconds': startup_seconds,
+        'models': registry.status(),
+        'model_set': model_set.status() if model_set is not None else None,
+        'features': feature_names.tolist() if hasattr(feature_names, 'tolist') else feature_names,
+        'feature_spec': feature_spec_status(),
+        'cache': prediction_cache.stats(),
+        'lookup_table': lookup_table.stats() if lookup_table is not None else None
+    })
+
+@app.route('/health/ready', methods=['GET'])
+def readiness_check():
+    # Readiness: 200 only once the models can serve predictions
+    if not models_ready.is_set():
+        return not_ready_response()
+    return jsonify({'status': 'ready', 'startup_seconds': startup_seconds})
 
 @app.route('/predict', methods=['POST'])
 def predict():
+    if not models_ready.is_set():
+        return not_ready_response()
     try:
-        # Parse JSON data from request
-        data = request.get_json()
+        # Parse and validate the JSON body before anything is encoded
+        started = time.perf_counter()
+        data = request_schema.validate(request.get_json(silent=True))
+        parsed = time.perf_counter()
         
         # Get the selected model (defaults to ensemble if not specified)
         model_choice = data.get('model_choice', 'Ensemble (All Models)')
         
         app.logger.info(f"Selected model: {model_choice}")
         
-        # Process data based on the selected model
-        if model_choice == "Random Forest":
-            # Process data for Random Forest
-            rf_input = preprocess_for_random_forest(data)
-            rf_pred = rf_model.predict_proba(rf_input)[0][1]
-            
-            # For completeness, calculate predictions from other models too
-            xgb_input = preprocess_for_xgboost(data)
-            xgb_pred = xgb_model.predict_proba(xgb_input)[0][1]
-            
-            lr_input = preprocess_for_logistic_regression(data)
-            lr_pred = lr_model.predict_proba(lr_input)[0][1]
-            
-            # Primary prediction is from Random Forest
-            primary_pred = rf_pred
-            
-        elif model_choice == "XGBoost":
-            # Process data for XGBoost
-            xgb_input = preprocess_for_xgboost(data)
-            xgb_pred = xgb_model.predict_proba(xgb_input)[0][1]
-            
-            # For completeness, calculate predictions from other models too
-            rf_input = preprocess_for_random_forest(data)
-            rf_pred = rf_model.predict_proba(rf_input)[0][1]
-            
-            lr_input = preprocess_for_logistic_regression(data)
-            lr_pred = lr_model.predict_proba(lr_input)[0][1]
-            
-            # Primary prediction is from XGBoost
-            primary_pred = xgb_pred
-            
-        elif model_choice == "Logistic Regression":
-            # Process data for Logistic Regression (with standardization)
-            lr_input = preprocess_for_logistic_regression(data)
-            lr_pred = lr_model.predict_proba(lr_input)[0][1]
-            
-            # For completeness, calculate predictions from other models too
-            rf_input = preprocess_for_random_forest(data)
-            rf_pred = rf_model.predict_proba(rf_input)[0][1]
-            
-            xgb_input = preprocess_for_xgboost(data)
-            xgb_pred = xgb_model.predict_proba(xgb_input)[0][1]
-            
-            # Primary prediction is from Logistic Regression
-            primary_pred = lr_pred
-            
-        else:  # Ensemble (All Models)
-            # Process data for each model with its specific pipeline
-            rf_input = preprocess_for_random_forest(data)
-            rf_pred = rf_model.predict_proba(rf_input)[0][1]
-            
-            xgb_input = preprocess_for_xgboost(data)
-            xgb_pred = xgb_model.predict_proba(xgb_input)[0][1]
-            
-            lr_input = preprocess_for_logistic_regression(data)
-            lr_pred = lr_model.predict_proba(lr_input)[0][1]
-            
-            # Calculate ensemble prediction
-            primary_pred = (rf_pred + xgb_pred + lr_pred) / 3
-        
-        # Calculate ensemble prediction (always calculate this for consistency)
-        ensemble_pred = (rf_pred + xgb_pred + lr_pred) / 3
-        
-        # Determine risk level based on primary prediction
-        if primary_pred < 0.3:
-            risk_level = "Low"
-            message = "Continue maintaining healthy habits!"
-        elif primary_pred < 0.7:
-            risk_level = "Moderate"
-            message = "Consider talking to someone you trust about your feelings."
-        else:
-            risk_level = "High"
-            message = "We recommend seeking professional help."
+        # Set full_response to false to evaluate only the selected model
+        full_response = parse_flag(data.get('full_response', request.args.get('full_response')))
+
+        # Preprocess once; the same row feeds every model that has to run
+        preprocess_started = time.perf_counter()
+        features = preprocess_data_base(data)
+        preprocessed = time.perf_counter()
+        active = model_set.current()
+        preds = score_request(features, models_needed([model_choice], full_response, active))
+        scored = time.perf_counter()
+        result = build_prediction(preds, 0, model_choice, full_response, active)
+        built = time.perf_counter()
 
         # Return prediction results
-        return jsonify({
-            'rf_prediction': float(rf_pred),
-            'xgb_prediction': float(xgb_pred),
-            'lr_prediction': float(lr_pred),
-            'ensemble_prediction': float(ensemble_pred),
-            'primary_prediction': float(primary_pred),
-            'selected_model': model_choice,
-            'risk_level': risk_level,
-            'message': message
-        })
-    
+        response = jsonify(result)
+
+        STAGE_LATENCY['parse'].observe(parsed - started)
+        STAGE_LATENCY['preprocess'].observe(preprocessed - preprocess_started)
+        STAGE_LATENCY['score'].observe(scored - preprocessed)
+        STAGE_LATENCY['ensemble'].observe(built - scored)
+        STAGE_LATENCY['serialize'].observe(time.perf_counter() - built)
+        return response
+
+    except ValidationError as e:
+        return jsonify(e.to_dict()), 400
+
+    except ModelUnavailableError as e:
+        return jsonify({'error': str(e)}), 400
+
     except Exception as e:
         app.logger.error(f"Prediction error: {str(e)}")
         import traceback
         app.logger.error(traceback.format_exc())
         return jsonify({'error': str(e)}), 500
 
+@app.route('/predict/batch', methods=['POST'])
+def predict_batch():
+    if not models_ready.is_set():
+        return not_ready_response()
+    try:
+        # Parse the records (JSON array or NDJSON body)
+        started = time.perf_counter()
+        records = request_schema.validate_batch(parse_batch_records(request.get_data(), request.mimetype))
+        STAGE_LATENCY['parse'].observe(time.perf_counter() - started)
+        if not records:
+            return jsonify({'predictions': [], 'count': 0})
+
+        # Default model choice for records that don't specify one
+        default_choice = request.args.get('model_choice', 'Ensemble (All Models)')
+
+        app.logger.info(f"Batch prediction for {len(records)} records")
+
+        # Set full_response=false to evaluate only the selected models
+        full_response = parse_flag(request.args.get('full_response'))
+        predictions = predict_records(records, default_choice, full_response)
+        BATCH_RECORDS.observe(len(records))
+
+        # NDJSON in, NDJSON out
+        serialize_started = time.perf_counter()
+        body, mimetype = serialize_batch(predictions, request.mimetype)
+        response = Response(body, mimetype=mimetype)
+        STAGE_LATENCY['serialize'].observe(time.perf_counter() - serialize_started)
+        return response
+
+    except ValidationError as e:
+        return jsonify(e.to_dict()), 400
+
+    except (ValueError, TypeError) as e:
+        app.logger.error(f"Batch request error: {str(e)}")
+        return jsonify({'error': str(e)}), 400
+
+    except Exception as e:
+        app.logger.error(f"Batch prediction error: {str(e)}")
+        import traceback
+        app.logger.error(traceback.format_exc())
+        return jsonify({'error': str(e)}), 500
+
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    # Flask development server; use gunicorn -c api/gunicorn.conf.py in production
+    app.run(debug=os.getenv('FLASK_DEBUG', '0') == '1', host='0.0.0.0', port=int(os.getenv('PORT', '5000')))
\ No newline at end of file
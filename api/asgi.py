@@ -0,0 +1,193 @@
+"""
+Asyncio serving mode with request micro-batching.
+
+    uvicorn asgi:app --app-dir api --host 0.0.0.0 --port 5000
+
+Concurrent POST /predict requests are queued and scored together: a batch
+is flushed after MICROBATCH_WAIT_MS milliseconds (default 2) or as soon as
+MICROBATCH_MAX_SIZE requests (default 32) are waiting, and pushed through
+the models in one vectorized call. Like the Flask API, each request is
+answered from the lookup table or the prediction cache when they have it,
+so only the rest of a batch runs through the models. Responses match the
+Flask API, and /predict/batch takes the same JSON or NDJSON bodies and
+?model_choice= and ?full_response= parameters.
+
+Routes: GET /health, GET /health/ready, GET /stats (batch-size and wait-time histograms),
+GET /metrics (Prometheus text, including the micro-batch histograms),
+GET /features, POST /predict, POST /predict/batch.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from urllib.parse import parse_qs
+
+import api
+from microbatch import BatcherStopped, MicroBatcher
+
+logger = logging.getLogger('asgi')
+
+def predict_requests(records):
+    return api.predict_records(records, cached=True)
+
+
+batcher = MicroBatcher(
+    predict_requests,
+    max_batch_size=int(os.getenv('MICROBATCH_MAX_SIZE', '32')),
+    max_wait=float(os.getenv('MICROBATCH_WAIT_MS', '2')) / 1000
+)
+api.metrics.register('api_microbatch_size', 'Requests per micro-batch', batcher.batch_size)
+api.metrics.register('api_microbatch_wait_seconds', 'Time a request waited in the micro-batch queue',
+                     batcher.wait_time)
+
+ROUTES = {('POST', '/predict'), ('POST', '/predict/batch'), ('GET', '/health'), ('GET', '/health/ready'),
+          ('GET', '/features'), ('GET', '/stats'), ('GET', '/metrics')}
+
+
+async def read_body(receive):
+    body = b''
+    while True:
+        message = await receive()
+        body += message.get('body', b'')
+        if not message.get('more_body', False):
+            return body
+
+
+def request_mimetype(scope):
+    for name, value in scope.get('headers', []):
+        if name.lower() == b'content-type':
+            return value.decode('latin-1').split(';')[0].strip().lower()
+    return ''
+
+
+def query_params(scope):
+    return {name: values[0] for name, values in parse_qs(scope.get('query_string', b'').decode('latin-1')).items()}
+
+
+async def send_body(send, status, body, content_type=b'application/json'):
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', content_type), (b'content-length', str(len(body)).encode())]
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def send_json(send, status, payload):
+    await send_body(send, status, json.dumps(payload).encode())
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await batcher.start()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await batcher.stop()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def predict(scope, receive, send):
+    try:
+        data = api.request_schema.validate(json.loads(await read_body(receive)))
+        full_response = query_params(scope).get('full_response')
+        if 'full_response' not in data and full_response is not None:
+            data = dict(data, full_response=full_response)
+    except api.ValidationError as e:
+        await send_json(send, 400, e.to_dict())
+        return
+    except ValueError as e:
+        await send_json(send, 400, {'error': str(e)})
+        return
+    try:
+        await send_json(send, 200, await batcher.submit(data))
+    except BatcherStopped as e:
+        await send_json(send, 503, {'error': str(e)})
+    except api.ModelUnavailableError as e:
+        await send_json(send, 400, {'error': str(e)})
+    except Exception as e:
+        logger.error(f"Prediction error: {str(e)}")
+        await send_json(send, 500, {'error': str(e)})
+
+
+async def predict_batch(scope, receive, send):
+    try:
+        mimetype = request_mimetype(scope)
+        records = api.request_schema.validate_batch(api.parse_batch_records(await read_body(receive), mimetype))
+        query = query_params(scope)
+        default_choice = query.get('model_choice', 'Ensemble (All Models)')
+        full_response = api.parse_flag(query.get('full_response'))
+        # Already a batch: score it directly, off the event loop
+        predictions = await asyncio.get_running_loop().run_in_executor(
+            None, api.predict_records, records, default_choice, full_response)
+        api.BATCH_RECORDS.observe(len(records))
+        body, content_type = api.serialize_batch(predictions, mimetype)
+        await send_body(send, 200, body.encode(), content_type.encode())
+    except api.ValidationError as e:
+        await send_json(send, 400, e.to_dict())
+    except (ValueError, TypeError) as e:
+        await send_json(send, 400, {'error': str(e)})
+    except Exception as e:
+        logger.error(f"Batch prediction error: {str(e)}")
+        await send_json(send, 500, {'error': str(e)})
+
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        return
+
+    route = (scope['method'], scope['path'])
+    started = time.perf_counter()
+    status = {}
+
+    async def send_tracked(message):
+        if message['type'] == 'http.response.start':
+            status['code'] = message['status']
+        await send(message)
+
+    await dispatch(scope, route, receive, send_tracked)
+
+    labels = {'endpoint': route[1] if route in ROUTES else 'unmatched'}
+    api.metrics.histogram('api_request_latency_seconds', 'End-to-end request latency',
+                          labels).observe(time.perf_counter() - started)
+    labels['status'] = str(status.get('code', 500))
+    api.metrics.counter('api_requests_total', 'Requests served', labels).inc()
+
+
+async def send_not_ready(send):
+    if api.load_error is not None:
+        await send_json(send, 503, {'status': 'failed', 'error': api.load_error})
+    else:
+        await send_json(send, 503, {'status': 'loading', 'error': 'Models are still loading'})
+
+
+async def dispatch(scope, route, receive, send):
+    if route in (('POST', '/predict'), ('POST', '/predict/batch'), ('GET', '/health/ready'), ('GET', '/features')) \
+            and not api.models_ready.is_set():
+        await send_not_ready(send)
+    elif route == ('POST', '/predict'):
+        await predict(scope, receive, send)
+    elif route == ('POST', '/predict/batch'):
+        await predict_batch(scope, receive, send)
+    elif route == ('GET', '/health'):
+        await send_json(send, 200, {'status': 'ok', 'message': 'API is running', 'mode': 'asgi-microbatch',
+                                    'ready': api.models_ready.is_set(), 'models': api.registry.status(),
+                                    'feature_spec': api.feature_spec_status(), 'cache': api.prediction_cache.stats(),
+                                    'lookup_table': api.lookup_table.stats() if api.lookup_table is not None else None})
+    elif route == ('GET', '/health/ready'):
+        await send_json(send, 200, {'status': 'ready', 'startup_seconds': api.startup_seconds})
+    elif route == ('GET', '/features'):
+        await send_json(send, 200, {'spec_version': api.feature_spec['spec_version'],
+                                    'categories': api.spec_categories(api.feature_spec)})
+    elif route == ('GET', '/stats'):
+        await send_json(send, 200, {'microbatch': batcher.stats()})
+    elif route == ('GET', '/metrics'):
+        await send_body(send, 200, api.metrics.render().encode(), b'text/plain; version=0.0.4; charset=utf-8')
+    else:
+        await send_json(send, 404, {'error': 'Not found'})
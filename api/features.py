@@ -0,0 +1,195 @@
+import json
+import threading
+import numpy as np
+
+# feature_spec.json layout this module understands (see training/feature_spec.py)
+FEATURE_SPEC_VERSION = 1
+
+
+def load_feature_spec(path):
+    """
+    Read a feature spec written by training (models/feature_spec.json).
+    """
+    with open(path) as f:
+        spec = json.load(f)
+    if spec.get('spec_version') != FEATURE_SPEC_VERSION:
+        raise ValueError(f"Unsupported feature spec version {spec.get('spec_version')!r} in {path} "
+                         f"(expected {FEATURE_SPEC_VERSION})")
+    return spec
+
+
+def spec_categories(spec):
+    """
+    {request key: categories in code order} for the spec's categorical features.
+    """
+    return {
+        feature['key']: sorted(feature['categories'], key=feature['categories'].get)
+        for feature in spec['features'] if feature['type'] == 'categorical'
+    }
+
+
+class FeaturePipeline:
+    """
+    Compiled preprocessing pipeline.
+    Compiles the feature spec against feature_names once: every base feature
+    is resolved to its column index and every category table to a dict of
+    float codes, so a request is encoded straight into a preallocated NumPy
+    row in training column order, with no intermediate dict or DataFrame.
+    Values outside a category table encode as the spec's default and are
+    counted per request key in unknown_counts().
+    """
+
+    def __init__(self, feature_names, spec, scaler=None):
+        self.feature_names = list(feature_names)
+        self.n_features = len(self.feature_names)
+        self.spec_version = spec['spec_version']
+        self.spec_created = spec.get('created')
+        index = {name: i for i, name in enumerate(self.feature_names)}
+
+        # Base features that the models actually use, as (column, key, codes or None for numeric, default)
+        self._base = []
+        self.categories = {}
+        for feature in spec['features']:
+            if feature['name'] not in index:
+                continue
+            codes = None
+            default = None
+            if feature['type'] == 'categorical':
+                codes = {category: float(code) for category, code in feature['categories'].items()}
+                default = float(feature['default'])
+                self.categories[feature['key']] = list(feature['categories'])
+            self._base.append((index[feature['name']], feature['key'], codes, default))
+        self.base_features = [(self.feature_names[col], key, codes is not None)
+                              for col, key, codes, _ in self._base]
+
+        # Derived features as column indices into the same row
+        self._derived = [(index[derived['name']], derived['op'], [index[name] for name in derived['inputs']])
+                         for derived in spec['derived'] if derived['name'] in index]
+
+        # Cached StandardScaler parameters for the Logistic Regression path
+        if scaler is not None:
+            self.mean = np.asarray(scaler.mean_, dtype=float)
+            self.scale_ = np.asarray(scaler.scale_, dtype=float)
+        else:
+            self.mean = np.zeros(self.n_features)
+            self.scale_ = np.ones(self.n_features)
+
+        # Unknown category counts, keyed by request key
+        self._unknown = {key: 0 for _, key, codes, _ in self._base if codes is not None}
+        self._unknown_lock = threading.Lock()
+
+        # One preallocated row per thread (Flask may serve requests concurrently)
+        self._local = threading.local()
+
+    def _row_buffer(self):
+        row = getattr(self._local, 'row', None)
+        if row is None:
+            row = np.zeros((1, self.n_features))
+            self._local.row = row
+        return row
+
+    def _count_unknown(self, key, count):
+        with self._unknown_lock:
+            self._unknown[key] += count
+
+    def unknown_counts(self):
+        with self._unknown_lock:
+            return dict(self._unknown)
+
+    def transform_one(self, data_dict, out=None):
+        """
+        Encode one request into a (1, n_features) row in feature_names order.
+        The row is reused by the calling thread; copy it to keep it.
+        """
+        row = out if out is not None else self._row_buffer()
+        values = row[0]
+        values[:] = 0  # Default value for features the request doesn't provide
+
+        for col, key, codes, default in self._base:
+            if codes is None:
+                values[col] = data_dict.get(key)
+            else:
+                code = codes.get(data_dict.get(key))
+                if code is None:
+                    code = default
+                    self._count_unknown(key, 1)
+                values[col] = code
+
+        for col, op, inputs in self._derived:
+            if op == 'mul':
+                values[col] = values[inputs[0]] * values[inputs[1]]
+            else:
+                total = values[inputs[0]]
+                for i in inputs[1:]:
+                    total += values[i]
+                values[col] = total
+
+        return row
+
+    def _encode_categories(self, key, codes, default, values):
+        """
+        Codes for a column of category values: each distinct value is looked
+        up once, then the codes are gathered with one array index.
+        """
+        uniques, inverse = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+        table = np.array([codes.get(value, np.nan) for value in uniques.tolist()], dtype=float)
+        unknown = np.isnan(table)
+        if unknown.any():
+            self._count_unknown(key, int(np.count_nonzero(unknown[inverse])))
+            table[unknown] = default
+        return table[inverse]
+
+    def transform_batch(self, records):
+        """
+        Encode a list of requests into an (n_records, n_features) matrix,
+        filling one column at a time.
+        """
+        matrix = np.zeros((len(records), self.n_features))
+
+        for col, key, codes, default in self._base:
+            if codes is None:
+                matrix[:, col] = [record.get(key) for record in records]
+            else:
+                matrix[:, col] = self._encode_categories(key, codes, default,
+                                                         [record.get(key) for record in records])
+
+        return self.fill_derived(matrix)
+
+    def transform_columns(self, columns, n_rows):
+        """
+        Encode column-oriented input ({request key: sequence of n_rows values},
+        e.g. the columns of a DataFrame chunk) into an (n_rows, n_features)
+        matrix. Missing keys leave their column at 0, as in transform_one.
+        """
+        matrix = np.zeros((n_rows, self.n_features))
+
+        for col, key, codes, default in self._base:
+            values = columns.get(key)
+            if values is None:
+                continue
+            if codes is None:
+                matrix[:, col] = np.asarray(values, dtype=float)
+            else:
+                matrix[:, col] = self._encode_categories(key, codes, default, values)
+
+        return self.fill_derived(matrix)
+
+    def fill_derived(self, matrix):
+        """
+        Compute the derived feature columns of an encoded matrix in place.
+        """
+        for col, op, inputs in self._derived:
+            if op == 'mul':
+                np.multiply(matrix[:, inputs[0]], matrix[:, inputs[1]], out=matrix[:, col])
+            else:
+                matrix[:, col] = matrix[:, inputs[0]]
+                for i in inputs[1:]:
+                    matrix[:, col] += matrix[:, i]
+
+        return matrix
+
+    def scale(self, X):
+        """
+        StandardScaler transform using the cached mean/scale arrays.
+        """
+        return (X - self.mean) / self.scale_
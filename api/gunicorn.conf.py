@@ -0,0 +1,35 @@
+# Gunicorn configuration for the prediction API.
+#
+#     gunicorn -c api/gunicorn.conf.py
+#
+# Settings can be overridden with environment variables:
+#   PORT            port to bind (default 5000)
+#   API_WORKERS     worker processes (default: number of CPUs)
+#   API_THREADS     threads per worker (default 1; >1 switches to the gthread worker)
+#   API_TIMEOUT     worker timeout in seconds (default 30)
+#   API_PRELOAD     load models in the master before forking (default 1)
+import multiprocessing
+import os
+
+# Each worker is single-threaded numerically: the models are small, and
+# library thread pools in every worker would oversubscribe the CPUs.
+# This must be set before numpy/xgboost are imported by the preloaded app.
+for var in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS'):
+    os.environ.setdefault(var, '1')
+
+chdir = os.path.dirname(os.path.abspath(__file__))
+wsgi_app = 'wsgi:application'
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv('API_WORKERS', multiprocessing.cpu_count()))
+threads = int(os.getenv('API_THREADS', '1'))
+worker_class = 'gthread' if threads > 1 else 'sync'
+timeout = int(os.getenv('API_TIMEOUT', '30'))
+keepalive = 5
+
+# Load the models once in the master; workers share them copy-on-write
+preload_app = os.getenv('API_PRELOAD', '1') == '1'
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('API_LOG_LEVEL', 'info')
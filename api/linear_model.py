@@ -0,0 +1,52 @@
+import numpy as np
+
+
+class FusedLogisticRegression:
+    """
+    Binary logistic regression with the StandardScaler folded into the weights.
+    sigmoid(((x - mean) / scale) . coef + b) == sigmoid(x . (coef / scale) + b'),
+    with b' = b - sum(coef * mean / scale), so scoring needs one dot product.
+    """
+
+    def __init__(self, weights, bias):
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.bias = float(bias)
+
+    @classmethod
+    def from_sklearn(cls, model, scaler=None):
+        """
+        Fold a fitted StandardScaler into a fitted binary LogisticRegression.
+        """
+        coef = np.asarray(model.coef_, dtype=np.float64)
+        if coef.shape[0] != 1:
+            raise ValueError("Only binary logistic regression is supported")
+        coef = coef[0]
+        intercept = float(np.ravel(model.intercept_)[0])
+
+        mean = np.zeros_like(coef)
+        scale = np.ones_like(coef)
+        if scaler is not None:
+            if getattr(scaler, 'mean_', None) is not None:
+                mean = np.asarray(scaler.mean_, dtype=np.float64)
+            if getattr(scaler, 'scale_', None) is not None:
+                scale = np.asarray(scaler.scale_, dtype=np.float64)
+
+        weights = coef / scale
+        bias = intercept - np.dot(weights, mean)
+        return cls(weights, bias)
+
+    def decision_function(self, X):
+        """
+        Linear margin for each row of X (a single row or a batch).
+        """
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        return X @ self.weights + self.bias
+
+    def predict_proba(self, X):
+        """
+        Probability of the positive class for each row of X.
+        """
+        # Numerically stable sigmoid: 1 / (1 + exp(-z)) == exp(-log(1 + exp(-z)))
+        return np.exp(-np.logaddexp(0.0, -self.decision_function(X)))
@@ -0,0 +1,212 @@
+import hashlib
+import json
+import os
+import threading
+import numpy as np
+
+# Probabilities are stored as uint16: p * QUANT_SCALE, rounded.
+# MISSING marks a model that was not available when the table was built.
+QUANT_SCALE = 65534
+MISSING = 65535
+
+# Grid axes are dicts, stored as such in the table header:
+# - categorical: {'name', 'categories', 'values'}, the spec's category names
+#   and their codes; a value is on-grid when its code is one of values.
+# - numeric: {'name', 'start', 'step', 'count', 'snap'}; a value is on-grid
+#   when it is within snap of a grid point (snap 0: it must match exactly).
+# Categorical axes are built from the feature spec (spec_axes), so they cover
+# the codes the models were trained with.
+
+# Default numeric grid: (feature name, first value, step, number of values, snap).
+# Age, CGPA and work/study hours are bucketed: any value inside the covered
+# range is answered from the nearest grid point.
+NUMERIC_AXES = [
+    ('academic_pressure', 1, 1, 10, 0),
+    ('study_satisfaction', 1, 1, 10, 0),
+    ('financial_stress', 1, 1, 10, 0),
+    ('age', 17, 4, 5, 2),
+    ('cgpa', 5.0, 1.25, 5, 0.625),
+    ('work/study_hours', 0, 3, 5, 1.5)
+]
+
+
+def header_path(table_path):
+    """
+    The JSON header lives next to the .npy table: lookup_table.npy -> lookup_table.json.
+    """
+    return os.path.splitext(table_path)[0] + '.json'
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def table_fingerprint(models_path, sources, model_keys, spec_path, spec):
+    """
+    What a table's probabilities depend on: the sha256 of the file behind
+    each model in model_keys (and of the scaler, for Logistic Regression),
+    of the feature spec that fixed the category codes, and the spec
+    version. sources maps artifact keys to file names in models_path, as
+    recorded by the API's ModelRegistry.
+    """
+    keys = list(model_keys) + (['scaler'] if 'lr' in model_keys else [])
+    return {
+        'models': {key: file_sha256(os.path.join(models_path, sources[key])) for key in keys},
+        'feature_spec_sha256': file_sha256(spec_path),
+        'feature_spec_version': spec['spec_version']
+    }
+
+
+def spec_axes(spec, numeric_axes=NUMERIC_AXES, categories=None):
+    """
+    Grid axes for the feature spec: one per categorical feature, covering
+    all of its categories in code order unless categories maps the feature
+    name to the category names to cover, followed by numeric_axes.
+    """
+    axes = []
+    for feature in spec['features']:
+        if feature['type'] != 'categorical':
+            continue
+        codes = feature['categories']
+        names = (categories or {}).get(feature['name']) or sorted(codes, key=codes.get)
+        axes.append({'name': feature['name'], 'categories': list(names), 'values': [codes[name] for name in names]})
+    for name, start, step, count, snap in numeric_axes:
+        axes.append({'name': name, 'start': start, 'step': step, 'count': count, 'snap': snap})
+    return axes
+
+
+def axis_size(axis):
+    return len(axis['values']) if 'values' in axis else axis['count']
+
+
+def grid_shape(axes):
+    return tuple(axis_size(axis) for axis in axes)
+
+
+def grid_matrix(axes, feature_names, flat_indices, pipeline):
+    """
+    Encoded feature rows for the given flat grid indices, derived features included.
+    """
+    index = {name: i for i, name in enumerate(feature_names)}
+    matrix = np.zeros((len(flat_indices), len(feature_names)))
+    positions = np.unravel_index(flat_indices, grid_shape(axes))
+    for axis, position in zip(axes, positions):
+        if 'values' in axis:
+            matrix[:, index[axis['name']]] = np.asarray(axis['values'], dtype=float)[position]
+        else:
+            matrix[:, index[axis['name']]] = axis['start'] + position * axis['step']
+    return pipeline.fill_derived(matrix)
+
+
+def quantize(probabilities):
+    return np.rint(np.asarray(probabilities) * QUANT_SCALE).astype(np.uint16)
+
+
+class LookupTable:
+    """
+    Read-only, memory-mapped table of precomputed model outputs over the
+    discrete input grid. A lookup is pure index arithmetic on the encoded
+    feature row; rows off the grid return None so the caller can fall back
+    to live inference.
+    """
+
+    def __init__(self, table, axes, model_keys, feature_names, fingerprint=None):
+        self.table = table
+        self.axes = [dict(axis) for axis in axes]
+        self.model_keys = list(model_keys)
+        self.feature_names = list(feature_names)
+        self.fingerprint = fingerprint
+        # Written by every serving thread, read by /metrics and /health
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        # Row-major strides, resolved against the feature row layout once.
+        # Categorical axes map code -> position; numeric axes keep their range.
+        index = {name: i for i, name in enumerate(self.feature_names)}
+        strides = np.cumprod((grid_shape(self.axes) + (1,))[::-1])[::-1][1:]
+        self._axes = []
+        for axis, stride in zip(self.axes, strides):
+            if 'values' in axis:
+                positions = {float(value): position for position, value in enumerate(axis['values'])}
+                self._axes.append((index[axis['name']], positions, 0.0, 1.0, 0, 0.0, int(stride)))
+            else:
+                self._axes.append((index[axis['name']], None, float(axis['start']), float(axis['step']),
+                                   int(axis['count']), float(axis['snap']), int(stride)))
+
+    @classmethod
+    def load(cls, path):
+        """
+        Memory-map a table written by scripts/build_lookup_table.py.
+        """
+        with open(header_path(path)) as f:
+            header = json.load(f)
+        table = np.load(path, mmap_mode='r')
+        expected = (int(np.prod(grid_shape(header['axes']))), len(header['models']))
+        if table.shape != expected:
+            raise ValueError(f"Lookup table shape {table.shape} does not match its header {expected}")
+        return cls(table, header['axes'], header['models'], header['feature_names'], header.get('fingerprint'))
+
+    def index_of(self, row):
+        """
+        Flat table index for an encoded feature row, or None if it is off the grid.
+        """
+        values = row.tolist()
+        flat = 0
+        for col, positions, start, step, count, snap, stride in self._axes:
+            value = values[col]
+            if positions is not None:
+                position = positions.get(value)
+                if position is None:
+                    return None
+                flat += position * stride
+                continue
+            if value != value:  # NaN
+                return None
+            position = int(round((value - start) / step))
+            if position < 0 or position >= count:
+                return None
+            if abs(value - (start + position * step)) > snap + 1e-9:
+                return None
+            flat += position * stride
+        return flat
+
+    def lookup(self, row, model_keys):
+        """
+        Return {model_key: probability} for the requested models, or None if
+        the row is off the grid or a requested model is not in the table.
+        """
+        flat = self.index_of(row)
+        if flat is not None:
+            values = self.table[flat].tolist()
+            predictions = {}
+            for model_key in model_keys:
+                if model_key not in self.model_keys:
+                    break
+                value = values[self.model_keys.index(model_key)]
+                if value == MISSING:
+                    break
+                predictions[model_key] = value / QUANT_SCALE
+            else:
+                with self._lock:
+                    self.hits += 1
+                return predictions
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def stats(self):
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            'cells': int(self.table.shape[0]),
+            'models': self.model_keys,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,155 @@
+import bisect
+import threading
+
+# Default latency buckets in seconds, from 50 microseconds to 5 seconds
+LATENCY_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+                   0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram, cheap enough for the request hot path:
+    one bisect and three additions under a lock per observation.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self):
+        """
+        Cumulative bucket counts keyed by upper bound, plus count and sum.
+        """
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+        cumulative = {}
+        running = 0
+        for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+            running += bucket_count
+            cumulative['+Inf' if bound == float('inf') else repr(bound)] = running
+        return {'buckets': cumulative, 'count': count, 'sum': total}
+
+
+class Counter:
+    """
+    Monotonic counter.
+    """
+
+    def __init__(self):
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self):
+        return self._value
+
+
+def _format_labels(labels, extra=None):
+    items = list(labels) + ([extra] if extra else [])
+    if not items:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+               for _, value in items)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(items, escaped)) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    """
+    Named histograms and counters, rendered in the Prometheus text format.
+    histogram() and counter() return the existing metric for a name and
+    label set; hot paths should create theirs once and call observe()/inc()
+    on them directly.
+    Collectors are callables evaluated at scrape time for values that are
+    tracked elsewhere (cache and lookup-table counters, for example); each
+    returns (name, type, help, labels dict, value) tuples.
+    """
+
+    def __init__(self):
+        # name -> [type, help, {label tuple: metric}]
+        self._families = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def _get(self, kind, name, help_text, labels, factory):
+        key = tuple(sorted((labels or {}).items()))
+        with self._lock:
+            family = self._families.setdefault(name, [kind, help_text, {}])
+            if family[0] != kind:
+                raise ValueError(f"Metric {name} is already registered as a {family[0]}")
+            metric = family[2].get(key)
+            if metric is None:
+                metric = family[2][key] = factory()
+            return metric
+
+    def histogram(self, name, help_text, labels=None, buckets=LATENCY_BUCKETS):
+        return self._get('histogram', name, help_text, labels, lambda: Histogram(buckets))
+
+    def counter(self, name, help_text, labels=None):
+        return self._get('counter', name, help_text, labels, Counter)
+
+    def register(self, name, help_text, metric, labels=None):
+        """
+        Expose an existing Histogram or Counter under name.
+        """
+        kind = 'histogram' if isinstance(metric, Histogram) else 'counter'
+        return self._get(kind, name, help_text, labels, lambda: metric)
+
+    def add_collector(self, collector):
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self):
+        """
+        Prometheus text exposition format (version 0.0.4).
+        """
+        lines = []
+        with self._lock:
+            families = [(name, kind, help_text, list(metrics.items()))
+                        for name, (kind, help_text, metrics) in self._families.items()]
+            collectors = list(self._collectors)
+
+        for name, kind, help_text, metrics in families:
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, metric in metrics:
+                if kind == 'counter':
+                    lines.append(f'{name}{_format_labels(labels)} {_format_value(metric.value)}')
+                    continue
+                snapshot = metric.snapshot()
+                for bound, count in snapshot['buckets'].items():
+                    lines.append(f'{name}_bucket{_format_labels(labels, ("le", bound))} {count}')
+                lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(snapshot["sum"])}')
+                lines.append(f'{name}_count{_format_labels(labels)} {snapshot["count"]}')
+
+        collected = {}
+        for collector in collectors:
+            for name, kind, help_text, labels, value in collector():
+                collected.setdefault((name, kind, help_text), []).append((labels, value))
+        for (name, kind, help_text), samples in collected.items():
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in samples:
+                lines.append(f'{name}{_format_labels(sorted(labels.items()))} {_format_value(value)}')
+
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,140 @@
+import asyncio
+import time
+
+from metrics import Histogram
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+WAIT_TIME_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.025, 0.05, 0.1)
+
+
+class BatcherStopped(RuntimeError):
+    """
+    The batcher was stopped before a queued request was scored.
+    """
+
+
+class MicroBatcher:
+    """
+    Collects concurrent requests into small batches.
+    The first queued request opens a window of max_wait seconds; the batch is
+    flushed when the window closes or max_batch_size requests have arrived.
+    score_batch(records) -> results runs in a worker thread so the event loop
+    keeps accepting requests while a batch is scored.
+    The queue and its worker task start with the ASGI lifespan startup
+    event, or with the first submit() when the server sends no lifespan
+    events. stop() fails every request still waiting with BatcherStopped.
+    """
+
+    def __init__(self, score_batch, max_batch_size=32, max_wait=0.002):
+        self.score_batch = score_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.batch_size = Histogram(BATCH_SIZE_BUCKETS)
+        self.wait_time = Histogram(WAIT_TIME_BUCKETS)
+        self._queue = None
+        self._task = None
+        # Requests taken off the queue for the batch being collected or scored
+        self._batch = []
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        # Fail whatever was in flight or still queued, so no request waits forever;
+        # the next submit() starts over with a fresh queue
+        waiting = [future for _, future, _ in self._batch]
+        self._batch = []
+        if self._queue is not None:
+            while not self._queue.empty():
+                waiting.append(self._queue.get_nowait()[1])
+            self._queue = None
+        for future in waiting:
+            if not future.done():
+                future.set_exception(BatcherStopped("Server is shutting down"))
+
+    async def submit(self, record):
+        """
+        Queue one record and wait for its result.
+        """
+        if self._task is None:
+            await self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((record, future, time.perf_counter()))
+        return await future
+
+    async def _collect(self):
+        """
+        Wait for the first request, then gather more until the window closes or the batch is full.
+        """
+        batch = self._batch = [await self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        # Take whatever else is already queued without waiting
+        while len(batch) < self.max_batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            started = time.perf_counter()
+            self.batch_size.observe(len(batch))
+            for _, _, queued_at in batch:
+                self.wait_time.observe(started - queued_at)
+
+            records = [record for record, _, _ in batch]
+            try:
+                results = await loop.run_in_executor(None, self._score, records)
+            except Exception as e:
+                results = [e] * len(batch)
+
+            # Fan results back out to the waiting requests
+            for (_, future, _), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+            self._batch = []
+
+    def _score(self, records):
+        """
+        Score the batch in one call; if that fails, score records one by one
+        so a single bad record only fails its own request.
+        """
+        try:
+            return self.score_batch(records)
+        except Exception:
+            results = []
+            for record in records:
+                try:
+                    results.append(self.score_batch([record])[0])
+                except Exception as e:
+                    results.append(e)
+            return results
+
+    def stats(self):
+        return {
+            'max_batch_size': self.max_batch_size,
+            'max_wait_seconds': self.max_wait,
+            'batch_size': self.batch_size.snapshot(),
+            'wait_time_seconds': self.wait_time.snapshot()
+        }
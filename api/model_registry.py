@@ -0,0 +1,127 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Unpickling imports the classes it meets (sklearn.ensemble, sklearn.linear_model,
+# ...). Two threads importing the same package at once can see it partially
+# initialized, so pickles are read one at a time; they still overlap with the
+# native-format loaders.
+_unpickle_lock = threading.Lock()
+
+
+def load_pickle(path, mmap=True):
+    """
+    joblib pickle. With mmap, the large NumPy arrays inside the pickle
+    (tree node tables, for example) are memory-mapped instead of read into
+    fresh buffers.
+    """
+    with _unpickle_lock:
+        import joblib
+        return joblib.load(path, mmap_mode='r' if mmap else None)
+
+
+def load_xgboost_native(path, mmap=True):
+    """
+    XGBoost's own .ubj/.json model format; loads without unpickling and
+    without the version-mismatch warnings of a pickled booster.
+    """
+    import xgboost
+    model = xgboost.XGBClassifier()
+    model.load_model(path)
+    return model
+
+
+def load_compact_forest(path, mmap=True):
+    """
+    Compact tree ensemble written by scripts/export_forest.py; plain NumPy arrays.
+    """
+    from tree_engine import load_compact_ensemble
+    return load_compact_ensemble(path)
+
+
+LOADERS = {
+    '.npz': load_compact_forest,
+    '.pkl': load_pickle,
+    '.joblib': load_pickle,
+    '.ubj': load_xgboost_native,
+    '.json': load_xgboost_native
+}
+
+# Model artifacts: key -> candidate file names in models/, in order of preference
+ARTIFACTS = {
+    'rf': ['random_forest.npz', 'random_forest.pkl'],
+    'xgb': ['xgboost.ubj', 'xgboost.pkl'],
+    'lr': ['logistic_regression.pkl'],
+    'scaler': ['standard_scaler.pkl']
+}
+
+
+class ModelRegistry:
+    """
+    Loads the model artifacts in parallel, one worker thread per file.
+    Each artifact is read from the first candidate file that exists; heavy
+    libraries (joblib/scikit-learn, xgboost) are imported by the loader that
+    needs them, on first use. Per-artifact timings and errors are kept for
+    /health.
+    """
+
+    def __init__(self, models_path, artifacts=None, max_workers=None, mmap=True):
+        self.models_path = models_path
+        self.artifacts = dict(artifacts or ARTIFACTS)
+        self.max_workers = max_workers or len(self.artifacts)
+        self.mmap = mmap
+        self.models = {}
+        self.errors = {}
+        self.sources = {}
+        self.load_seconds = {}
+        self.total_seconds = None
+        self._lock = threading.Lock()
+
+    def _load_one(self, key):
+        started = time.perf_counter()
+        try:
+            for filename in self.artifacts[key]:
+                path = os.path.join(self.models_path, filename)
+                if os.path.exists(path):
+                    loader = LOADERS[os.path.splitext(filename)[1]]
+                    model = loader(path, mmap=self.mmap)
+                    with self._lock:
+                        self.models[key] = model
+                        self.sources[key] = filename
+                    return
+            raise FileNotFoundError(f"None of {', '.join(self.artifacts[key])} found in {self.models_path}")
+        except Exception as e:
+            with self._lock:
+                self.errors[key] = f"{type(e).__name__}: {e}"
+        finally:
+            with self._lock:
+                self.load_seconds[key] = time.perf_counter() - started
+
+    def load(self):
+        """
+        Load every artifact; failures are recorded in errors, not raised.
+        """
+        started = time.perf_counter()
+        if self.max_workers == 1:
+            for key in self.artifacts:
+                self._load_one(key)
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='model-loader') as pool:
+                list(pool.map(self._load_one, self.artifacts))
+        self.total_seconds = time.perf_counter() - started
+        return self
+
+    def get(self, key):
+        return self.models.get(key)
+
+    def status(self):
+        return {
+            key: {
+                'loaded': key in self.models,
+                'source': self.sources.get(key),
+                'seconds': self.load_seconds.get(key),
+                'error': self.errors.get(key)
+            }
+            for key in self.artifacts
+        }
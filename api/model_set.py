@@ -0,0 +1,144 @@
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+
+# Model keys in the order they appear in responses
+MODEL_KEYS = ('rf', 'xgb', 'lr')
+
+
+class ActiveModels(namedtuple('ActiveModels', ['enabled', 'ensemble_models', 'weights'])):
+    """
+    Immutable snapshot of the model set, taken once per request so a
+    configuration reload mid-request cannot change which models it uses.
+    enabled: loaded models that are not disabled, in response order.
+    ensemble_models: enabled models with a weight above zero.
+    """
+
+    def ensemble(self, preds, i):
+        """
+        Weighted mean of the ensemble models' predictions for row i.
+        """
+        total = sum(self.weights[key] for key in self.ensemble_models)
+        return sum(self.weights[key] * preds[key][i] for key in self.ensemble_models) / total
+
+
+class ModelUnavailableError(ValueError):
+    """
+    A request selected a model that is not loaded or is disabled.
+    """
+
+
+def parse_weights(spec):
+    """
+    Parse "rf=1,xgb=2,lr=0.5" into {'rf': 1.0, 'xgb': 2.0, 'lr': 0.5}.
+    """
+    weights = {}
+    for item in filter(None, (part.strip() for part in (spec or '').split(','))):
+        key, _, value = item.partition('=')
+        key = key.strip()
+        if key not in MODEL_KEYS:
+            raise ValueError(f"Unknown model in ensemble weights: {key}")
+        weights[key] = float(value)
+        if weights[key] < 0:
+            raise ValueError(f"Ensemble weight for {key} must not be negative")
+    return weights
+
+
+def parse_model_list(spec):
+    """
+    Parse "rf,xgb,lr" into a list of model keys.
+    """
+    keys = [key.strip() for key in spec.split(',') if key.strip()]
+    unknown = [key for key in keys if key not in MODEL_KEYS]
+    if unknown:
+        raise ValueError(f"Unknown models: {', '.join(unknown)}")
+    return keys
+
+
+class ModelSet:
+    """
+    Which of the loaded models serve predictions, and their ensemble weights.
+
+    The ensemble is the weighted mean of the models that are loaded, not
+    disabled, and have a weight above zero. An optional JSON control file
+    ({"disabled": ["rf"], "weights": {"xgb": 2}}) is re-read when it
+    changes, checked at most every reload_interval seconds, so models can be
+    switched off at runtime, in every worker at once, without a restart.
+    """
+
+    def __init__(self, loaded, weights=None, config_path=None, reload_interval=1.0):
+        self.loaded = [key for key in MODEL_KEYS if key in loaded]
+        self.default_weights = {key: 1.0 for key in MODEL_KEYS}
+        self.default_weights.update(weights or {})
+        self.config_path = config_path
+        self.reload_interval = reload_interval
+        self.config_error = None
+        self._config_mtime = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self._apply({})
+
+    def _apply(self, config):
+        weights = dict(self.default_weights)
+        weights.update({key: float(value) for key, value in config.get('weights', {}).items()})
+        disabled = set(config.get('disabled', []))
+        unknown = (disabled | set(weights)) - set(MODEL_KEYS)
+        if unknown:
+            raise ValueError(f"Unknown models: {', '.join(sorted(unknown))}")
+        if any(weight < 0 for weight in weights.values()):
+            raise ValueError("Ensemble weights must not be negative")
+
+        enabled = tuple(key for key in self.loaded if key not in disabled)
+        # Swap in a complete snapshot so readers never see a half-applied config
+        self._active = ActiveModels(enabled, tuple(key for key in enabled if weights[key] > 0), weights)
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if self.config_path is None or now < self._next_check:
+            return
+        with self._lock:
+            if now < self._next_check:
+                return
+            self._next_check = now + self.reload_interval
+            try:
+                mtime = os.stat(self.config_path).st_mtime
+            except FileNotFoundError:
+                mtime = None
+            if mtime == self._config_mtime:
+                return
+            try:
+                config = {}
+                if mtime is not None:
+                    with open(self.config_path) as f:
+                        config = json.load(f)
+                self._apply(config)
+                self._config_mtime = mtime
+                self.config_error = None
+            except (OSError, ValueError, TypeError, AttributeError) as e:
+                # Keep serving with the previous configuration
+                self.config_error = f"{type(e).__name__}: {e}"
+
+    def current(self):
+        """
+        The active model set for one request.
+        """
+        self._maybe_reload()
+        return self._active
+
+    def status(self):
+        enabled, members, weights = self.current()
+        return {
+            'models': {
+                key: {
+                    'loaded': key in self.loaded,
+                    'enabled': key in enabled,
+                    'weight': weights[key],
+                    'in_ensemble': key in members
+                }
+                for key in MODEL_KEYS
+            },
+            'config_path': self.config_path,
+            'config_error': self.config_error
+        }
@@ -0,0 +1,89 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class PredictionCache:
+    """
+    Thread-safe in-process LRU cache with a time-to-live.
+    Keys are encoded feature rows; values map model keys ('rf', 'xgb', 'lr')
+    to probabilities, so an entry can be filled in one model at a time.
+    """
+
+    def __init__(self, max_size=10000, ttl=3600.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, {model_key: probability})
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self):
+        return self.max_size > 0
+
+    @staticmethod
+    def make_key(features):
+        """
+        Canonical key for an encoded (1, n_features) row.
+        """
+        return features.tobytes()
+
+    def lookup(self, key, model_keys):
+        """
+        Return (cached predictions, model keys still to compute).
+        Counts a hit only when every requested model is already cached.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            cached = dict(entry[1]) if entry is not None else {}
+            missing = [model_key for model_key in model_keys if model_key not in cached]
+            if missing:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            return cached, missing
+
+    def store(self, key, predictions):
+        """
+        Merge per-model predictions into the entry for key, evicting the
+        least recently used entries beyond max_size.
+        """
+        if not self.enabled:
+            return
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            merged = dict(entry[1]) if entry is not None else {}
+            merged.update(predictions)
+            self._entries[key] = (expires_at, merged)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
@@ -0,0 +1,341 @@
+import json
+import numpy as np
+
+
+class TreeEnsemble:
+    """
+    Array-backed tree ensemble for fast inference.
+    All trees are packed into flat node tables (feature, threshold, left,
+    right, leaf value). Leaves point to themselves, so a batch is traversed
+    with a fixed number of vectorized steps, one per tree level.
+    """
+
+    def __init__(self, kind, feature, threshold, left, right, value, missing_left,
+                 roots, max_depth, base_margin=0.0, feature_names=None):
+        self.kind = kind  # 'xgboost' (sum of margins) or 'random_forest' (mean of probabilities)
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.children = np.stack([left, right], axis=1).ravel()
+        self.value = value
+        self.missing_left = missing_left
+        self.roots = roots
+        self.max_depth = max_depth
+        self.base_margin = base_margin
+        self.feature_names = feature_names
+        self.metadata = {}
+        # Rows per traversal chunk; keeps the working set cache-sized on big batches
+        self.chunk_size = 2048
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    def leaf_values(self, X):
+        """
+        Return the (n_rows, n_trees) matrix of leaf values reached by each row.
+        """
+        # Both libraries compare features in float32
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[0] <= self.chunk_size:
+            return self.value.take(self._traverse(X))
+        return np.concatenate([self.value.take(self._traverse(X[start:start + self.chunk_size]))
+                               for start in range(0, X.shape[0], self.chunk_size)])
+
+    def _traverse(self, X):
+        """
+        Walk every tree for every row of a float32 chunk; returns leaf node ids.
+        """
+        n_rows, n_features = X.shape
+        flat_X = X.ravel()
+        row_offset = (np.arange(n_rows, dtype=np.intp) * n_features)[:, None]
+        has_missing = np.isnan(flat_X).any()
+        nodes = np.repeat(self.roots[None, :], n_rows, axis=0)
+
+        for _ in range(self.max_depth):
+            x = flat_X.take(row_offset + self.feature.take(nodes))
+            threshold = self.threshold.take(nodes)
+            if self.kind == 'xgboost':
+                go_right = x >= threshold
+            else:
+                go_right = x > threshold
+            if has_missing:
+                # NaN compares False above; route it along the learned default branch
+                nan = np.isnan(x)
+                go_right = np.where(nan, ~self.missing_left.take(nodes), go_right)
+            # children holds (left, right) pairs, so the branch is just an offset
+            nodes = self.children.take(2 * nodes + go_right)
+
+        return nodes
+
+    def predict_proba(self, X):
+        """
+        Probability of the positive class for each row of X.
+        """
+        values = self.leaf_values(X)
+        if self.kind == 'xgboost':
+            margin = self.base_margin + values.sum(axis=1, dtype=np.float64)
+            return 1.0 / (1.0 + np.exp(-margin))
+        return values.mean(axis=1, dtype=np.float64)
+
+
+def _pack(kind, trees, base_margin=0.0):
+    """
+    Concatenate per-tree node arrays into one flat table.
+    Each tree is (feature, threshold, left, right, value, missing_left, depth)
+    with children indexed locally and -1 marking a leaf.
+    """
+    features, thresholds, lefts, rights, values, missing, roots = [], [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+    for feature, threshold, left, right, value, missing_left, depth in trees:
+        n = len(feature)
+        is_leaf = left < 0
+        own = np.arange(n) + offset
+        # Leaves loop back onto themselves and read feature 0 harmlessly
+        features.append(np.where(is_leaf, 0, feature))
+        thresholds.append(threshold)
+        lefts.append(np.where(is_leaf, own, left + offset))
+        rights.append(np.where(is_leaf, own, right + offset))
+        values.append(value)
+        missing.append(missing_left)
+        roots.append(offset)
+        offset += n
+        max_depth = max(max_depth, depth)
+
+    return TreeEnsemble(
+        kind,
+        feature=np.concatenate(features).astype(np.intp),
+        threshold=np.concatenate(thresholds),
+        left=np.concatenate(lefts).astype(np.intp),
+        right=np.concatenate(rights).astype(np.intp),
+        value=np.concatenate(values),
+        missing_left=np.concatenate(missing).astype(bool),
+        roots=np.asarray(roots, dtype=np.intp),
+        max_depth=max_depth,
+        base_margin=base_margin
+    )
+
+
+def _tree_depth(left, right):
+    """
+    Depth of a tree given local child indices (-1 for leaves).
+    """
+    depth = np.zeros(len(left), dtype=int)
+    for node in range(len(left)):
+        if left[node] >= 0:
+            depth[left[node]] = depth[node] + 1
+            depth[right[node]] = depth[node] + 1
+    return int(depth.max())
+
+
+def load_xgboost_ensemble(model):
+    """
+    Read the trees of a fitted binary:logistic XGBClassifier/Booster into a TreeEnsemble.
+    """
+    booster = model.get_booster() if hasattr(model, 'get_booster') else model
+    learner = json.loads(booster.save_raw(raw_format='json'))['learner']
+
+    objective = learner['objective']['name']
+    if objective != 'binary:logistic':
+        raise ValueError(f"Unsupported XGBoost objective: {objective}")
+
+    gbtree = learner['gradient_booster']
+    if gbtree['name'] != 'gbtree':
+        raise ValueError(f"Unsupported XGBoost booster: {gbtree['name']}")
+
+    # base_score is stored in probability space, e.g. "[5.8682793E-1]"
+    base_score = float(learner['learner_model_param']['base_score'].strip('[]'))
+    base_margin = float(np.log(base_score / (1.0 - base_score)))
+
+    trees = gbtree['model']['trees']
+
+    # Match predict_proba, which stops at best_iteration when early stopping was used
+    best_iteration = learner.get('attributes', {}).get('best_iteration')
+    if best_iteration is not None:
+        indptr = gbtree['model']['iteration_indptr']
+        trees = trees[:indptr[int(best_iteration) + 1]]
+
+    packed = []
+    for tree in trees:
+        if any(tree.get('split_type', [])):
+            raise ValueError("Categorical splits are not supported")
+        left = np.asarray(tree['left_children'], dtype=np.int64)
+        right = np.asarray(tree['right_children'], dtype=np.int64)
+        packed.append((
+            np.asarray(tree['split_indices'], dtype=np.int64),
+            np.asarray(tree['split_conditions'], dtype=np.float32),
+            left,
+            right,
+            # split_conditions holds the leaf value on leaf nodes
+            np.asarray(tree['split_conditions'], dtype=np.float32),
+            np.asarray(tree['default_left'], dtype=bool),
+            _tree_depth(left, right)
+        ))
+
+    return _pack('xgboost', packed, base_margin)
+
+
+def _truncate_tree(feature, threshold, left, right, value, missing_left, max_depth):
+    """
+    Cut a tree at max_depth: nodes at that depth become leaves carrying their
+    own value, and the nodes below them are dropped (ids are renumbered).
+    """
+    keep = [0]
+    depth = {0: 0}
+    new_id = {0: 0}
+    for node in keep:  # breadth-first; keep grows while iterating
+        if left[node] >= 0 and depth[node] < max_depth:
+            for child in (left[node], right[node]):
+                depth[child] = depth[node] + 1
+                new_id[child] = len(keep)
+                keep.append(child)
+
+    keep = np.asarray(keep)
+    is_leaf = np.asarray([left[node] < 0 or depth[node] >= max_depth for node in keep])
+    new_left = np.where(is_leaf, -1, [new_id.get(left[node], -1) for node in keep])
+    new_right = np.where(is_leaf, -1, [new_id.get(right[node], -1) for node in keep])
+    return (feature[keep], threshold[keep], new_left, new_right, value[keep], missing_left[keep],
+            int(max(depth[node] for node in keep)))
+
+
+def load_random_forest_ensemble(model, n_trees=None, max_depth=None):
+    """
+    Read the trees of a fitted binary RandomForestClassifier into a TreeEnsemble.
+    n_trees keeps only the first n trees; max_depth cuts every tree at that depth
+    (internal nodes carry the class distribution of their samples, so a cut
+    node predicts as a leaf).
+    """
+    if len(model.classes_) != 2:
+        raise ValueError("Only binary classifiers are supported")
+
+    packed = []
+    for estimator in model.estimators_[:n_trees]:
+        tree = estimator.tree_
+        left = tree.children_left.astype(np.int64)
+        right = tree.children_right.astype(np.int64)
+        # Class distribution per node; normalize so counts and fractions both work
+        value = tree.value[:, 0, :]
+        proba = value[:, 1] / value.sum(axis=1)
+        missing_left = getattr(tree, 'missing_go_to_left', np.zeros(len(left), dtype=bool))
+        arrays = (
+            tree.feature.astype(np.int64),
+            tree.threshold.astype(np.float64),
+            left,
+            right,
+            proba,
+            np.asarray(missing_left, dtype=bool),
+            int(tree.max_depth)
+        )
+        if max_depth is not None and arrays[-1] > max_depth:
+            arrays = _truncate_tree(*arrays[:-1], max_depth)
+        packed.append(arrays)
+
+    ensemble = _pack('random_forest', packed)
+    if getattr(model, 'feature_names_in_', None) is not None:
+        ensemble.feature_names = [str(name) for name in model.feature_names_in_]
+    return ensemble
+
+
+# Compact serving format (.npz) written by scripts/export_forest.py
+COMPACT_FORMAT_VERSION = 1
+
+
+def _float32_at_most(values):
+    """
+    Largest float32 <= each float64 value. Rows are compared in float32, so
+    x <= t and x <= _float32_at_most(t) agree for every float32 x: the
+    thresholds shrink to float32 without changing a single split.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    rounded = values.astype(np.float32)
+    too_big = rounded.astype(np.float64) > values
+    rounded[too_big] = np.nextafter(rounded[too_big], np.float32(-np.inf))
+    return rounded
+
+
+def save_compact_ensemble(ensemble, path, metadata=None):
+    """
+    Write a TreeEnsemble as packed arrays: float32 thresholds and leaf values,
+    uint8 feature indices (uint16 beyond 256 features), interleaved int32
+    child indices and bit-packed missing-value directions.
+    """
+    n_features = int(ensemble.feature.max()) + 1
+    feature_dtype = np.uint8 if n_features <= 256 else np.uint16
+    if ensemble.kind == 'xgboost':
+        # XGBoost splits are float32 already; it sends x >= t right, which the
+        # rounding-down trick does not preserve
+        threshold = np.asarray(ensemble.threshold, dtype=np.float32)
+    else:
+        threshold = _float32_at_most(ensemble.threshold)
+
+    header = {
+        'format_version': COMPACT_FORMAT_VERSION,
+        'kind': ensemble.kind,
+        'n_nodes': int(ensemble.n_nodes),
+        'max_depth': int(ensemble.max_depth),
+        'base_margin': float(ensemble.base_margin),
+        'feature_names': list(ensemble.feature_names) if ensemble.feature_names is not None else None,
+        'metadata': metadata or {}
+    }
+    with open(path, 'wb') as f:
+        np.savez(
+            f,
+            header=np.frombuffer(json.dumps(header).encode(), dtype=np.uint8),
+            feature=ensemble.feature.astype(feature_dtype),
+            threshold=threshold,
+            children=ensemble.children.astype(np.int32),
+            value=np.asarray(ensemble.value, dtype=np.float32),
+            missing_left=np.packbits(ensemble.missing_left),
+            roots=ensemble.roots.astype(np.int32)
+        )
+
+
+def read_compact_header(path):
+    with np.load(path) as arrays:
+        return json.loads(arrays['header'].tobytes().decode())
+
+
+def load_compact_ensemble(path):
+    """
+    Load a TreeEnsemble written by save_compact_ensemble; no scikit-learn needed.
+    """
+    with np.load(path) as arrays:
+        header = json.loads(arrays['header'].tobytes().decode())
+        if header['format_version'] != COMPACT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported compact model format version {header['format_version']}")
+        children = arrays['children']
+        ensemble = TreeEnsemble(
+            header['kind'],
+            feature=arrays['feature'],
+            threshold=arrays['threshold'],
+            left=children[0::2],
+            right=children[1::2],
+            value=arrays['value'],
+            missing_left=np.unpackbits(arrays['missing_left'], count=header['n_nodes']).astype(bool),
+            roots=arrays['roots'],
+            max_depth=header['max_depth'],
+            base_margin=header['base_margin'],
+            feature_names=header['feature_names']
+        )
+    ensemble.metadata = header['metadata']
+    return ensemble
+
+
+def load_tree_ensemble(model):
+    """
+    Build a TreeEnsemble from a fitted XGBoost or scikit-learn random forest model.
+    """
+    name = type(model).__name__
+    if name in ('XGBClassifier', 'Booster'):
+        return load_xgboost_ensemble(model)
+    if name == 'RandomForestClassifier':
+        return load_random_forest_ensemble(model)
+    raise ValueError(f"Unsupported tree model: {name}")
@@ -0,0 +1,114 @@
+"""
+Request validation, run before any encoding or scoring.
+
+The schema is compiled once from the feature spec into flat lists of
+(key, bounds) checks, so validating a record is a type test and a range
+test per field with no exceptions raised along the way. Every problem in a
+record is reported, as {"field": ..., "message": ...} entries in a 400.
+"""
+
+# Numeric input bounds: the Streamlit form's slider and number_input limits,
+# widened where the training data goes further (pressure, satisfaction and
+# hours start at 0 in the dataset)
+NUMERIC_BOUNDS = {
+    'age': (15, 100),
+    'academic_pressure': (0, 10),
+    'cgpa': (0, 10),
+    'study_satisfaction': (0, 10),
+    'work_study_hours': (0, 24),
+    'financial_stress': (1, 10)
+}
+
+NUMBER_TYPES = (int, float)
+
+# Optional request fields and the JSON types they may take
+OPTIONAL_FIELDS = {
+    'model_choice': (str,),
+    'full_response': (bool, str, int)
+}
+
+# Details returned for a batch are capped; the count says how many there were
+MAX_REPORTED_ERRORS = 100
+
+
+class ValidationError(ValueError):
+    """
+    A request failed validation; details lists every problem found.
+    """
+
+    def __init__(self, message, details, count=None):
+        super().__init__(message)
+        self.details = details
+        self.count = len(details) if count is None else count
+
+    def to_dict(self):
+        return {'error': str(self), 'details': self.details, 'error_count': self.count}
+
+
+class RequestSchema:
+    """
+    Compiled checks for one /predict record: every base feature of the spec
+    is required, numbers must be within NUMERIC_BOUNDS and categories must
+    be one of the spec's categories for that feature, so the models never
+    see a value they were not trained on.
+    """
+
+    def __init__(self, spec, bounds=NUMERIC_BOUNDS):
+        self.numeric = []
+        self.categorical = []
+        for feature in spec['features']:
+            key = feature['key']
+            if feature['type'] == 'categorical':
+                allowed = sorted(feature['categories'])
+                self.categorical.append((key, frozenset(allowed), allowed, f"must be one of {', '.join(allowed)}"))
+            else:
+                low, high = bounds.get(key, (float('-inf'), float('inf')))
+                self.numeric.append((key, low, high, f"must be a number from {low} to {high}"))
+        self.optional = list(OPTIONAL_FIELDS.items())
+
+    def errors(self, record):
+        """
+        List of {'field', 'message'} problems with record; empty when valid.
+        """
+        if record.__class__ is not dict:
+            return [{'field': None, 'message': "must be a JSON object"}]
+
+        errors = []
+        for key, low, high, message in self.numeric:
+            value = record.get(key)
+            # bool is excluded by the exact class test; NaN fails the range test
+            if value.__class__ not in NUMBER_TYPES or not low <= value <= high:
+                errors.append({'field': key, 'message': message if value is not None else "is required"})
+        for key, categories, allowed, message in self.categorical:
+            value = record.get(key)
+            # The class test keeps unhashable values out of the set lookup
+            if value.__class__ is not str or value not in categories:
+                errors.append({'field': key, 'message': message if value is not None else "is required",
+                               'allowed': allowed})
+        for key, types in self.optional:
+            value = record.get(key)
+            if value is not None and value.__class__ not in types:
+                errors.append({'field': key, 'message': f"must be of type {' or '.join(t.__name__ for t in types)}"})
+        return errors
+
+    def validate(self, record):
+        errors = self.errors(record)
+        if errors:
+            raise ValidationError("Invalid request", errors)
+        return record
+
+    def validate_batch(self, records):
+        """
+        Validate every record; raises one ValidationError whose details carry
+        the index of the offending record.
+        """
+        details = []
+        count = 0
+        for index, record in enumerate(records):
+            errors = self.errors(record)
+            if errors:
+                count += len(errors)
+                details.extend({'index': index, **error} for error in errors[:MAX_REPORTED_ERRORS - len(details)])
+        if count:
+            raise ValidationError("Invalid records", details, count)
+        return records
@@ -0,0 +1,25 @@
+"""
+WSGI entry point for production serving.
+
+    gunicorn -c api/gunicorn.conf.py
+
+With preload_app enabled (the default in gunicorn.conf.py) this module is
+imported once in the gunicorn master, so the models are loaded before the
+workers are forked and their memory pages are shared copy-on-write.
+With MODEL_LOADING=background the import returns before the models are
+loaded, so wait for them here: workers must not fork half-loaded state.
+"""
+import gc
+
+import api
+from api import app
+
+api.wait_until_ready()
+
+# Objects created while loading the models are moved to a permanent
+# generation the garbage collector never scans. Otherwise a collection in a
+# worker would write to their headers and un-share the pages after fork.
+gc.collect()
+gc.freeze()
+
+application = app
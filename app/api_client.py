@@ -0,0 +1,105 @@
+"""
+HTTP client for the prediction API.
+
+app.py keeps one ApiClient per process (st.cache_resource). Its
+requests.Session holds keep-alive connections to the API in a urllib3
+pool, so a prediction reuses an open connection instead of a new TCP (and
+TLS) handshake per submission.
+
+Requests are bounded by a connect timeout and a read timeout. Failed
+connections, and 502/503/504 answers (503 is the API's answer until its
+models are loaded), are retried with exponential backoff; /predict has no
+side effects, so retrying the POST is safe. Every prediction is timed and
+the totals are exported through collect_metrics().
+
+features() fetches the categories the API accepts (GET /features, next to
+/predict), which app.py offers as the form's choices.
+"""
+import threading
+import time
+from urllib.parse import urljoin
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_CONNECT_TIMEOUT = 3.05
+DEFAULT_READ_TIMEOUT = 10.0
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF = 0.3
+DEFAULT_POOL_SIZE = 10
+RETRY_STATUSES = (502, 503, 504)
+
+
+class ApiClient:
+    """
+    Pooled, retrying client for one API URL (the /predict endpoint);
+    features_url defaults to /features alongside it.
+    """
+
+    def __init__(self, url, connect_timeout=DEFAULT_CONNECT_TIMEOUT, read_timeout=DEFAULT_READ_TIMEOUT,
+                 retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF, pool_size=DEFAULT_POOL_SIZE, features_url=None):
+        self.url = url
+        self.features_url = features_url or (urljoin(url, 'features') if url else None)
+        self.timeout = (connect_timeout, read_timeout)
+        retry = Retry(total=retries, connect=retries, read=0, status=retries, backoff_factor=backoff,
+                      status_forcelist=RETRY_STATUSES, allowed_methods=frozenset({'GET', 'POST'}),
+                      respect_retry_after_header=True, raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._lock = threading.Lock()
+        self._requests = {}  # status (or 'error') -> count
+        self.request_seconds = 0.0
+        self.max_request_seconds = 0.0
+        self.last_request_seconds = None
+
+    def predict(self, payload):
+        """
+        POST payload; returns the response (any status). Raises requests'
+        ConnectionError or Timeout once the retries are used up.
+        """
+        started = time.perf_counter()
+        status = 'error'
+        try:
+            response = self.session.post(self.url, json=payload, timeout=self.timeout)
+            status = str(response.status_code)
+            return response
+        finally:
+            self._record(status, time.perf_counter() - started)
+
+    def features(self):
+        """
+        {request key: accepted categories in code order} from GET /features.
+        Raises requests' RequestException (HTTPError for an error status)
+        or ValueError for a body that is not the expected JSON.
+        """
+        response = self.session.get(self.features_url, timeout=self.timeout)
+        response.raise_for_status()
+        categories = response.json().get('categories')
+        if not isinstance(categories, dict):
+            raise ValueError(f"{self.features_url} returned no categories")
+        return categories
+
+    def _record(self, status, elapsed):
+        with self._lock:
+            self._requests[status] = self._requests.get(status, 0) + 1
+            self.request_seconds += elapsed
+            self.max_request_seconds = max(self.max_request_seconds, elapsed)
+            self.last_request_seconds = elapsed
+
+    def collect_metrics(self):
+        with self._lock:
+            counts = dict(self._requests)
+            total, longest = self.request_seconds, self.max_request_seconds
+        return [
+            *[('app_api_requests_total', 'counter', 'Prediction API calls by HTTP status (error: no response)',
+               {'status': status}, count) for status, count in sorted(counts.items())],
+            ('app_api_request_seconds_total', 'counter',
+             'Time spent in prediction API calls, retries and backoff included', {}, total),
+            ('app_api_request_seconds_max', 'gauge', 'Longest prediction API call', {}, longest)
+        ]
+
+    def close(self):
+        self.session.close()
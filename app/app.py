@@ -1,12 +1,17 @@
 import streamlit as st
-import mysql.connector
-from mysql.connector import Error
 from streamlit_option_menu import option_menu
 import os # Import os module
 from dotenv import load_dotenv # Import load_dotenv
 import datetime # Added datetime import
 import json
+import requests
 import openai # Import OpenAI for OpenRouter API calls
+import atexit
+import metrics
+from history_writer import DEFAULT_BATCH_SIZE, DEFAULT_FLUSH_INTERVAL, DEFAULT_MAX_QUEUE, HistoryWriter
+from storage import StorageError, storage_from_env
+from api_client import (DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT, DEFAULT_RETRIES, DEFAULT_BACKOFF,
+                        ApiClient)
 
 # Load environment variables from .env file
 load_dotenv()
@@ -287,61 +292,28 @@ st.markdown("""
 </script>
 """, unsafe_allow_html=True)
 
-# --- Database Connection ---
-def get_db_connection():
-    try:
-        conn = mysql.connector.connect(
-            host=os.getenv("DB_HOST"), # Use environment variable
-            database=os.getenv("DB_DATABASE"), # Use environment variable
-            user=os.getenv("DB_USER"), # Use environment variable
-            password=os.getenv("DB_PASSWORD") # Use environment variable
-        )
-        # Create table if it doesn't exist (simple check)
-        cursor = conn.cursor()
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS users (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                email VARCHAR(255) UNIQUE,
-                username VARCHAR(100) UNIQUE NOT NULL,
-                password VARCHAR(255) NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-        """)
-        
-        # Create prediction_history table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS prediction_history (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                user_id INT NOT NULL,
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                model_used VARCHAR(50),
-                rf_prediction FLOAT,
-                xgb_prediction FLOAT,
-                lr_prediction FLOAT,
-                ensemble_prediction FLOAT,
-                risk_level VARCHAR(20),
-                features JSON,
-                FOREIGN KEY (user_id) REFERENCES users(id)
-            );
-        """)
-        
-        conn.commit()
-        cursor.close()
-        return conn
-    except Error as e:
-        st.error(f"Database connection failed: {e}")
-        return None
+# --- Storage: MySQL or embedded SQLite (STORAGE_BACKEND), one per process, shared by every session and rerun (app/storage.py) ---
+@st.cache_resource
+def get_storage():
+    storage = storage_from_env()
+    # Set DB_BOOTSTRAP_SCHEMA=0 when the schema is managed with scripts/init_db.py
+    if os.getenv("DB_BOOTSTRAP_SCHEMA", "1") != "0":
+        storage.create_schema()
+    metrics.add_collector(storage.collect_metrics)
+    return storage
+
+# --- Pool metrics at http://<host>:APP_METRICS_PORT/metrics (app/metrics.py) ---
+@st.cache_resource
+def start_metrics_server():
+    port = os.getenv("APP_METRICS_PORT")
+    return metrics.start_server(int(port)) if port else None
 
 # --- User Registration ---
 def register_user(email, username, password):
-    conn = get_db_connection()
-    if conn is None:
-        return False, "Database connection error."
-    cursor = conn.cursor()
     try:
+        storage = get_storage()
         # Check if username or email already exists
-        cursor.execute("SELECT * FROM users WHERE username=%s OR email=%s", (username, email))
-        if cursor.fetchone():
+        if storage.user_exists(username, email):
             return False, "Username or Email already exists."
         # Basic validation (add more robust validation as needed)
         if not email or '@' not in email or '.' not in email:
@@ -351,112 +323,150 @@ def register_user(email, username, password):
         if not password or len(password) < 6:
              return False, "Password must be at least 6 characters long."
         # Hash password before storing (IMPORTANT for security - using plain text here for simplicity)
-        cursor.execute("INSERT INTO users (email, username, password) VALUES (%s, %s, %s)", (email, username, password))
-        conn.commit()
+        storage.create_user(email, username, password)
         return True, "Account created successfully! You can now log in."
-    except Error as e:
+    except StorageError as e:
         return False, f"Registration failed: {e}"
-    finally:
-        cursor.close()
-        conn.close()
 
 # --- User Login ---
 def login_user(identifier, password): # Changed parameter name from username to identifier
-    conn = get_db_connection()
-    if conn is None:
-        return False, None
-    cursor = conn.cursor(dictionary=True) # Fetch as dict
     try:
         # Check if the identifier matches either username or email
-        query = "SELECT * FROM users WHERE (username=%s OR email=%s) AND password=%s"
-        cursor.execute(query, (identifier, identifier, password)) # Use identifier for both username and email check
-        user = cursor.fetchone()
+        user = get_storage().authenticate(identifier, password)
         if user:
             return True, user # User found and password matches
         else:
             return False, None # User not found or password incorrect
-    except Error as e:
+    except StorageError as e:
         st.error(f"Login error: {e}")
         return False, None
-    finally:
-        cursor.close()
-        conn.close()
+
+# --- Format a model probability; models the API didn't run are reported as N/A ---
+def format_prediction(value):
+    return f"{value:.2%}" if value is not None else "N/A"
 
 # --- Save prediction to database ---
+def prediction_row(user_id, prediction_data):
+    return (
+        user_id,
+        prediction_data['model_used'],
+        prediction_data['rf_prediction'],
+        prediction_data['xgb_prediction'],
+        prediction_data['lr_prediction'],
+        prediction_data['ensemble_prediction'],
+        prediction_data['risk_level'],
+        json.dumps(prediction_data['features'])
+    )
+
+# --- Write-behind queue for prediction history, one per process (app/history_writer.py) ---
+@st.cache_resource
+def get_history_writer():
+    # One multi-row insert and one commit per batch, on the writer's thread
+    writer = HistoryWriter(
+        get_storage().save_predictions,
+        max_queue=int(os.getenv("HISTORY_QUEUE_SIZE", DEFAULT_MAX_QUEUE)),
+        batch_size=int(os.getenv("HISTORY_BATCH_SIZE", DEFAULT_BATCH_SIZE)),
+        flush_interval=float(os.getenv("HISTORY_FLUSH_INTERVAL", DEFAULT_FLUSH_INTERVAL))
+    )
+    # Write out whatever is still queued when the server shuts down
+    atexit.register(writer.close)
+    metrics.add_collector(writer.collect_metrics)
+    return writer
+
 def save_prediction_to_db(user_id, prediction_data):
-    conn = get_db_connection()
-    if conn is None:
-        return False
-    cursor = conn.cursor()
+    row = prediction_row(user_id, prediction_data)
     try:
-        # Convert features to JSON string
-        import json
-        features_json = json.dumps(prediction_data['features'])
-        # Insert prediction into database
-        query = """
-            INSERT INTO prediction_history 
-            (user_id, model_used, rf_prediction, xgb_prediction, lr_prediction, 
-             ensemble_prediction, risk_level, features)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        cursor.execute(query, (
-            user_id,
-            prediction_data['model_used'],
-            prediction_data['rf_prediction'],
-            prediction_data['xgb_prediction'],
-            prediction_data['lr_prediction'],
-            prediction_data['ensemble_prediction'],
-            prediction_data['risk_level'],
-            features_json
-        ))
-        conn.commit()
+        if get_history_writer().submit(row):
+            return True
+        # The queue is full: write this row now rather than lose it
+        get_storage().save_predictions([row])
         return True
-    except Error as e:
+    except StorageError as e:
         st.error(f"Failed to save prediction: {e}")
         return False
-    finally:
-        cursor.close()
-        conn.close()
 
-# --- Load prediction history from database ---
-def load_prediction_history(user_id):
-    conn = get_db_connection()
-    if conn is None:
-        return []
-    cursor = conn.cursor(dictionary=True)
+# --- Load prediction history from database, one page at a time ---
+HISTORY_PAGE_SIZE = int(os.getenv("HISTORY_PAGE_SIZE", 20))
+
+def load_prediction_history(user_id, before=None, limit=HISTORY_PAGE_SIZE):
+    """
+    One page of a user's predictions, newest first, and the cursor for the
+    next (older) page, or None when there is none. before is the cursor
+    returned with the previous page, a (timestamp, id) pair: paging walks
+    idx_history_user_time from that key instead of skipping rows with OFFSET.
+    Features are not read here; load_prediction_features fetches them when
+    an entry is opened.
+    """
     try:
-        # Get all predictions for this user
-        query = """
-            SELECT * FROM prediction_history 
-            WHERE user_id = %s
-            ORDER BY timestamp DESC
-        """
-        cursor.execute(query, (user_id,))
-        predictions = cursor.fetchall()
-        # Process predictions
-        history = []
-        for pred in predictions:
-            # Convert JSON string back to dictionary
-            import json
-            features = json.loads(pred['features'])
-            # Format for consistency with session state format
-            history.append({
-                'timestamp': pred['timestamp'].strftime("%Y-%m-%d %H:%M:%S"),
-                'model_used': pred['model_used'],
-                'rf_prediction': pred['rf_prediction'],
-                'xgb_prediction': pred['xgb_prediction'],
-                'lr_prediction': pred['lr_prediction'],
-                'ensemble_prediction': pred['ensemble_prediction'],
-                'risk_level': pred['risk_level'],
-                'features': features
-            })
-        return history
-    except Error as e:
+        # One row more than the page tells whether an older page exists
+        predictions = get_storage().load_history(user_id, before=before, limit=limit + 1)
+    except StorageError as e:
         st.error(f"Failed to load prediction history: {e}")
-        return []
-    finally:
-        cursor.close()
-        conn.close()
+        return [], None
+    page = predictions[:limit]
+    history = [{
+        'id': pred['id'],
+        'timestamp': pred['timestamp'].strftime("%Y-%m-%d %H:%M:%S"),
+        'model_used': pred['model_used'],
+        'rf_prediction': pred['rf_prediction'],
+        'xgb_prediction': pred['xgb_prediction'],
+        'lr_prediction': pred['lr_prediction'],
+        'ensemble_prediction': pred['ensemble_prediction'],
+        'risk_level': pred['risk_level']
+    } for pred in page]
+    next_cursor = (page[-1]['timestamp'], page[-1]['id']) if len(predictions) > limit else None
+    return history, next_cursor
+
+# --- Load the features of one history entry ---
+def load_prediction_features(user_id, prediction_id):
+    try:
+        return get_storage().load_features(user_id, prediction_id)
+    except StorageError as e:
+        st.error(f"Failed to load prediction details: {e}")
+        return None
+
+# --- Prediction API client: pooled keep-alive connections, timeouts and retries (app/api_client.py) ---
+@st.cache_resource
+def get_api_client():
+    client = ApiClient(
+        os.getenv("API_URL"),
+        connect_timeout=float(os.getenv("API_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT)),
+        read_timeout=float(os.getenv("API_READ_TIMEOUT", DEFAULT_READ_TIMEOUT)),
+        retries=int(os.getenv("API_RETRIES", DEFAULT_RETRIES)),
+        backoff=float(os.getenv("API_RETRY_BACKOFF", DEFAULT_BACKOFF))
+    )
+    metrics.add_collector(client.collect_metrics)
+    return client
+
+# --- Form choices: the categories the API's models were trained with (GET /features) ---
+# A local feature spec is only a fallback for when the API can't be reached;
+# set FEATURE_SPEC_PATH where the app is deployed next to the models.
+FEATURE_SPEC_PATH = os.getenv("FEATURE_SPEC_PATH", os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models", "feature_spec.json"))
+FORM_CHOICES_TTL = float(os.getenv("FORM_CHOICES_TTL", 3600))
+
+# Errors are not cached, so a failed fetch is retried on the next run
+@st.cache_data(ttl=FORM_CHOICES_TTL, show_spinner=False)
+def fetch_form_choices():
+    return get_api_client().features()
+
+@st.cache_data
+def read_form_choices(path):
+    with open(path) as f:
+        spec = json.load(f)
+    return {
+        feature['key']: sorted(feature['categories'], key=feature['categories'].get)
+        for feature in spec['features'] if feature['type'] == 'categorical'
+    }
+
+def load_form_choices():
+    try:
+        return fetch_form_choices()
+    except (requests.exceptions.RequestException, ValueError) as e:
+        if not os.path.exists(FEATURE_SPEC_PATH):
+            st.error(f"Could not load the form's choices from the prediction API: {e}")
+            st.stop()
+        return read_form_choices(FEATURE_SPEC_PATH)
 
 # --- OpenRouter API Integration ---
 def get_openrouter_response(messages):
@@ -540,7 +550,9 @@ def main():
                         st.session_state['logged_in'] = True
                         st.session_state['username'] = user['username']
                         st.session_state['user_id'] = user['id'] 
-                        st.session_state['prediction_history'] = load_prediction_history(user['id'])
+                        history, cursor = load_prediction_history(user['id'])
+                        st.session_state['prediction_history'] = history
+                        st.session_state['history_cursor'] = cursor
                         st.success(f"Welcome back, {st.session_state['username']}!")
                         st.balloons()
                         st.snow() 
@@ -598,6 +610,7 @@ def show_main_app():
         </div>
         """, unsafe_allow_html=True)
         with st.container():
+            choices = load_form_choices()
             with st.form("prediction_form"):
                 col1, col2 = st.columns(2)
                 with col1:
@@ -605,13 +618,13 @@ def show_main_app():
                                          help="Your current age")
                     sleep_duration = st.selectbox(
                         "Sleep Duration", 
-                        options=["Less than 5 hours", "5-6 hours", "7-8 hours", "More than 8 hours", "Others"],
+                        options=choices['sleep_duration'],
                         index=1,
                         help="Your typical sleep duration per day"
                     )
                     dietary_habits = st.selectbox(
                         "Dietary Habits",
-                        options=["Regular", "Irregular", "Vegetarian", "Non-vegetarian", "Vegan"],
+                        options=choices['dietary_habits'],
                         index=0,
                         help="Your typical eating habits"
                     )
@@ -632,7 +645,7 @@ def show_main_app():
                                              help="Whether any immediate family members have history of mental illness")
                     degree = st.selectbox(
                         "Degree Program",
-                        options=["Bachelor's", "Master's", "PhD", "Others"],
+                        options=choices['degree'],
                         index=0,
                         help="Your current degree program"
                     )
@@ -702,8 +715,6 @@ def show_main_app():
                         document.getElementById("prediction-progress").setAttribute("data-width", "70");
                     </script>
                     """, unsafe_allow_html=True)
-                    import requests
-                    import json
                     api_data = {
                         'age': age,
                         'dietary_habits': dietary_habits,
@@ -718,16 +729,13 @@ def show_main_app():
                         'illness_history': illness_history,
                         'model_choice': model_choice, 
                     }
-                    api_url = os.getenv("API_URL")
                     with st.spinner("📊 Analyzing your data..."):
-                        import time
-                        time.sleep(0.5)
                         st.markdown("""
                         <script>
                             document.getElementById("prediction-progress").setAttribute("data-width", "90");
                         </script>
                         """, unsafe_allow_html=True)
-                        response = requests.post(api_url, json=api_data, timeout=10)
+                        response = get_api_client().predict(api_data)
                         st.markdown(""" 
                         <script>
                             document.getElementById("prediction-progress").setAttribute("data-width", "100");
@@ -735,10 +743,10 @@ def show_main_app():
                         """, unsafe_allow_html=True)
                         if response.status_code == 200:
                             result = response.json()
-                            rf_pred = result.get('rf_prediction', 0)
-                            xgb_pred = result.get('xgb_prediction', 0)
-                            lr_pred = result.get('lr_prediction', 0)
-                            ensemble_pred = result.get('ensemble_prediction', 0)
+                            rf_pred = result.get('rf_prediction')
+                            xgb_pred = result.get('xgb_prediction')
+                            lr_pred = result.get('lr_prediction')
+                            ensemble_pred = result.get('ensemble_prediction')
                             primary_pred = result.get('primary_prediction', ensemble_pred)
                             risk_level = result['risk_level']
                             message = result['message']
@@ -758,7 +766,7 @@ def show_main_app():
                                 <div class="metric-container">
                                     <div class="metric-item primary-metric">
                                         <div style="font-weight:bold">Random Forest</div>
-                                        <div style="font-size:1.5rem; margin:10px 0">{rf_pred:.2%}</div>
+                                        <div style="font-size:1.5rem; margin:10px 0">{format_prediction(rf_pred)}</div>
                                         <div style="font-size:0.8rem; color:#6c757d">Selected Model</div>
                                     </div>
                                 </div>
@@ -768,7 +776,7 @@ def show_main_app():
                                 <div class="metric-container">
                                     <div class="metric-item primary-metric">
                                         <div style="font-weight:bold">XGBoost</div>
-                                        <div style="font-size:1.5rem; margin:10px 0">{xgb_pred:.2%}</div>
+                                        <div style="font-size:1.5rem; margin:10px 0">{format_prediction(xgb_pred)}</div>
                                         <div style="font-size:0.8rem; color:#6c757d">Selected Model</div>
                                     </div>
                                 </div>
@@ -778,7 +786,7 @@ def show_main_app():
                                 <div class="metric-container">
                                     <div class="metric-item primary-metric">
                                         <div style="font-weight:bold">Logistic Regression</div>
-                                        <div style="font-size:1.5rem; margin:10px 0">{lr_pred:.2%}</div>
+                                        <div style="font-size:1.5rem; margin:10px 0">{format_prediction(lr_pred)}</div>
                                         <div style="font-size:0.8rem; color:#6c757d">Selected Model</div>
                                     </div>
                                 </div>
@@ -788,19 +796,19 @@ def show_main_app():
                                 <div class="metric-container">
                                     <div class="metric-item">
                                         <div>Random Forest</div>
-                                        <div style="font-size:1.2rem; margin:10px 0">{rf_pred:.2%}</div>
+                                        <div style="font-size:1.2rem; margin:10px 0">{format_prediction(rf_pred)}</div>
                                     </div>
                                     <div class="metric-item">
                                         <div>XGBoost</div>
-                                        <div style="font-size:1.2rem; margin:10px 0">{xgb_pred:.2%}</div>
+                                        <div style="font-size:1.2rem; margin:10px 0">{format_prediction(xgb_pred)}</div>
                                     </div>
                                     <div class="metric-item">
                                         <div>Logistic Regression</div>
-                                        <div style="font-size:1.2rem; margin:10px 0">{lr_pred:.2%}</div>
+                                        <div style="font-size:1.2rem; margin:10px 0">{format_prediction(lr_pred)}</div>
                                     </div>
                                     <div class="metric-item primary-metric">
                                         <div style="font-weight:bold">Ensemble</div>
-                                        <div style="font-size:1.5rem; margin:10px 0">{ensemble_pred:.2%}</div>
+                                        <div style="font-size:1.5rem; margin:10px 0">{format_prediction(ensemble_pred)}</div>
                                         <div style="font-size:0.8rem; color:#6c757d">Combined Models</div>
                                     </div>
                                 </div>
@@ -848,7 +856,8 @@ def show_main_app():
                             }
                             if 'prediction_history' not in st.session_state:
                                 st.session_state.prediction_history = []
-                            st.session_state.prediction_history.append(prediction_data)
+                            # Newest first, as pages are loaded
+                            st.session_state.prediction_history.insert(0, prediction_data)
                             with st.spinner("Saving your results..."):
                                 if save_prediction_to_db(st.session_state['user_id'], prediction_data):
                                     st.success("✅ Prediction saved to your history!")
@@ -905,10 +914,8 @@ def show_main_app():
     with tab3:
         st.header("Your Prediction History")
         if 'prediction_history' in st.session_state and st.session_state.prediction_history:
-            sorted_history = sorted(st.session_state.prediction_history, 
-                                   key=lambda x: datetime.datetime.strptime(x['timestamp'], "%Y-%m-%d %H:%M:%S"),
-                                   reverse=True)
-            for i, pred in enumerate(sorted_history):
+            # Already newest first: pages come from the database in order and new predictions go in front
+            for pred in st.session_state.prediction_history:
                 timestamp = datetime.datetime.strptime(pred['timestamp'], "%Y-%m-%d %H:%M:%S")
                 formatted_date = timestamp.strftime("%b %d, %Y")
                 formatted_time = timestamp.strftime("%I:%M %p")
@@ -922,7 +929,7 @@ def show_main_app():
                 with st.expander(f"📅 {formatted_date} at {formatted_time} - {risk_level} Risk"):
                     st.markdown(f"""
                     <div style="border-left: 3px solid {risk_color}; padding-left: 10px; margin-bottom: 15px;">
-                        <h4 style="margin:0">Depression Risk: <span style="color:{risk_color}">{pred['ensemble_prediction']:.2%}</span></h4>
+                        <h4 style="margin:0">Depression Risk: <span style="color:{risk_color}">{format_prediction(pred['ensemble_prediction'])}</span></h4>
                         <p>Model Used: <strong>{pred['model_used']}</strong></p>
                     </div>
                     """, unsafe_allow_html=True)
@@ -930,39 +937,55 @@ def show_main_app():
                     <div class="metric-container">
                         <div class="metric-item">
                             <div>Random Forest</div>
-                            <div style="font-size:1.2rem; margin:5px 0">{:.2%}</div>
+                            <div style="font-size:1.2rem; margin:5px 0">{}</div>
                         </div>
                         <div class="metric-item">
                             <div>XGBoost</div>
-                            <div style="font-size:1.2rem; margin:5px 0">{:.2%}</div>
+                            <div style="font-size:1.2rem; margin:5px 0">{}</div>
                         </div>
                         <div class="metric-item">
                             <div>Logistic Regression</div>
-                            <div style="font-size:1.2rem; margin:5px 0">{:.2%}</div>
+                            <div style="font-size:1.2rem; margin:5px 0">{}</div>
                         </div>
                     </div>
-                    """.format(pred['rf_prediction'], pred['xgb_prediction'], pred['lr_prediction']), 
+                    """.format(format_prediction(pred['rf_prediction']), format_prediction(pred['xgb_prediction']),
+                            format_prediction(pred['lr_prediction'])), 
                     unsafe_allow_html=True)
-                    st.subheader("Your Responses:")
-                    features = {k: v for k, v in pred['features'].items() if k not in ['model_choice']}
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        st.write("**Demographics:**")
-                        st.write(f"• Age: {features.get('age')}")
-                        st.write(f"• Degree: {features.get('degree')}")
-                        st.write("**Lifestyle:**")
-                        st.write(f"• Sleep: {features.get('sleep_duration')}")
-                        st.write(f"• Diet: {features.get('dietary_habits')}")
-                        st.write(f"• Study/Work Hours: {features.get('work_study_hours')}")
-                    with col2:
-                        st.write("**Academic Factors:**")
-                        st.write(f"• Academic Pressure: {features.get('academic_pressure')}/10")
-                        st.write(f"• Academic Performance: {features.get('cgpa')}/10")
-                        st.write(f"• Study Satisfaction: {features.get('study_satisfaction')}/10")
-                        st.write("**Mental Health:**")
-                        st.write(f"• Financial Stress: {features.get('financial_stress')}/10")
-                        st.write(f"• Suicidal Thoughts: {features.get('suicidal_thoughts')}")
-                        st.write(f"• Family History: {features.get('illness_history')}")
+                    if 'id' in pred:
+                        # Saved entries read their features only when they are asked for
+                        show_responses = st.toggle("Show your responses", key=f"history_features_{pred['id']}")
+                        if show_responses and pred.get('features') is None:
+                            pred['features'] = load_prediction_features(st.session_state['user_id'], pred['id'])
+                    else:
+                        show_responses = True
+                    if show_responses and pred.get('features'):
+                        st.subheader("Your Responses:")
+                        features = {k: v for k, v in pred['features'].items() if k not in ['model_choice']}
+                        col1, col2 = st.columns(2)
+                        with col1:
+                            st.write("**Demographics:**")
+                            st.write(f"• Age: {features.get('age')}")
+                            st.write(f"• Degree: {features.get('degree')}")
+                            st.write("**Lifestyle:**")
+                            st.write(f"• Sleep: {features.get('sleep_duration')}")
+                            st.write(f"• Diet: {features.get('dietary_habits')}")
+                            st.write(f"• Study/Work Hours: {features.get('work_study_hours')}")
+                        with col2:
+                            st.write("**Academic Factors:**")
+                            st.write(f"• Academic Pressure: {features.get('academic_pressure')}/10")
+                            st.write(f"• Academic Performance: {features.get('cgpa')}/10")
+                            st.write(f"• Study Satisfaction: {features.get('study_satisfaction')}/10")
+                            st.write("**Mental Health:**")
+                            st.write(f"• Financial Stress: {features.get('financial_stress')}/10")
+                            st.write(f"• Suicidal Thoughts: {features.get('suicidal_thoughts')}")
+                            st.write(f"• Family History: {features.get('illness_history')}")
+            if st.session_state.get('history_cursor') is not None:
+                if st.button("Load older predictions", key="history_more"):
+                    history, cursor = load_prediction_history(st.session_state['user_id'],
+                                                              before=st.session_state['history_cursor'])
+                    st.session_state.prediction_history.extend(history)
+                    st.session_state['history_cursor'] = cursor
+                    st.rerun()
         else:
             st.info("📝 No prediction history yet. Make a prediction to see it here.")
             st.markdown("""
@@ -1031,6 +1054,7 @@ def show_main_app():
 
 # --- Main Execution Logic ---
 if __name__ == "__main__":
+    start_metrics_server()
     if st.session_state.get('logged_in', False): 
         show_main_app() 
     else:
@@ -0,0 +1,201 @@
+"""
+Pooled MySQL connections for the Streamlit app.
+
+One ConnectionPool is created per process (app.py caches the MySQLStorage
+holding it with st.cache_resource, so it survives reruns and is shared by
+every session; see storage.py).
+Connections are opened when the pool is created and handed out again after
+close(), so a login or a saved prediction costs no TCP/auth handshake; a
+checkout only pings the connection and reconnects it if the server dropped
+it. When every connection is in use, callers wait up to DB_POOL_TIMEOUT
+seconds for one to be returned.
+
+The schema (tables and the indexes in INDEXES, which existing databases
+gain on the next start) is created once, when the pool is created (or by
+scripts/init_db.py when DB_BOOTSTRAP_SCHEMA=0), not on every connection.
+"""
+import os
+import threading
+import time
+from mysql.connector import pooling
+from mysql.connector.errors import PoolError
+
+DEFAULT_POOL_SIZE = 5
+DEFAULT_POOL_TIMEOUT = 5.0
+POOL_NAME = 'student_depression_app'
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        email VARCHAR(255) UNIQUE,
+        username VARCHAR(100) UNIQUE NOT NULL,
+        password VARCHAR(255) NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS prediction_history (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        user_id INT NOT NULL,
+        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        model_used VARCHAR(50),
+        rf_prediction FLOAT,
+        xgb_prediction FLOAT,
+        lr_prediction FLOAT,
+        ensemble_prediction FLOAT,
+        risk_level VARCHAR(20),
+        features JSON,
+        INDEX idx_history_user_time (user_id, timestamp, id),
+        FOREIGN KEY (user_id) REFERENCES users(id)
+    )
+    """
+]
+
+# Indexes added after the tables first shipped: (table, index name, columns).
+# MySQL has no CREATE INDEX IF NOT EXISTS, so create_schema() checks first.
+INDEXES = [
+    # Keyset pagination of a user's history, newest first (app.py: load_prediction_history)
+    ('prediction_history', 'idx_history_user_time', '(user_id, timestamp, id)')
+]
+
+
+def connect_args_from_env():
+    return {
+        'host': os.getenv("DB_HOST"),
+        'database': os.getenv("DB_DATABASE"),
+        'user': os.getenv("DB_USER"),
+        'password': os.getenv("DB_PASSWORD")
+    }
+
+
+def create_schema(conn):
+    """
+    Create the app's tables and indexes on conn if they don't exist.
+    """
+    cursor = conn.cursor()
+    try:
+        for statement in SCHEMA:
+            cursor.execute(statement)
+        for table, name, columns in INDEXES:
+            cursor.execute("SELECT 1 FROM information_schema.statistics "
+                           "WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s LIMIT 1",
+                           (table, name))
+            if cursor.fetchone() is None:
+                cursor.execute(f"CREATE INDEX {name} ON {table} {columns}")
+        conn.commit()
+    finally:
+        cursor.close()
+
+
+class PooledConnection:
+    """
+    A connection checked out of a ConnectionPool; close() (or leaving a
+    with block) returns it to the pool. Everything else is the MySQL
+    connection's own API.
+    """
+
+    def __init__(self, pool, cnx):
+        self._pool = pool
+        self._cnx = cnx
+
+    def __getattr__(self, name):
+        return getattr(self._cnx, name)
+
+    def close(self):
+        if self._cnx is None:
+            return
+        cnx, self._cnx = self._cnx, None
+        try:
+            cnx.close()
+        finally:
+            self._pool._release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ConnectionPool:
+    """
+    Fixed-size MySQL connection pool with a bounded wait for a free
+    connection, plus the counters behind collect_metrics().
+    """
+
+    def __init__(self, size=DEFAULT_POOL_SIZE, timeout=DEFAULT_POOL_TIMEOUT, **connect_args):
+        self.size = size
+        self.timeout = timeout
+        self._pool = pooling.MySQLConnectionPool(pool_name=POOL_NAME, pool_size=size, **connect_args)
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self.in_use = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.checkout_seconds = 0.0
+
+    @classmethod
+    def from_env(cls):
+        """
+        Pool for the DB_* environment variables; DB_POOL_SIZE and
+        DB_POOL_TIMEOUT (seconds) size it.
+        """
+        return cls(size=int(os.getenv("DB_POOL_SIZE", DEFAULT_POOL_SIZE)),
+                   timeout=float(os.getenv("DB_POOL_TIMEOUT", DEFAULT_POOL_TIMEOUT)),
+                   **connect_args_from_env())
+
+    def get_connection(self):
+        """
+        Check out a connection, waiting up to timeout seconds for one to be
+        free; raises PoolError when none is.
+        """
+        started = time.perf_counter()
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self.timeouts += 1
+            raise PoolError(f"No database connection free after {self.timeout:g}s (pool size {self.size})")
+        acquired = time.perf_counter()
+        try:
+            cnx = self._pool.get_connection()
+        except BaseException:
+            self._slots.release()
+            raise
+        finished = time.perf_counter()
+
+        wait = acquired - started
+        with self._lock:
+            self.in_use += 1
+            self.checkouts += 1
+            self.wait_seconds += wait
+            self.max_wait_seconds = max(self.max_wait_seconds, wait)
+            self.checkout_seconds += finished - started
+        return PooledConnection(self, cnx)
+
+    def _release(self):
+        with self._lock:
+            self.in_use -= 1
+        self._slots.release()
+
+    def bootstrap_schema(self):
+        with self.get_connection() as conn:
+            create_schema(conn)
+
+    def collect_metrics(self):
+        with self._lock:
+            in_use, checkouts, timeouts = self.in_use, self.checkouts, self.timeouts
+            wait, max_wait, checkout = self.wait_seconds, self.max_wait_seconds, self.checkout_seconds
+        return [
+            ('app_db_pool_size', 'gauge', 'Connections in the pool', {}, self.size),
+            ('app_db_pool_in_use', 'gauge', 'Connections currently checked out', {}, in_use),
+            ('app_db_pool_checkouts_total', 'counter', 'Connections checked out', {}, checkouts),
+            ('app_db_pool_timeouts_total', 'counter',
+             'Checkouts that gave up waiting for a free connection', {}, timeouts),
+            ('app_db_pool_wait_seconds_total', 'counter',
+             'Time spent waiting for a free connection', {}, wait),
+            ('app_db_pool_wait_seconds_max', 'gauge', 'Longest wait for a free connection', {}, max_wait),
+            ('app_db_pool_checkout_seconds_total', 'counter',
+             'Time to check out a connection, waiting and liveness check included', {}, checkout)
+        ]
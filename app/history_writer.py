@@ -0,0 +1,149 @@
+"""
+Write-behind queue for prediction history rows.
+
+The Streamlit request only puts a row on a bounded queue; a background
+thread takes whatever has queued up (up to batch_size rows, waiting at most
+flush_interval seconds for more after the first) and hands the batch to
+write_batch, which inserts it with one executemany and one commit.
+
+The writer knows nothing about the database: write_batch(rows) does the
+insert and raises on failure, so the same queue runs against MySQL, SQLite
+or a plain function in a local test. A failed batch is retried with backoff
+and then dropped (and counted). close() stops taking rows, writes out
+everything still queued and waits for the thread; app.py registers it with
+atexit so rows survive a normal shutdown.
+"""
+import logging
+import queue
+import threading
+import time
+
+DEFAULT_MAX_QUEUE = 1000
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_FLUSH_INTERVAL = 0.5
+DEFAULT_RETRIES = 3
+
+logger = logging.getLogger(__name__)
+
+
+class HistoryWriter:
+    """
+    Bounded queue of rows flushed in batches by a daemon thread.
+    submit() never blocks: it returns False when the queue is full (or the
+    writer is closed) and the caller decides what to do with the row.
+    """
+
+    def __init__(self, write_batch, max_queue=DEFAULT_MAX_QUEUE, batch_size=DEFAULT_BATCH_SIZE,
+                 flush_interval=DEFAULT_FLUSH_INTERVAL, retries=DEFAULT_RETRIES):
+        self.write_batch = write_batch
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retries = retries
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._closed = threading.Event()
+        self._lock = threading.Lock()
+        self.rows_written = 0
+        self.rows_failed = 0
+        self.queue_full = 0
+        self.flushes = 0
+        self.flush_seconds = 0.0
+        self.max_flush_seconds = 0.0
+        self._thread = threading.Thread(target=self._run, name='history-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, row):
+        if self._closed.is_set():
+            return False
+        try:
+            self._queue.put_nowait(row)
+            return True
+        except queue.Full:
+            with self._lock:
+                self.queue_full += 1
+            return False
+
+    def _next_batch(self):
+        """
+        Block for the first row, then gather more until batch_size rows or
+        flush_interval has passed; None once closed and drained.
+        """
+        while True:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+                break
+            except queue.Empty:
+                if self._closed.is_set():
+                    return None
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = 0 if self._closed.is_set() else deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            self._flush(batch)
+            for _ in batch:
+                self._queue.task_done()
+
+    def _flush(self, batch):
+        for attempt in range(self.retries + 1):
+            started = time.perf_counter()
+            try:
+                self.write_batch(batch)
+            except Exception:
+                if attempt == self.retries:
+                    logger.exception("Dropping %d prediction history rows after %d attempts",
+                                     len(batch), attempt + 1)
+                    with self._lock:
+                        self.rows_failed += len(batch)
+                    return
+                logger.warning("Prediction history write failed (attempt %d), retrying", attempt + 1,
+                               exc_info=True)
+                time.sleep(min(0.5 * 2 ** attempt, 5.0))
+                continue
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.rows_written += len(batch)
+                self.flushes += 1
+                self.flush_seconds += elapsed
+                self.max_flush_seconds = max(self.max_flush_seconds, elapsed)
+            return
+
+    def flush(self):
+        """
+        Wait until every row submitted so far has been written (or dropped).
+        """
+        self._queue.join()
+
+    def close(self, timeout=30.0):
+        """
+        Stop accepting rows, write out the queue and stop the thread.
+        """
+        self._closed.set()
+        self._thread.join(timeout)
+
+    def collect_metrics(self):
+        with self._lock:
+            written, failed, full = self.rows_written, self.rows_failed, self.queue_full
+            flushes, flush_seconds, max_flush = self.flushes, self.flush_seconds, self.max_flush_seconds
+        return [
+            ('app_history_queue_depth', 'gauge', 'Prediction history rows waiting to be written', {},
+             self._queue.qsize()),
+            ('app_history_queue_capacity', 'gauge', 'Maximum prediction history rows queued', {}, self.max_queue),
+            ('app_history_rows_written_total', 'counter', 'Prediction history rows written', {}, written),
+            ('app_history_rows_failed_total', 'counter',
+             'Prediction history rows dropped after every retry failed', {}, failed),
+            ('app_history_queue_full_total', 'counter',
+             'Rows refused because the queue was full (written synchronously instead)', {}, full),
+            ('app_history_flushes_total', 'counter', 'Batches written', {}, flushes),
+            ('app_history_flush_seconds_total', 'counter', 'Time spent writing batches', {}, flush_seconds),
+            ('app_history_flush_seconds_max', 'gauge', 'Longest batch write', {}, max_flush)
+        ]
@@ -0,0 +1,83 @@
+"""
+Process metrics for the Streamlit app, in the Prometheus text format.
+
+Streamlit has no route of its own for /metrics, so when APP_METRICS_PORT is
+set the app serves them from a small HTTP server on a daemon thread. Values
+come from collectors evaluated at scrape time, as in the API's registry
+(api/metrics.py): each returns (name, type, help, labels dict, value) tuples.
+The renderer is the app's own, so the app deploys without the API's source;
+it formats and escapes samples as api/metrics.py does.
+"""
+import http.server
+import threading
+
+_collectors = []
+_lock = threading.Lock()
+
+
+def add_collector(collector):
+    with _lock:
+        if collector not in _collectors:
+            _collectors.append(collector)
+
+
+def _escape(value):
+    # Label values escape backslash, double quote and newline (exposition format 0.0.4)
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in sorted(labels.items())) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render():
+    """
+    Prometheus text exposition format (version 0.0.4).
+    """
+    with _lock:
+        collectors = list(_collectors)
+    collected = {}
+    for collector in collectors:
+        for name, kind, help_text, labels, value in collector():
+            collected.setdefault((name, kind, help_text), []).append((labels, value))
+
+    lines = []
+    for (name, kind, help_text), samples in collected.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for labels, value in samples:
+            lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+    return '\n'.join(lines) + '\n'
+
+
+class _MetricsHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != '/metrics':
+            self.send_error(404)
+            return
+        body = render().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(port, host='0.0.0.0'):
+    """
+    Serve render() at http://host:port/metrics from a daemon thread.
+    """
+    server = http.server.ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name='app-metrics', daemon=True).start()
+    return server
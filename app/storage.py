@@ -0,0 +1,299 @@
+"""
+Persistence for the Streamlit app: users and prediction history behind one
+interface, with two backends.
+
+- MySQLStorage: the deployed database, through the connection pool in db.py
+- SQLiteStorage: an embedded database file in WAL mode, for local runs,
+  load tests and single-node deployments without a database server
+
+storage_from_env() picks one from STORAGE_BACKEND (mysql, the default, or
+sqlite). Both run the same statements (QUERIES, with the backend's
+placeholder) and raise StorageError for any database error, so app.py does
+not depend on a driver; mysql-connector is only imported for MySQL.
+"""
+import contextlib
+import datetime
+import json
+import os
+import queue
+import sqlite3
+
+DEFAULT_SQLITE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.db')
+DEFAULT_BUSY_TIMEOUT = 5.0
+
+HISTORY_COLUMNS = ('id', 'timestamp', 'model_used', 'rf_prediction', 'xgb_prediction', 'lr_prediction',
+                   'ensemble_prediction', 'risk_level')
+
+# Written with %s placeholders; SQLiteStorage swaps in ?
+QUERIES = {
+    'find_user': "SELECT id FROM users WHERE username = %s OR email = %s LIMIT 1",
+    'create_user': "INSERT INTO users (email, username, password) VALUES (%s, %s, %s)",
+    'authenticate': "SELECT id, username, email FROM users WHERE (username = %s OR email = %s) AND password = %s",
+    'insert_prediction': """
+        INSERT INTO prediction_history
+        (user_id, model_used, rf_prediction, xgb_prediction, lr_prediction,
+         ensemble_prediction, risk_level, features)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+    """,
+    # Keyset pagination on idx_history_user_time: newest first, continuing below (timestamp, id)
+    'history': f"""
+        SELECT {', '.join(HISTORY_COLUMNS)} FROM prediction_history
+        WHERE user_id = %s
+        ORDER BY timestamp DESC, id DESC LIMIT %s
+    """,
+    'history_before': f"""
+        SELECT {', '.join(HISTORY_COLUMNS)} FROM prediction_history
+        WHERE user_id = %s AND (timestamp < %s OR (timestamp = %s AND id < %s))
+        ORDER BY timestamp DESC, id DESC LIMIT %s
+    """,
+    'features': "SELECT features FROM prediction_history WHERE id = %s AND user_id = %s"
+}
+
+
+class StorageError(Exception):
+    """
+    A database error from either backend.
+    """
+
+
+class Storage:
+    """
+    The operations app.py needs. Subclasses provide _cursor(), a context
+    manager yielding a cursor (committing on exit when commit=True and
+    raising StorageError for driver errors), and create_schema().
+    """
+
+    placeholder = '%s'
+
+    def __init__(self):
+        self.queries = {name: query.replace('%s', self.placeholder) for name, query in QUERIES.items()}
+
+    def _cursor(self, commit=False):
+        raise NotImplementedError
+
+    def create_schema(self):
+        raise NotImplementedError
+
+    def _to_timestamp(self, value):
+        return value
+
+    def _from_timestamp(self, value):
+        return value
+
+    def user_exists(self, username, email):
+        with self._cursor() as cursor:
+            cursor.execute(self.queries['find_user'], (username, email))
+            return cursor.fetchone() is not None
+
+    def create_user(self, email, username, password):
+        with self._cursor(commit=True) as cursor:
+            cursor.execute(self.queries['create_user'], (email, username, password))
+
+    def authenticate(self, identifier, password):
+        """
+        {'id', 'username', 'email'} of the user whose username or email is
+        identifier and whose password matches, else None.
+        """
+        with self._cursor() as cursor:
+            cursor.execute(self.queries['authenticate'], (identifier, identifier, password))
+            row = cursor.fetchone()
+        return dict(zip(('id', 'username', 'email'), row)) if row else None
+
+    def save_predictions(self, rows):
+        """
+        Insert prediction_history rows, (user_id, model_used, rf, xgb, lr,
+        ensemble, risk_level, features JSON), with one executemany and commit.
+        """
+        with self._cursor(commit=True) as cursor:
+            cursor.executemany(self.queries['insert_prediction'], rows)
+
+    def load_history(self, user_id, before=None, limit=20):
+        """
+        Up to limit of a user's predictions (HISTORY_COLUMNS dicts, timestamp
+        as a datetime), newest first and older than the (timestamp, id)
+        cursor before, if given.
+        """
+        with self._cursor() as cursor:
+            if before is None:
+                cursor.execute(self.queries['history'], (user_id, limit))
+            else:
+                timestamp = self._to_timestamp(before[0])
+                cursor.execute(self.queries['history_before'], (user_id, timestamp, timestamp, before[1], limit))
+            rows = cursor.fetchall()
+        history = [dict(zip(HISTORY_COLUMNS, row)) for row in rows]
+        for entry in history:
+            entry['timestamp'] = self._from_timestamp(entry['timestamp'])
+        return history
+
+    def load_features(self, user_id, prediction_id):
+        with self._cursor() as cursor:
+            cursor.execute(self.queries['features'], (prediction_id, user_id))
+            row = cursor.fetchone()
+        return json.loads(row[0]) if row and row[0] is not None else None
+
+    def collect_metrics(self):
+        return []
+
+    def close(self):
+        pass
+
+
+class MySQLStorage(Storage):
+    """
+    MySQL through a db.ConnectionPool; the schema is db.SCHEMA and db.INDEXES.
+    """
+
+    name = 'mysql'
+
+    def __init__(self, pool):
+        from mysql.connector import Error
+        super().__init__()
+        self.pool = pool
+        self._errors = Error
+
+    @classmethod
+    def from_env(cls):
+        from mysql.connector import Error
+        from db import ConnectionPool
+        try:
+            return cls(ConnectionPool.from_env())
+        except Error as e:
+            raise StorageError(str(e)) from e
+
+    @contextlib.contextmanager
+    def _cursor(self, commit=False):
+        try:
+            with self.pool.get_connection() as conn:
+                cursor = conn.cursor()
+                try:
+                    yield cursor
+                    if commit:
+                        conn.commit()
+                finally:
+                    cursor.close()
+        except self._errors as e:
+            raise StorageError(str(e)) from e
+
+    def create_schema(self):
+        from db import create_schema
+        try:
+            with self.pool.get_connection() as conn:
+                create_schema(conn)
+        except self._errors as e:
+            raise StorageError(str(e)) from e
+
+    def collect_metrics(self):
+        return self.pool.collect_metrics()
+
+
+SQLITE_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        email TEXT UNIQUE,
+        username TEXT UNIQUE NOT NULL,
+        password TEXT NOT NULL,
+        created_at TEXT DEFAULT (datetime('now', 'localtime'))
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS prediction_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL REFERENCES users(id),
+        timestamp TEXT DEFAULT (datetime('now', 'localtime')),
+        model_used TEXT,
+        rf_prediction REAL,
+        xgb_prediction REAL,
+        lr_prediction REAL,
+        ensemble_prediction REAL,
+        risk_level TEXT,
+        features TEXT
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_history_user_time ON prediction_history (user_id, timestamp, id)"
+]
+
+SQLITE_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class SQLiteStorage(Storage):
+    """
+    An SQLite database file in WAL mode, so page loads read while the
+    history writer writes. Connections are kept and reused (one per
+    concurrent caller), and each keeps its compiled statements in sqlite3's
+    statement cache: QUERIES are fixed strings, so every call after the
+    first runs an already prepared statement.
+    """
+
+    name = 'sqlite'
+    placeholder = '?'
+
+    def __init__(self, path=DEFAULT_SQLITE_PATH, timeout=DEFAULT_BUSY_TIMEOUT):
+        super().__init__()
+        self.path = path
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False,
+                               cached_statements=len(QUERIES) * 2)
+        conn.execute("PRAGMA journal_mode=WAL")
+        # Durable at each checkpoint rather than each commit; a crash can lose only the last transactions
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    @contextlib.contextmanager
+    def _cursor(self, commit=False):
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            try:
+                conn = self._connect()
+            except sqlite3.Error as e:
+                raise StorageError(str(e)) from e
+        cursor = conn.cursor()
+        try:
+            yield cursor
+            if commit:
+                conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            raise StorageError(str(e)) from e
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            self._idle.put(conn)
+
+    def create_schema(self):
+        with self._cursor(commit=True) as cursor:
+            for statement in SQLITE_SCHEMA:
+                cursor.execute(statement)
+
+    def _to_timestamp(self, value):
+        return value.strftime(SQLITE_TIMESTAMP_FORMAT)
+
+    def _from_timestamp(self, value):
+        return datetime.datetime.strptime(value, SQLITE_TIMESTAMP_FORMAT)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def storage_from_env():
+    """
+    The backend named by STORAGE_BACKEND: mysql (DB_* variables, see db.py)
+    or sqlite (SQLITE_PATH, default app/app.db).
+    """
+    backend = os.getenv("STORAGE_BACKEND", "mysql").lower()
+    if backend == 'sqlite':
+        return SQLiteStorage(os.getenv("SQLITE_PATH", DEFAULT_SQLITE_PATH))
+    if backend == 'mysql':
+        return MySQLStorage.from_env()
+    raise ValueError(f"Unknown STORAGE_BACKEND {backend!r} (expected mysql or sqlite)")
@@ -0,0 +1,92 @@
+"""
+Prediction history writes: one INSERT and commit per prediction (as the app
+did inside the request) versus the write-behind HistoryWriter.
+
+Runs against the app's embedded SQLite storage (app/storage.py), so it
+needs no database server; the commit per row is what dominates either
+way. Reports the time the submitting thread spends per prediction, the
+total time until every row is on disk, and the batches the writer used.
+Closing the writer must leave every submitted row in the table.
+
+Usage:
+    python benchmarks/bench_history_writer.py [--rows N] [--batch-size N]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+from bench_utils import SAMPLE_REQUEST, base_path
+
+sys.path.insert(0, os.path.join(base_path, 'app'))
+from history_writer import HistoryWriter
+from storage import SQLiteStorage
+
+USERS = 50
+
+
+def sample_rows(n):
+    features = json.dumps(SAMPLE_REQUEST)
+    return [(i % USERS + 1, 'Ensemble (All Models)', 0.78, 0.83, 0.83, 0.81, 'High', features) for i in range(n)]
+
+
+def open_storage(path):
+    storage = SQLiteStorage(path)
+    storage.create_schema()
+    for i in range(USERS):
+        storage.create_user(f'user{i}@example.com', f'user{i}', 'password')
+    return storage
+
+
+def count_rows(storage):
+    return sum(len(storage.load_history(user_id, limit=10 ** 9)) for user_id in range(1, USERS + 1))
+
+
+def run_sync(path, rows):
+    storage = open_storage(path)
+    started = time.perf_counter()
+    for row in rows:
+        storage.save_predictions([row])
+    elapsed = time.perf_counter() - started
+    written = count_rows(storage)
+    storage.close()
+    return elapsed, elapsed, written, len(rows)
+
+
+def run_write_behind(path, rows, batch_size):
+    storage = open_storage(path)
+    writer = HistoryWriter(storage.save_predictions, max_queue=len(rows), batch_size=batch_size,
+                           flush_interval=0.05)
+    started = time.perf_counter()
+    for row in rows:
+        if not writer.submit(row):
+            raise RuntimeError("history queue full")
+    submitted = time.perf_counter() - started
+    writer.close()
+    elapsed = time.perf_counter() - started
+    written = count_rows(storage)
+    storage.close()
+    return submitted, elapsed, written, writer.flushes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--batch-size', type=int, default=100, help="writer's rows per executemany")
+    args = parser.parse_args()
+
+    rows = sample_rows(args.rows)
+    print(f"{'mode':<14} {'per submit':>12} {'total':>10} {'rows':>8} {'commits':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, run in (('sync', lambda path: run_sync(path, rows)),
+                          ('write-behind', lambda path: run_write_behind(path, rows, args.batch_size))):
+            submitted, elapsed, written, commits = run(os.path.join(tmp, f'{name}.db'))
+            status = "OK" if written == len(rows) else f"LOST {len(rows) - written}"
+            print(f"{name:<14} {submitted / len(rows) * 1e6:>9.1f} us {elapsed:>9.3f}s "
+                  f"{written:>8} {commits:>8}  [{status}]")
+
+
+if __name__ == '__main__':
+    main()
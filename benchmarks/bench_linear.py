@@ -0,0 +1,46 @@
+"""
+Fused Logistic Regression scorer versus scaler.transform + predict_proba.
+
+Checks that folding the StandardScaler into the weights reproduces
+sklearn's probabilities on synthetic requests, then times one row and
+batches for both paths.
+
+Usage:
+    python benchmarks/bench_linear.py [--rows N] [--repeat N]
+"""
+import argparse
+import numpy as np
+
+from bench_utils import load_api, random_requests, time_call, print_results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10000, help='synthetic rows for the equivalence check')
+    parser.add_argument('--repeat', type=int, default=1000, help='timed calls per single-row case')
+    args = parser.parse_args()
+
+    api = load_api()
+    from linear_model import FusedLogisticRegression
+
+    fused = FusedLogisticRegression.from_sklearn(api.lr_model, api.scaler)
+    X = api.preprocess_batch(random_requests(args.rows))
+
+    def sklearn_path(batch):
+        return api.lr_model.predict_proba(api.scaler.transform(batch))[:, 1]
+
+    max_diff = np.abs(fused.predict_proba(X) - sklearn_path(X)).max()
+    status = "OK" if max_diff <= 1e-9 else "MISMATCH"
+    print(f"Fused vs sklearn on {args.rows} rows: max |diff| = {max_diff:.2e} [{status}]")
+
+    results = {}
+    for batch_size in (1, 100, args.rows):
+        batch = X[:batch_size]
+        repeat = args.repeat if batch_size == 1 else max(args.repeat // 10, 10)
+        results[f'sklearn  batch={batch_size}'] = time_call(lambda: sklearn_path(batch), repeat)
+        results[f'fused    batch={batch_size}'] = time_call(lambda: fused.predict_proba(batch), repeat)
+    print_results("Logistic Regression scoring latency", results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+Per-mode latency of POST /predict, measured in-process with Flask's test client.
+
+For every model_choice, times the full response (all models evaluated) and
+the lightweight response (full_response=false, only the selected model).
+The prediction cache is cleared before each request unless --warm-cache is
+given, in which case every request after the first is a cache hit.
+
+Usage:
+    python benchmarks/bench_predict_modes.py [--repeat N]
+"""
+import argparse
+
+from bench_utils import SAMPLE_REQUEST, load_api, time_call, print_results
+
+MODEL_CHOICES = ["Ensemble (All Models)", "Random Forest", "XGBoost", "Logistic Regression"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=300, help='timed requests per case')
+    parser.add_argument('--warm-cache', action='store_true', help='keep the prediction cache between requests')
+    args = parser.parse_args()
+
+    api = load_api()
+    client = api.app.test_client()
+
+    results = {}
+    for model_choice in MODEL_CHOICES:
+        for full_response in (True, False):
+            payload = dict(SAMPLE_REQUEST, model_choice=model_choice, full_response=full_response)
+
+            def request_once():
+                if not args.warm_cache:
+                    api.prediction_cache.clear()
+                response = client.post('/predict', json=payload)
+                assert response.status_code == 200, response.get_data(as_text=True)
+
+            label = f"{model_choice} ({'full' if full_response else 'primary'})"
+            results[label] = time_call(request_once, args.repeat, warmup=20)
+
+    cache_state = 'warm' if args.warm_cache else 'cold'
+    print_results(f"POST /predict latency by mode ({cache_state} prediction cache)", results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Micro-benchmark for the /predict preprocessing path.
+
+Compares the previous approach (three dict builds, three single-row
+DataFrames and three column reorders per request) with the compiled
+FeaturePipeline, which encodes the request once into a NumPy row.
+
+Usage:
+    python benchmarks/bench_preprocessing.py [--repeat N]
+"""
+import argparse
+import numpy as np
+import pandas as pd
+
+from bench_utils import SAMPLE_REQUEST, load_api, time_call, print_results
+
+
+def legacy_preprocess(api, data_dict):
+    """
+    The per-model preprocessing that /predict used before the compiled
+    pipeline, with the category maps taken from the feature spec.
+    """
+    maps = {feature['key']: (feature['categories'], feature['default'])
+            for feature in api.feature_spec['features'] if feature['type'] == 'categorical'}
+
+    def encode(key):
+        categories, default = maps[key]
+        return categories.get(data_dict.get(key, ''), default)
+
+    features = {
+        'age': data_dict.get('age'),
+        'dietary_habits': encode('dietary_habits'),
+        'degree': encode('degree'),
+        'academic_pressure': data_dict.get('academic_pressure'),
+        'cgpa': data_dict.get('cgpa'),
+        'study_satisfaction': data_dict.get('study_satisfaction'),
+        'work/study_hours': data_dict.get('work_study_hours'),
+        'sleep_duration': encode('sleep_duration'),
+        'financial_stress': data_dict.get('financial_stress'),
+        'suicidal_thoughts': encode('suicidal_thoughts'),
+        'illness_history': encode('illness_history')
+    }
+    features['academic_stress_combo'] = features['academic_pressure'] * features['financial_stress']
+    features['burnout_index'] = features['academic_pressure'] * features['work/study_hours']
+    features['wellness_score'] = features['study_satisfaction'] + features['sleep_duration'] + features['dietary_habits']
+    input_df = pd.DataFrame([features])
+    return input_df[api.feature_names]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=2000, help='timed iterations per case')
+    args = parser.parse_args()
+
+    api = load_api()
+    data = SAMPLE_REQUEST
+
+    # Both paths must produce the same feature vector
+    legacy_row = legacy_preprocess(api, data).to_numpy(dtype=float)
+    compiled_row = api.preprocess_data_base(data)
+    assert np.allclose(legacy_row, compiled_row), "compiled pipeline diverges from legacy preprocessing"
+
+    def legacy_preprocessing_only():
+        legacy_preprocess(api, data)
+        legacy_preprocess(api, data)
+        api.scaler.transform(legacy_preprocess(api, data))
+
+    def compiled_preprocessing_only():
+        features = api.preprocess_data_base(data)
+        api.preprocess_for_logistic_regression(features)
+
+    def legacy_request():
+        api.rf_model.predict_proba(legacy_preprocess(api, data))[0][1]
+        api.xgb_model.predict_proba(legacy_preprocess(api, data))[0][1]
+        api.lr_model.predict_proba(api.scaler.transform(legacy_preprocess(api, data)))[0][1]
+
+    def compiled_request():
+        features = api.preprocess_data_base(data)
+        api.rf_model.predict_proba(features)[0][1]
+        api.xgb_model.predict_proba(features)[0][1]
+        api.lr_model.predict_proba(api.preprocess_for_logistic_regression(features))[0][1]
+
+    print_results("Preprocessing only (all three models' inputs)", {
+        'legacy (3x dict + DataFrame)': time_call(legacy_preprocessing_only, args.repeat),
+        'compiled (1x NumPy row)': time_call(compiled_preprocessing_only, args.repeat)
+    })
+    print_results("Preprocessing + predict_proba for all three models", {
+        'legacy': time_call(legacy_request, max(args.repeat // 10, 50)),
+        'compiled': time_call(compiled_request, max(args.repeat // 10, 50))
+    })
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""
+Throughput of the API under concurrent HTTP load, per serving mode.
+
+Starts the API as a subprocess in each requested mode, waits for /health,
+then sends --requests POST /predict calls from --concurrency client threads
+over keep-alive connections and reports requests/second and latency.
+
+Modes:
+    dev        python api/api.py (Flask development server)
+    gunicorn   gunicorn -c api/gunicorn.conf.py (API_WORKERS / API_THREADS apply)
+    asgi       uvicorn asgi:app (micro-batching; MICROBATCH_MAX_SIZE / MICROBATCH_WAIT_MS apply)
+
+Usage:
+    python benchmarks/bench_serving.py [--modes dev gunicorn] [--requests N] [--concurrency C]
+"""
+import argparse
+import http.client
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import numpy as np
+
+from bench_utils import base_path, random_requests
+
+SERVER_COMMANDS = {
+    'dev': [sys.executable, os.path.join(base_path, 'api', 'api.py')],
+    'gunicorn': [sys.executable, '-m', 'gunicorn', '-c', os.path.join(base_path, 'api', 'gunicorn.conf.py')],
+    'asgi': [sys.executable, '-m', 'uvicorn', 'asgi:app', '--app-dir', os.path.join(base_path, 'api'),
+             '--port', '{port}', '--log-level', 'warning']
+}
+
+
+def wait_until_ready(port, timeout=120):
+    """
+    Poll /health until the server answers 200.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            conn.request('GET', '/health')
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"server on port {port} did not become ready")
+
+
+def run_http_load(port, payloads, concurrency, path='/predict', content_type='application/json'):
+    """
+    Send every payload once, spread over `concurrency` keep-alive client threads.
+    Returns (latencies in seconds, wall-clock seconds, error count).
+    """
+    latencies = np.zeros(len(payloads))
+    errors = [0]
+    next_index = [0]
+    lock = threading.Lock()
+
+    def worker():
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        while True:
+            with lock:
+                i = next_index[0]
+                next_index[0] += 1
+            if i >= len(payloads):
+                break
+            body = payloads[i] if isinstance(payloads[i], (bytes, str)) else json.dumps(payloads[i])
+            start = time.perf_counter()
+            try:
+                conn.request('POST', path, body=body, headers={'Content-Type': content_type})
+                response = conn.getresponse()
+                response.read()
+                if response.status != 200:
+                    errors[0] += 1
+            except OSError:
+                errors[0] += 1
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            latencies[i] = time.perf_counter() - start
+        conn.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, time.perf_counter() - started, errors[0]
+
+
+def summarize(latencies, wall_seconds, errors):
+    ms = latencies * 1000
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': len(latencies) / wall_seconds,
+        'p50_ms': float(np.percentile(ms, 50)),
+        'p95_ms': float(np.percentile(ms, 95)),
+        'p99_ms': float(np.percentile(ms, 99))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modes', nargs='+', default=list(SERVER_COMMANDS), choices=list(SERVER_COMMANDS))
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--port', type=int, default=5055)
+    args = parser.parse_args()
+
+    # Distinct payloads so the prediction cache does not turn this into a cache benchmark
+    payloads = random_requests(args.requests, seed=1)
+
+    print(f"{'mode':<12}{'req/s':>10}{'p50 (ms)':>12}{'p95 (ms)':>12}{'p99 (ms)':>12}{'errors':>8}")
+    for mode in args.modes:
+        env = dict(os.environ, PORT=str(args.port), PYTHONWARNINGS='ignore')
+        command = [part.format(port=args.port) for part in SERVER_COMMANDS[mode]]
+        server = subprocess.Popen(command, env=env, cwd=os.path.join(base_path, 'api'),
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_until_ready(args.port)
+            run_http_load(args.port, payloads[:50], args.concurrency)  # warm-up
+            stats = summarize(*run_http_load(args.port, payloads, args.concurrency))
+        finally:
+            server.terminate()
+            server.wait()
+        print(f"{mode:<12}{stats['rps']:>10.1f}{stats['p50_ms']:>12.2f}{stats['p95_ms']:>12.2f}"
+              f"{stats['p99_ms']:>12.2f}{stats['errors']:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Cold-start time of the API.
+
+Each configuration is measured in fresh Python processes (so nothing is
+cached in sys.modules) and reports the median over --runs of:
+  - import: time until `import api` returns (the process can answer /health)
+  - ready:  time until the models are loaded and compiled (/health/ready is 200)
+  - files:  time the model registry spent reading the artifacts
+plus the import time of the heavy libraries on their own, for reference.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs N]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import numpy as np
+
+from bench_utils import api_path
+
+# (name, environment overrides)
+CONFIGURATIONS = [
+    ('parallel, mmap (default)', {}),
+    ('sequential, mmap', {'MODEL_LOAD_WORKERS': '1'}),
+    ('parallel, no mmap', {'MODEL_MMAP': '0'}),
+    ('background loading', {'MODEL_LOADING': 'background'}),
+]
+
+PROBE = """
+import json, time, warnings
+warnings.simplefilter('ignore')
+started = time.perf_counter()
+import api
+imported = time.perf_counter() - started
+api.wait_until_ready()
+ready = time.perf_counter() - started
+print(json.dumps({'import': imported, 'ready': ready, 'files': api.registry.total_seconds}))
+"""
+
+LIBRARY_PROBE = """
+import json, time
+started = time.perf_counter()
+import {module}
+print(json.dumps({{'import': time.perf_counter() - started}}))
+"""
+
+
+def run_probe(code, env_overrides):
+    env = dict(os.environ, **env_overrides)
+    output = subprocess.check_output([sys.executable, '-c', code], cwd=api_path, env=env,
+                                     stderr=subprocess.DEVNULL, text=True)
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help='fresh processes per configuration')
+    args = parser.parse_args()
+
+    print(f"{'configuration':<28}{'import (s)':>12}{'ready (s)':>12}{'files (s)':>12}")
+    for name, env_overrides in CONFIGURATIONS:
+        runs = [run_probe(PROBE, env_overrides) for _ in range(args.runs)]
+        medians = {key: float(np.median([run[key] for run in runs])) for key in runs[0]}
+        print(f"{name:<28}{medians['import']:>12.3f}{medians['ready']:>12.3f}{medians['files']:>12.3f}")
+
+    print(f"\n{'library':<28}{'import (s)':>12}")
+    for module in ('numpy', 'flask', 'joblib', 'sklearn.ensemble', 'xgboost'):
+        runs = [run_probe(LIBRARY_PROBE.format(module=module), {}) for _ in range(args.runs)]
+        print(f"{module:<28}{float(np.median([run['import'] for run in runs])):>12.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+NumPy tree engine versus the libraries' predict_proba.
+
+Checks that the flat-array TreeEnsemble reproduces the XGBoost and Random
+Forest probabilities to 1e-6 on synthetic requests, then times single-row
+and batch inference for both backends.
+
+Usage:
+    python benchmarks/bench_tree_engine.py [--rows N] [--repeat N]
+"""
+import argparse
+import numpy as np
+
+from bench_utils import load_api, random_requests, time_call, print_results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10000, help='synthetic rows for the equivalence check')
+    parser.add_argument('--repeat', type=int, default=200, help='timed calls per single-row case')
+    args = parser.parse_args()
+
+    api = load_api()
+    from tree_engine import TreeEnsemble, load_tree_ensemble
+
+    X = api.preprocess_batch(random_requests(args.rows))
+    models = {'XGBoost': api.xgb_model, 'Random Forest': api.rf_model}
+
+    for name, model in models.items():
+        if model is None or isinstance(model, TreeEnsemble):
+            print(f"{name}: no library model loaded (missing or compact export), skipped\n")
+            continue
+        engine = load_tree_ensemble(model)
+        max_diff = np.abs(engine.predict_proba(X) - model.predict_proba(X)[:, 1]).max()
+        status = "OK" if max_diff <= 1e-6 else "MISMATCH"
+        print(f"{name}: {engine.n_trees} trees, {engine.n_nodes} nodes, depth {engine.max_depth}, "
+              f"max |diff| = {max_diff:.2e} [{status}]")
+
+        results = {}
+        for batch_size in (1, 100, args.rows):
+            batch = X[:batch_size]
+            repeat = args.repeat if batch_size == 1 else max(args.repeat // 10, 5)
+            results[f'library  batch={batch_size}'] = time_call(lambda: model.predict_proba(batch), repeat, warmup=5)
+            results[f'engine   batch={batch_size}'] = time_call(lambda: engine.predict_proba(batch), repeat, warmup=5)
+        print_results(f"{name} predict_proba latency", results)
+        print()
+
+
+if __name__ == '__main__':
+    main()
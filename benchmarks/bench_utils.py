@@ -0,0 +1,127 @@
+import csv
+import os
+import sys
+import time
+import warnings
+import numpy as np
+
+# Make the API modules importable from the benchmark scripts
+base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+api_path = os.path.join(base_path, 'api')
+if api_path not in sys.path:
+    sys.path.insert(0, api_path)
+
+from features import load_feature_spec, spec_categories
+
+# Representative request, matching the defaults of the Streamlit form
+SAMPLE_REQUEST = {
+    'age': 20,
+    'dietary_habits': 'Moderate',
+    'degree': 'BSc',
+    'academic_pressure': 5,
+    'cgpa': 7.0,
+    'study_satisfaction': 5,
+    'work_study_hours': 8,
+    'sleep_duration': '5-6 hours',
+    'financial_stress': 5,
+    'suicidal_thoughts': 'No',
+    'illness_history': 'No',
+    'model_choice': 'Ensemble (All Models)'
+}
+
+
+# Keep benchmark output readable (unpickling version warnings and the like)
+warnings.filterwarnings('ignore', category=UserWarning)
+
+
+def random_requests(n, seed=0):
+    """
+    Generate n synthetic /predict payloads spanning the Streamlit form's input
+    domains, with the categories of models/feature_spec.json.
+    """
+    rng = np.random.default_rng(seed)
+    categories = spec_categories(load_feature_spec(os.path.join(base_path, 'models', 'feature_spec.json')))
+    sleep = categories['sleep_duration']
+    diet = categories['dietary_habits']
+    degree = categories['degree']
+    yes_no = categories['suicidal_thoughts']
+    return [{
+        'age': int(rng.integers(15, 41)),
+        'dietary_habits': diet[rng.integers(len(diet))],
+        'degree': degree[rng.integers(len(degree))],
+        'academic_pressure': int(rng.integers(1, 11)),
+        'cgpa': round(float(rng.uniform(0, 10)), 1),
+        'study_satisfaction': int(rng.integers(1, 11)),
+        'work_study_hours': int(rng.integers(1, 25)),
+        'sleep_duration': sleep[rng.integers(len(sleep))],
+        'financial_stress': int(rng.integers(1, 11)),
+        'suicidal_thoughts': yes_no[rng.integers(2)],
+        'illness_history': yes_no[rng.integers(2)]
+    } for _ in range(n)]
+
+
+def dataset_requests(n, seed=0):
+    """
+    Draw n /predict payloads from data/student_depression_dataset.csv
+    (sampled with replacement), converted to the API's request schema.
+    Rows with missing ('?') values are skipped.
+    """
+    rows = []
+    with open(os.path.join(base_path, 'data', 'student_depression_dataset.csv'), newline='') as f:
+        for row in csv.DictReader(f):
+            row = {key: value.strip("'").strip() for key, value in row.items()}
+            if '?' in row.values():
+                continue
+            rows.append({
+                'age': float(row['Age']),
+                'dietary_habits': row['Dietary Habits'],
+                'degree': row['Degree'],
+                'academic_pressure': float(row['Academic Pressure']),
+                'cgpa': float(row['CGPA']),
+                'study_satisfaction': float(row['Study Satisfaction']),
+                'work_study_hours': float(row['Work/Study Hours']),
+                'sleep_duration': row['Sleep Duration'],
+                'financial_stress': float(row['Financial Stress']),
+                'suicidal_thoughts': row['Have you ever had suicidal thoughts ?'],
+                'illness_history': row['Family History of Mental Illness']
+            })
+    rng = np.random.default_rng(seed)
+    return [dict(rows[i]) for i in rng.integers(len(rows), size=n)]
+
+
+def load_api():
+    """
+    Import the API module, which loads the models.
+    """
+    import api
+    return api
+
+
+def time_call(fn, repeat=1000, warmup=50):
+    """
+    Call fn() repeatedly and return latency statistics in microseconds.
+    """
+    for _ in range(warmup):
+        fn()
+    timings = np.empty(repeat)
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings[i] = time.perf_counter() - start
+    timings *= 1e6
+    return {
+        'mean_us': float(timings.mean()),
+        'p50_us': float(np.percentile(timings, 50)),
+        'p95_us': float(np.percentile(timings, 95)),
+        'p99_us': float(np.percentile(timings, 99))
+    }
+
+
+def print_results(title, results):
+    """
+    Print a {name: stats} mapping as a small aligned table.
+    """
+    print(f"\n{title}")
+    print(f"{'case':<40}{'mean (us)':>12}{'p50 (us)':>12}{'p95 (us)':>12}")
+    for name, stats in results.items():
+        print(f"{name:<40}{stats['mean_us']:>12.1f}{stats['p50_us']:>12.1f}{stats['p95_us']:>12.1f}")
@@ -0,0 +1,196 @@
+"""
+Load-testing harness for the prediction API.
+
+Runs the API in-process (Flask test client, no network) and over a local
+socket (threaded WSGI server on 127.0.0.1), using synthetic payloads drawn
+from data/student_depression_dataset.csv, and reports p50/p95/p99 latency
+and requests/second:
+  - POST /predict for each model_choice, running only the models it needs
+    (full_response=false), plus the full response (every enabled model)
+  - POST /predict/batch for each batch size (also reported as rows/second)
+
+Results are saved as JSON (default: benchmarks/results/<timestamp>_<commit>.json)
+so runs can be compared across commits with --compare.
+
+Usage:
+    python benchmarks/load_test.py [--requests N] [--concurrency C]
+        [--batch-sizes 1 10 100 1000] [--transports inprocess socket]
+        [--output results.json] [--compare baseline.json] [--threshold 0.10] [--with-cache]
+
+Exits with status 1 when --compare finds a regression.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+import numpy as np
+
+from bench_utils import base_path, dataset_requests
+from bench_serving import run_http_load, summarize
+
+MODEL_CHOICES = ["Ensemble (All Models)", "Random Forest", "XGBoost", "Logistic Regression"]
+
+# /predict cases: (name, extra payload fields). full_response defaults to true,
+# which runs every enabled model whatever the model_choice
+PREDICT_CASES = [(f'predict[{choice}]', {'model_choice': choice, 'full_response': False})
+                 for choice in MODEL_CHOICES] + [('predict[full response]', {'full_response': True})]
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=base_path,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def run_inprocess_load(client, payloads, path='/predict'):
+    """
+    Send every payload sequentially through the Flask test client.
+    """
+    latencies = np.zeros(len(payloads))
+    errors = 0
+    started = time.perf_counter()
+    for i, payload in enumerate(payloads):
+        start = time.perf_counter()
+        response = client.post(path, json=payload)
+        latencies[i] = time.perf_counter() - start
+        if response.status_code != 200:
+            errors += 1
+    return latencies, time.perf_counter() - started, errors
+
+
+def start_socket_server(app):
+    """
+    Serve the app from a threaded WSGI server on a free local port.
+    """
+    import logging
+    from werkzeug.serving import make_server
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def run_suite(transport, api, args):
+    """
+    Run every /predict and /predict/batch case over one transport.
+    """
+    results = {}
+    if transport == 'inprocess':
+        client = api.app.test_client()
+        run = lambda payloads, path: run_inprocess_load(client, payloads, path)
+        server = None
+    else:
+        server = start_socket_server(api.app)
+        run = lambda payloads, path: run_http_load(server.server_port, payloads, args.concurrency, path)
+
+    try:
+        for case, fields in PREDICT_CASES:
+            payloads = [dict(p, **fields) for p in dataset_requests(args.requests, seed=1)]
+            run(payloads[:20], '/predict')  # warm-up
+            results[case] = summarize(*run(payloads, '/predict'))
+
+        for batch_size in args.batch_sizes:
+            n_batches = max(args.requests // batch_size, 5)
+            records = dataset_requests(n_batches * batch_size, seed=2)
+            batches = [records[i:i + batch_size] for i in range(0, len(records), batch_size)]
+            run(batches[:2], '/predict/batch')  # warm-up
+            stats = summarize(*run(batches, '/predict/batch'))
+            stats['rows_per_second'] = stats['rps'] * batch_size
+            results[f'batch[{batch_size}]'] = stats
+    finally:
+        if server is not None:
+            server.shutdown()
+    return results
+
+
+def print_suite(transport, results):
+    print(f"\n{transport}")
+    print(f"{'case':<36}{'req/s':>10}{'rows/s':>10}{'p50 (ms)':>10}{'p95 (ms)':>10}{'p99 (ms)':>10}{'err':>6}")
+    for case, stats in results.items():
+        rows = stats.get('rows_per_second', stats['rps'])
+        print(f"{case:<36}{stats['rps']:>10.1f}{rows:>10.0f}{stats['p50_ms']:>10.2f}"
+              f"{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}{stats['errors']:>6}")
+
+
+def compare(current, baseline_path, threshold):
+    """
+    Print latency/throughput deltas against a saved run; returns the number of regressions.
+    """
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\nComparison with {baseline_path} (commit {baseline['meta']['commit']})")
+    print(f"{'case':<48}{'p50 delta':>12}{'p95 delta':>12}{'req/s delta':>12}")
+    regressions = 0
+    for transport, cases in current['results'].items():
+        for case, stats in cases.items():
+            old = baseline['results'].get(transport, {}).get(case)
+            if old is None:
+                continue
+            deltas = [stats[key] / old[key] - 1 for key in ('p50_ms', 'p95_ms', 'rps')]
+            flag = ''
+            if deltas[0] > threshold or deltas[1] > threshold:
+                flag = '  REGRESSION'
+                regressions += 1
+            print(f"{transport + ' ' + case:<48}{deltas[0]:>+12.1%}{deltas[1]:>+12.1%}{deltas[2]:>+12.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=500, help='requests per /predict case')
+    parser.add_argument('--concurrency', type=int, default=8, help='client threads for the socket transport')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 10, 100, 1000])
+    parser.add_argument('--transports', nargs='+', default=['inprocess', 'socket'], choices=['inprocess', 'socket'])
+    parser.add_argument('--output', help='where to save the JSON results')
+    parser.add_argument('--compare', help='previous results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='relative p50/p95 slowdown flagged as a regression by --compare')
+    parser.add_argument('--with-cache', action='store_true', help='leave the prediction cache enabled')
+    args = parser.parse_args()
+
+    # Measure the models, not the cache, unless asked otherwise
+    if not args.with_cache:
+        os.environ['PREDICTION_CACHE_SIZE'] = '0'
+    from bench_utils import load_api
+    api = load_api()
+    api.app.logger.disabled = True
+
+    commit = git_commit()
+    run = {
+        'meta': {
+            'commit': commit,
+            'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'args': vars(args)
+        },
+        'results': {}
+    }
+    for transport in args.transports:
+        run['results'][transport] = run_suite(transport, api, args)
+        print_suite(transport, run['results'][transport])
+
+    output = args.output
+    if output is None:
+        stamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+        output = os.path.join(base_path, 'benchmarks', 'results', f'{stamp}_{commit}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(run, f, indent=2)
+    print(f"\nSaved results to {output}")
+
+    if args.compare and compare(run, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
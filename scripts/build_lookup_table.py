@@ -0,0 +1,121 @@
+"""
+Offline build step for the API's lookup-table mode.
+
+Scores every combination of the discrete input grid (see spec_axes in
+api/lookup_table.py) with every loaded model and writes the results as a
+uint16 memory-mappable .npy file plus a JSON header describing the grid
+and fingerprinting the model files and feature spec it was built from.
+Point the API at it with LOOKUP_TABLE_PATH; rebuild it after retraining.
+
+The categorical axes are the categories in the API's feature spec. Degree
+has 28, so only the --degrees most frequent ones in the training data are
+tabulated (all of them with --degrees 0); the others are scored live.
+
+Numeric axes can be overridden as START:STEP:COUNT, e.g. --age 18:2:10.
+Their snap distance is half a step, so every value inside the range is
+answered from its nearest grid point.
+
+Usage:
+    python scripts/build_lookup_table.py [--output models/lookup_table.npy]
+        [--degrees 4] [--data data/student_depression_dataset.csv]
+        [--age 17:4:5] [--cgpa 5:1.25:5] [--hours 0:3:5]
+"""
+import argparse
+import datetime
+import json
+import os
+import sys
+import time
+import warnings
+import numpy as np
+import pandas as pd
+
+base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(base_path, 'api'))
+sys.path.insert(0, base_path)
+
+from lookup_table import (NUMERIC_AXES, MISSING, grid_matrix, grid_shape, header_path, quantize, spec_axes,
+                          table_fingerprint)
+from training.dataset import DATA_PATH, clean
+
+
+def parse_axis(spec):
+    start, step, count = spec.split(':')
+    return float(start), float(step), int(count)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', default=os.path.join(base_path, 'models', 'lookup_table.npy'))
+    parser.add_argument('--age', type=parse_axis, help='START:STEP:COUNT for age')
+    parser.add_argument('--cgpa', type=parse_axis, help='START:STEP:COUNT for cgpa')
+    parser.add_argument('--hours', type=parse_axis, help='START:STEP:COUNT for work/study hours')
+    parser.add_argument('--degrees', type=int, default=4, help='most frequent degrees to tabulate; 0 for all')
+    parser.add_argument('--data', default=DATA_PATH, help='training CSV the degree frequencies are counted in')
+    parser.add_argument('--chunk-size', type=int, default=65536, help='grid cells scored per model call')
+    args = parser.parse_args()
+
+    # Apply numeric axis overrides
+    overrides = {'age': args.age, 'cgpa': args.cgpa, 'work/study_hours': args.hours}
+    numeric_axes = []
+    for name, start, step, count, snap in NUMERIC_AXES:
+        if overrides.get(name) is not None:
+            start, step, count = overrides[name]
+            snap = step / 2
+        numeric_axes.append((name, start, step, count, snap))
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        import api
+
+    categories = {}
+    if args.degrees:
+        frequent = clean(pd.read_csv(args.data))['degree'].value_counts().index
+        # Only degrees the spec knows; value_counts breaks ties in first-seen order
+        known = api.feature_pipeline.categories['degree']
+        categories['degree'] = [str(degree) for degree in frequent if str(degree) in known][:args.degrees]
+    axes = spec_axes(api.feature_spec, numeric_axes, categories)
+    for axis in axes:
+        if 'categories' in axis:
+            print(f"{axis['name']}: {', '.join(axis['categories'])}")
+
+    # Models that failed to load are left out; the API falls back to live inference for them
+    model_keys = list(api.model_set.loaded)
+    n_cells = int(np.prod(grid_shape(axes)))
+    print(f"Grid {grid_shape(axes)} = {n_cells:,} cells x {len(model_keys)} models "
+          f"({n_cells * len(model_keys) * 2 / 1e6:.1f} MB)")
+
+    table = np.lib.format.open_memmap(args.output, mode='w+', dtype=np.uint16, shape=(n_cells, len(model_keys)))
+    table[:] = MISSING
+
+    started = time.perf_counter()
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for start in range(0, n_cells, args.chunk_size):
+            flat_indices = np.arange(start, min(start + args.chunk_size, n_cells))
+            matrix = grid_matrix(axes, api.feature_names, flat_indices, api.feature_pipeline)
+            for column, model_key in enumerate(model_keys):
+                table[flat_indices, column] = quantize(api.MODEL_SCORERS[model_key](matrix))
+            done = flat_indices[-1] + 1
+            elapsed = time.perf_counter() - started
+            print(f"\r{done:,}/{n_cells:,} cells ({done / elapsed:,.0f} cells/s)", end='', flush=True)
+    table.flush()
+    print()
+
+    header = {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'feature_names': list(api.feature_names),
+        'axes': axes,
+        'models': model_keys,
+        # The API refuses the table once any of these files change
+        'fingerprint': table_fingerprint(api.models_path, api.registry.sources, model_keys,
+                                         api.feature_spec_path, api.feature_spec)
+    }
+    with open(header_path(args.output), 'w') as f:
+        json.dump(header, f, indent=2)
+
+    print(f"Wrote {args.output} and {header_path(args.output)} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
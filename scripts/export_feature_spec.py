@@ -0,0 +1,42 @@
+"""
+Write models/feature_spec.json for the models in models/.
+
+The spec records how requests are encoded for the models: training column
+order, the category -> code table of every categorical feature (the sleep
+and yes/no maps and LabelEncoder's codes), numeric training means and the
+derived features (see training/feature_spec.py). The API compiles it at
+startup. scripts/train_models.py writes it with every run; this script
+rebuilds it from the CSV for models trained elsewhere, e.g. by the notebook.
+
+Usage:
+    python scripts/export_feature_spec.py [--data data/student_depression_dataset.csv]
+        [--output models/feature_spec.json]
+"""
+import argparse
+import os
+import sys
+import pandas as pd
+
+base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, base_path)
+
+from training.dataset import DATA_PATH
+from training.dataset_cache import file_sha256
+from training.feature_spec import FEATURE_SPEC_FILE, build_feature_spec, write_feature_spec
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--data', default=DATA_PATH)
+    parser.add_argument('--output', default=os.path.join(base_path, 'models', FEATURE_SPEC_FILE))
+    args = parser.parse_args()
+
+    spec = build_feature_spec(pd.read_csv(args.data), file_sha256(args.data))
+    write_feature_spec(spec, args.output)
+    categorical = [feature for feature in spec['features'] if feature['type'] == 'categorical']
+    print(f"Wrote {args.output}: {len(spec['feature_names'])} features, " +
+          ', '.join(f"{feature['key']} ({len(feature['categories'])} categories)" for feature in categorical))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Export the trained Random Forest to the API's compact serving format.
+
+Reads models/random_forest.pkl and writes models/random_forest.npz: the
+trees packed into flat arrays with float32 thresholds and leaf values, uint8
+feature indices and int32 child indices (see save_compact_ensemble in
+api/tree_engine.py). The API loads the .npz in preference to the pickle,
+without scikit-learn's unpickling.
+
+--trees keeps only the first N trees and --max-depth cuts every tree at that
+depth, shrinking the artifact and speeding up inference. The export reports
+ROC AUC on the notebook's held-out test split for the original and the
+compact forest, so the cost of truncation is visible before it ships.
+
+Usage:
+    python scripts/export_forest.py [--input models/random_forest.pkl]
+        [--output models/random_forest.npz] [--trees N] [--max-depth D]
+"""
+import argparse
+import datetime
+import os
+import sys
+import time
+import warnings
+import joblib
+import numpy as np
+from sklearn.metrics import roc_auc_score
+
+base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(base_path, 'api'))
+sys.path.insert(0, base_path)
+
+from tree_engine import load_compact_ensemble, load_random_forest_ensemble, save_compact_ensemble
+from training.dataset import DATA_PATH, split_dataset
+from training.dataset_cache import load_cached_dataset
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--input', default=os.path.join(base_path, 'models', 'random_forest.pkl'))
+    parser.add_argument('--output', default=os.path.join(base_path, 'models', 'random_forest.npz'))
+    parser.add_argument('--trees', type=int, help='keep only the first N trees')
+    parser.add_argument('--max-depth', type=int, help='cut every tree at this depth')
+    parser.add_argument('--data', default=DATA_PATH, help='dataset CSV for the AUC check')
+    args = parser.parse_args()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        model = joblib.load(args.input)
+
+    ensemble = load_random_forest_ensemble(model, n_trees=args.trees, max_depth=args.max_depth)
+    full_depth = max(estimator.tree_.max_depth for estimator in model.estimators_)
+    full_nodes = sum(estimator.tree_.node_count for estimator in model.estimators_)
+    print(f"Forest: {len(model.estimators_)} trees, depth {full_depth}, {full_nodes:,} nodes -> "
+          f"{ensemble.n_trees} trees, depth {ensemble.max_depth}, {ensemble.n_nodes:,} nodes")
+
+    # Score the held-out split with the original model and the compact export
+    X, y, _ = load_cached_dataset(args.data)
+    _, X_test, _, y_test = split_dataset(X, y)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        reference = model.predict_proba(X_test.values)[:, 1]
+
+    metadata = {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'source': os.path.basename(args.input),
+        'trees': ensemble.n_trees,
+        'max_depth': ensemble.max_depth,
+        'source_trees': len(model.estimators_),
+        'source_max_depth': int(full_depth)
+    }
+    save_compact_ensemble(ensemble, args.output, metadata)
+
+    # Check what the API will load, not the in-memory ensemble
+    started = time.perf_counter()
+    compact = load_compact_ensemble(args.output)
+    load_seconds = time.perf_counter() - started
+    proba = compact.predict_proba(X_test.values)
+
+    auc_reference = roc_auc_score(y_test, reference)
+    auc_compact = roc_auc_score(y_test, proba)
+    print(f"Test ROC AUC: original {auc_reference:.5f}, compact {auc_compact:.5f} "
+          f"(delta {auc_compact - auc_reference:+.5f})")
+    print(f"Max probability difference: {np.abs(proba - reference).max():.2e}")
+    print(f"Size: {os.path.getsize(args.input) / 1e6:.2f} MB pickle -> "
+          f"{os.path.getsize(args.output) / 1e6:.2f} MB ({args.output}, loads in {load_seconds * 1000:.1f} ms)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Convert the pickled XGBoost model to XGBoost's native binary format.
+
+The API loads models/xgboost.ubj in preference to models/xgboost.pkl: the
+native format is stable across XGBoost versions and loads without
+unpickling. The converted model is checked against the pickle before it is
+written.
+
+Usage:
+    python scripts/export_xgboost_model.py [--input models/xgboost.pkl] [--output models/xgboost.ubj]
+"""
+import argparse
+import os
+import warnings
+import joblib
+import numpy as np
+import xgboost
+
+base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+models_path = os.path.join(base_path, 'models')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--input', default=os.path.join(models_path, 'xgboost.pkl'))
+    parser.add_argument('--output', default=os.path.join(models_path, 'xgboost.ubj'))
+    args = parser.parse_args()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        model = joblib.load(args.input)
+
+    tmp_path = args.output + '.tmp' + os.path.splitext(args.output)[1]
+    model.save_model(tmp_path)
+    native = xgboost.XGBClassifier()
+    native.load_model(tmp_path)
+
+    # Same trees, same probabilities
+    rng = np.random.default_rng(0)
+    probe = rng.normal(0, 5, size=(1000, model.n_features_in_))
+    max_diff = np.abs(native.predict_proba(probe) - model.predict_proba(probe)).max()
+    if max_diff > 1e-6:
+        os.remove(tmp_path)
+        raise SystemExit(f"Exported model differs from the pickle by {max_diff:.2e}")
+
+    os.replace(tmp_path, args.output)
+    print(f"Wrote {args.output} ({os.path.getsize(args.output):,} bytes, max difference {max_diff:.1e})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+"""
+Create the Streamlit app's tables and indexes (users, prediction_history).
+
+The app creates them once per process when its storage starts; run this
+instead, e.g. as a deploy step, and set DB_BOOTSTRAP_SCHEMA=0 for the app
+when it should not run DDL itself. The backend and connection settings are
+the app's: STORAGE_BACKEND, DB_* for MySQL and SQLITE_PATH for SQLite
+(app/.env is read if present).
+
+Usage:
+    python scripts/init_db.py
+"""
+import os
+import sys
+from dotenv import load_dotenv
+
+base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(base_path, 'app'))
+
+from storage import storage_from_env
+
+
+def main():
+    load_dotenv(os.path.join(base_path, 'app', '.env'))
+    load_dotenv()
+    storage = storage_from_env()
+    try:
+        storage.create_schema()
+    finally:
+        storage.close()
+    print(f"Schema ready ({storage.name})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,223 @@
+"""
+Score a CSV or NDJSON file offline, in constant memory.
+
+The input is read in fixed-size chunks, each chunk is encoded with the API's
+FeaturePipeline (the same mappings as preprocess_data_base, one vectorized
+pass per column), scored with the API's models and appended to the output
+before the next chunk is read, so memory does not grow with the file.
+
+Inputs:
+  - CSV in the schema of data/student_depression_dataset.csv (raw column
+    names such as "Sleep Duration"; extra columns are not read)
+  - NDJSON with one /predict payload per line (age, sleep_duration, ...)
+
+Output rows carry the input's id (when present), every model's probability,
+the ensemble probability and its risk level, as CSV or NDJSON (picked from
+the output file's extension). Numeric values that are missing or '?' are
+filled with the training means from the feature spec, as the notebook's
+preprocessing did. Categories outside the spec are not rejected as the API
+rejects them: they are encoded as the feature's default, and the final
+summary reports how many there were per feature.
+
+--workers N scores chunks in N forked processes that share the loaded
+models; at most 2N chunks are in flight, and output keeps input order.
+
+Usage:
+    python scripts/score_file.py INPUT OUTPUT [--chunk-size 10000] [--workers N]
+        [--format csv|ndjson] [--models rf,xgb,lr]
+"""
+import argparse
+import collections
+import multiprocessing
+import os
+import resource
+import sys
+import time
+import warnings
+import numpy as np
+import pandas as pd
+
+base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(base_path, 'api'))
+
+# Dataset CSV column -> /predict request key
+CSV_COLUMNS = {
+    'Age': 'age',
+    'Academic Pressure': 'academic_pressure',
+    'CGPA': 'cgpa',
+    'Study Satisfaction': 'study_satisfaction',
+    'Work/Study Hours': 'work_study_hours',
+    'Sleep Duration': 'sleep_duration',
+    'Dietary Habits': 'dietary_habits',
+    'Degree': 'degree',
+    'Have you ever had suicidal thoughts ?': 'suicidal_thoughts',
+    'Financial Stress': 'financial_stress',
+    'Family History of Mental Illness': 'illness_history'
+}
+
+ID_COLUMN = 'id'
+
+# Set in the parent before forking, so workers inherit the loaded models
+api = None
+model_keys = None
+
+
+def file_format(path, explicit=None):
+    if explicit:
+        return explicit
+    return 'ndjson' if os.path.splitext(path)[1].lower() in ('.ndjson', '.jsonl', '.json') else 'csv'
+
+
+def read_chunks(path, fmt, chunk_size):
+    """
+    Yield DataFrame chunks keyed by request keys (plus the id column, if any).
+    """
+    if fmt == 'ndjson':
+        yield from pd.read_json(path, lines=True, chunksize=chunk_size, dtype=False)
+        return
+
+    header = pd.read_csv(path, nrows=0, skipinitialspace=True).columns
+    names = {name: name.strip() for name in header}
+    wanted = [name for name in header if names[name] in CSV_COLUMNS or names[name] == ID_COLUMN]
+    for chunk in pd.read_csv(path, usecols=wanted, chunksize=chunk_size, dtype=str,
+                             skipinitialspace=True, keep_default_na=False):
+        chunk.columns = [CSV_COLUMNS.get(names[name], names[name]) for name in chunk.columns]
+        yield chunk
+
+
+def chunk_columns(chunk):
+    """
+    Request-key columns of a chunk, cleaned like training/dataset.py: quotes
+    and spaces stripped from categories, '?' and blanks read as missing.
+    """
+    means = {feature['key']: feature.get('mean', 0.0) for feature in api.feature_spec['features']}
+    columns = {}
+    for name, key, categorical in api.feature_pipeline.base_features:
+        if key not in chunk:
+            continue
+        values = chunk[key]
+        if not categorical:
+            numeric = pd.to_numeric(values, errors='coerce').to_numpy(dtype=float, copy=True)
+            numeric[np.isnan(numeric)] = means[key]
+            columns[key] = numeric
+        else:
+            columns[key] = values.astype(str).str.strip().str.strip("'").to_numpy()
+    return columns
+
+
+def score_chunk(chunk):
+    """
+    Encode and score one chunk; returns the output rows as a DataFrame and
+    {request key: categories not in the spec} for the chunk. The pipeline's
+    counters are per process, so the chunk's own counts travel back with
+    its rows when it was scored by a worker.
+    """
+    before = api.feature_pipeline.unknown_counts()
+    features = api.feature_pipeline.transform_columns(chunk_columns(chunk), len(chunk))
+    unknown = {key: count - before[key] for key, count in api.feature_pipeline.unknown_counts().items()}
+    # The ensemble is taken over the selected models only
+    active = api.model_set.current()
+    active = active._replace(ensemble_models=tuple(key for key in active.ensemble_models if key in model_keys))
+    preds = api.run_models(features, model_keys)
+
+    output = {}
+    if ID_COLUMN in chunk:
+        output[ID_COLUMN] = chunk[ID_COLUMN].to_numpy()
+    for key in model_keys:
+        output[f'{key}_prediction'] = preds[key]
+    if active.ensemble_models:
+        ensemble = active.ensemble(preds, slice(None))
+        output['ensemble_prediction'] = ensemble
+        output['risk_level'] = [api.get_risk_assessment(p)[0] for p in ensemble.tolist()]
+    return pd.DataFrame(output), unknown
+
+
+def write_chunk(frame, f, fmt, first):
+    if fmt == 'ndjson':
+        if len(frame):
+            f.write(frame.to_json(orient='records', lines=True).rstrip('\n') + '\n')
+    else:
+        frame.to_csv(f, header=first, index=False, lineterminator='\n')
+
+
+def score_chunks(chunks, workers):
+    """
+    Yield scored chunks in input order, keeping at most 2 * workers chunks in
+    flight so a fast reader cannot queue up the whole file.
+    """
+    if workers <= 1:
+        for chunk in chunks:
+            yield len(chunk), score_chunk(chunk)
+        return
+
+    with multiprocessing.get_context('fork').Pool(workers) as pool:
+        pending = collections.deque()
+        for chunk in chunks:
+            pending.append((len(chunk), pool.apply_async(score_chunk, (chunk,))))
+            if len(pending) >= 2 * workers:
+                rows, result = pending.popleft()
+                yield rows, result.get()
+        while pending:
+            rows, result = pending.popleft()
+            yield rows, result.get()
+
+
+def main():
+    global api, model_keys
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('input')
+    parser.add_argument('output')
+    parser.add_argument('--chunk-size', type=int, default=10000, help='rows read and scored at a time')
+    parser.add_argument('--workers', type=int, default=1, help='worker processes (default: score in-process)')
+    parser.add_argument('--input-format', choices=('csv', 'ndjson'), help='default: from the file extension')
+    parser.add_argument('--format', choices=('csv', 'ndjson'), help='output format (default: from the extension)')
+    parser.add_argument('--models', help='comma-separated subset of the enabled models to run and '
+                                         'ensemble (default: all)')
+    args = parser.parse_args()
+
+    # Score in constant memory, with no lookup table or per-row cache
+    os.environ.setdefault('PREDICTION_CACHE_SIZE', '0')
+    os.environ.pop('LOOKUP_TABLE_PATH', None)
+    # Unpickling version warnings, and feature-name warnings from scoring bare arrays
+    warnings.filterwarnings('ignore', category=UserWarning)
+    import api
+    api.wait_until_ready()
+
+    enabled = api.model_set.current().enabled
+    model_keys = [key.strip() for key in args.models.split(',')] if args.models else list(enabled)
+    unavailable = [key for key in model_keys if key not in enabled]
+    if unavailable:
+        parser.error(f"models not available: {', '.join(unavailable)} (enabled: {', '.join(enabled)})")
+
+    input_format = file_format(args.input, args.input_format)
+    output_format = file_format(args.output, args.format)
+    started = time.perf_counter()
+    total = 0
+    unknown = collections.Counter()
+    with open(args.output, 'w', newline='') as f:
+        chunks = read_chunks(args.input, input_format, args.chunk_size)
+        for rows, (frame, chunk_unknown) in score_chunks(chunks, args.workers):
+            unknown.update(chunk_unknown)
+            write_chunk(frame, f, output_format, first=total == 0)
+            total += rows
+            elapsed = time.perf_counter() - started
+            print(f"\r{total:,} rows, {total / elapsed:,.0f} rows/s", end='', file=sys.stderr, flush=True)
+
+    elapsed = time.perf_counter() - started
+    # ru_maxrss is in KB. RUSAGE_CHILDREN covers the workers once the pool has
+    # reaped them: the peak of the largest one, not their sum
+    peak = f"peak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB main"
+    if args.workers > 1:
+        peak += (f", {resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024:.0f} MB "
+                 f"largest of {args.workers} workers")
+    print(f"\rScored {total:,} rows with {', '.join(model_keys)} in {elapsed:.2f}s "
+          f"({total / elapsed if elapsed else 0:,.0f} rows/s, {peak}) -> {args.output}",
+          file=sys.stderr)
+    unknown = {key: count for key, count in unknown.items() if count}
+    if unknown:
+        print("Categories not in the feature spec, encoded as its defaults: " +
+              ', '.join(f"{key} {count:,}" for key, count in sorted(unknown.items())), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
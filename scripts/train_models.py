@@ -0,0 +1,74 @@
+"""
+Train the Random Forest, XGBoost and Logistic Regression models from the CSV.
+
+Reproduces notebooks/depression.ipynb from the command line (see
+training/pipeline.py) and writes a versioned run directory:
+
+    models/runs/<version>/
+        random_forest.pkl  random_forest.npz  xgboost.pkl  xgboost.ubj
+        logistic_regression.pkl  standard_scaler.pkl  manifest.json
+
+manifest.json records the data hash, git commit, best parameters, CV and
+test metrics, timings, library versions and a SHA-256 per artifact.
+--install copies the run into models/ for the API.
+
+--search halving replaces the exhaustive grids with successive halving and
+lets XGBoost pick its number of trees by early stopping (see
+benchmarks/bench_training_search.py for the comparison).
+
+Usage:
+    python scripts/train_models.py [--models rf,xgb,lr] [--jobs -1] [--quick]
+        [--search grid|halving] [--version NAME] [--output-dir models/runs]
+        [--install] [--no-cache]
+"""
+import argparse
+import os
+import sys
+import warnings
+
+base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(base_path, 'api'))
+sys.path.insert(0, base_path)
+
+from training.dataset import DATA_PATH
+from training.pipeline import DEFAULT_CACHE_DIR, SEARCH_STRATEGIES, SEARCHES, install, train
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--data', default=DATA_PATH)
+    parser.add_argument('--output-dir', default=os.path.join(base_path, 'models', 'runs'))
+    parser.add_argument('--version', help='run name (default: timestamp)')
+    parser.add_argument('--models', default='rf,xgb,lr', help='comma-separated subset of rf,xgb,lr')
+    parser.add_argument('--search', choices=SEARCH_STRATEGIES, default='grid',
+                        help='exhaustive grid (as in the notebook) or successive halving')
+    parser.add_argument('--cv', type=int, default=5, help='cross-validation folds')
+    parser.add_argument('--jobs', type=int, default=-1, help='worker processes shared by the searches')
+    parser.add_argument('--sequential', action='store_true', help='run the searches one after another')
+    parser.add_argument('--quick', action='store_true', help='one grid point per model, for smoke runs')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--no-cache', action='store_true', help='recompute the cleaned data and folds')
+    parser.add_argument('--install', action='store_true', help='copy the artifacts into models/')
+    args = parser.parse_args()
+
+    keys = [key.strip() for key in args.models.split(',') if key.strip()]
+    unknown = [key for key in keys if key not in SEARCHES]
+    if unknown:
+        parser.error(f"unknown models: {', '.join(unknown)}")
+
+    # Convergence and deprecation chatter from hundreds of fits
+    warnings.filterwarnings('ignore', category=UserWarning)
+    warnings.filterwarnings('ignore', category=FutureWarning)
+
+    run_dir = train(args.data, args.output_dir, keys, version=args.version, n_splits=args.cv,
+                    n_jobs=args.jobs, quick=args.quick, concurrent=not args.sequential,
+                    cache_dir=None if args.no_cache else args.cache_dir, strategy=args.search)
+    print(f"Wrote {run_dir}")
+
+    if args.install:
+        install(run_dir, os.path.join(base_path, 'models'))
+        print(f"Installed {os.path.basename(run_dir)} into models/")
+
+
+if __name__ == '__main__':
+    main()
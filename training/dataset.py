@@ -0,0 +1,123 @@
+"""
+Dataset loading and preprocessing, as done in notebooks/depression.ipynb.
+"""
+import os
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import LabelEncoder
+
+base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_PATH = os.path.join(base_path, 'data', 'student_depression_dataset.csv')
+
+SLEEP_MAP = {
+    "Less than 5 hours": 0,
+    "5-6 hours": 1,
+    "7-8 hours": 2,
+    "More than 8 hours": 3,
+    "Others": 4
+}
+
+BINARY_MAP = {'Yes': 1, 'No': 0}
+
+LABEL_ENCODED = ['gender', 'dietary_habits', 'degree']
+
+NUM_COLS = ['age', 'academic_pressure', 'work_pressure', 'cgpa',
+            'study_satisfaction', 'job_satisfaction', 'work/study_hours', 'financial_stress']
+
+DROPPED = ['id', 'city', 'profession', 'gender', 'work_pressure', 'job_satisfaction']
+
+TARGET = 'depression'
+
+# Engineered features: (name, operation, input features); 'mul' multiplies
+# two features and 'sum' adds them all
+DERIVED_FEATURES = [
+    ('academic_stress_combo', 'mul', ['academic_pressure', 'financial_stress']),
+    ('burnout_index', 'mul', ['academic_pressure', 'work/study_hours']),
+    ('wellness_score', 'sum', ['study_satisfaction', 'sleep_duration', 'dietary_habits'])
+]
+
+# Same split as the notebook
+TEST_SIZE = 0.2
+RANDOM_STATE = 42
+
+
+def clean(data):
+    """
+    Normalize the column names and strip quotes and spaces from the text
+    values, before anything is encoded.
+    """
+    data = data.copy()
+    data.columns = (
+        data.columns
+        .str.strip()
+        .str.lower()
+        .str.replace(' ', '_', regex=False)
+        .str.replace('?', '', regex=False)
+    )
+    data.rename(columns={'have_you_ever_had_suicidal_thoughts_': 'suicidal_thoughts',
+                         'family_history_of_mental_illness': 'illness_history'}, inplace=True)
+
+    for col in data.select_dtypes(include=['object', 'string']).columns:
+        data[col] = data[col].str.strip("'").str.strip()
+    return data
+
+
+def category_codes(data):
+    """
+    Integer code of every category, per categorical column of the cleaned
+    data: the fixed sleep and yes/no maps, and LabelEncoder's alphabetical
+    codes for the label-encoded columns.
+    """
+    codes = {
+        'sleep_duration': dict(SLEEP_MAP),
+        'suicidal_thoughts': dict(BINARY_MAP),
+        'illness_history': dict(BINARY_MAP)
+    }
+    for col in LABEL_ENCODED:
+        classes = LabelEncoder().fit(data[col]).classes_
+        codes[col] = {str(category): code for code, category in enumerate(classes)}
+    return codes
+
+
+def preprocess(data):
+    """
+    Clean the raw dataset into the model feature matrix X and target y.
+    """
+    data = clean(data)
+
+    for col, mapping in category_codes(data).items():
+        data[col] = data[col].map(mapping)
+
+    for col in NUM_COLS:
+        data[col] = data[col].replace('?', np.nan)  # Replace ? with NaN
+        data[col] = pd.to_numeric(data[col], errors='coerce')
+    data[NUM_COLS] = data[NUM_COLS].fillna(data[NUM_COLS].mean())
+
+    data = data.drop(columns=DROPPED)
+
+    for name, op, inputs in DERIVED_FEATURES:
+        if op == 'mul':
+            data[name] = data[inputs[0]] * data[inputs[1]]
+        else:
+            data[name] = data[inputs[0]]
+            for col in inputs[1:]:
+                data[name] = data[name] + data[col]
+
+    X = data.drop(columns=[TARGET])
+    y = data[TARGET]
+    return X, y
+
+
+def load_dataset(path=DATA_PATH):
+    """
+    Read and preprocess the CSV; returns (X, y).
+    """
+    return preprocess(pd.read_csv(path))
+
+
+def split_dataset(X, y):
+    """
+    The notebook's train/test split: (X_train, X_test, y_train, y_test).
+    """
+    return train_test_split(X, y, test_size=TEST_SIZE, random_state=RANDOM_STATE)
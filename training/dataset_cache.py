@@ -0,0 +1,99 @@
+"""
+On-disk cache of the preprocessed dataset, so training and evaluation runs
+skip re-parsing and re-cleaning the CSV.
+
+preprocess() runs once per (CSV content, preprocessing code) pair and its
+output is written as plain .npy files:
+
+    .cache/training/dataset-<key>/
+        X.npy       float64 feature matrix, column-major (each feature contiguous)
+        y.npy       int64 target
+        meta.json   column names, row count and the hashes behind <key>
+
+Later loads memory-map X.npy and wrap it in a DataFrame without copying: a
+column-major (rows, features) array is exactly the layout of a pandas block.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+
+from training import dataset
+from training.dataset import DATA_PATH, TARGET, base_path
+
+CACHE_DIR = os.path.join(base_path, '.cache', 'training')
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_key(data_sha256):
+    """
+    Key for one CSV version preprocessed by one version of training/dataset.py,
+    so editing either the data or the cleaning code invalidates the cache.
+    """
+    code_sha256 = file_sha256(dataset.__file__)
+    return hashlib.sha256(f"{data_sha256}:{code_sha256}".encode()).hexdigest()[:16]
+
+
+def write_dataset_cache(X, y, cache_path, meta):
+    """
+    Write X, y and meta to cache_path atomically: the files are written to a
+    temporary directory that is renamed into place, so a concurrent or
+    interrupted run never sees a partial cache.
+    """
+    parent = os.path.dirname(cache_path)
+    os.makedirs(parent, exist_ok=True)
+    tmp_path = tempfile.mkdtemp(prefix='.tmp-', dir=parent)
+    os.chmod(tmp_path, 0o755)
+    try:
+        np.save(os.path.join(tmp_path, 'X.npy'), np.asfortranarray(X.to_numpy(dtype=np.float64)))
+        np.save(os.path.join(tmp_path, 'y.npy'), y.to_numpy(dtype=np.int64))
+        with open(os.path.join(tmp_path, 'meta.json'), 'w') as f:
+            json.dump({**meta, 'columns': list(X.columns), 'rows': len(X)}, f, indent=2)
+        os.rename(tmp_path, cache_path)
+    except OSError:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        if not os.path.isdir(cache_path):
+            raise
+
+
+def read_dataset_cache(cache_path):
+    """
+    Memory-map a cached dataset; returns (X, y) backed by the .npy files.
+    """
+    with open(os.path.join(cache_path, 'meta.json')) as f:
+        meta = json.load(f)
+    X = np.load(os.path.join(cache_path, 'X.npy'), mmap_mode='r')
+    y = np.load(os.path.join(cache_path, 'y.npy'), mmap_mode='r')
+    if X.shape != (meta['rows'], len(meta['columns'])) or y.shape != (meta['rows'],):
+        raise ValueError(f"Cached dataset in {cache_path} does not match its meta.json")
+    return (pd.DataFrame(X, columns=meta['columns'], copy=False),
+            pd.Series(y, name=TARGET, copy=False))
+
+
+def load_cached_dataset(path=DATA_PATH, cache_dir=CACHE_DIR):
+    """
+    Preprocessed (X, y) for the CSV at path, read from cache_dir when it is
+    there and built (then cached) otherwise. Returns (X, y, data_sha256).
+    Pass cache_dir=None to preprocess without caching.
+    """
+    data_sha256 = file_sha256(path)
+    if not cache_dir:
+        X, y = dataset.load_dataset(path)
+        return X, y, data_sha256
+
+    cache_path = os.path.join(cache_dir, f"dataset-{cache_key(data_sha256)}")
+    if not os.path.isdir(cache_path):
+        X, y = dataset.load_dataset(path)
+        write_dataset_cache(X, y, cache_path, {'source': os.path.basename(path), 'sha256': data_sha256})
+    X, y = read_dataset_cache(cache_path)
+    return X, y, data_sha256
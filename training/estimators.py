@@ -0,0 +1,53 @@
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.model_selection import train_test_split
+from xgboost import XGBClassifier
+
+
+class EarlyStoppingXGBClassifier(ClassifierMixin, BaseEstimator):
+    """
+    XGBoost classifier that picks its own number of boosting rounds.
+
+    fit() holds out a stratified validation_fraction of the rows it is given
+    and stops adding trees once the validation log loss has not improved for
+    early_stopping_rounds, so n_estimators is only an upper bound. Inside a
+    CV search the validation rows come from the training fold, never from the
+    fold being scored. Uses the histogram tree method.
+
+    The fitted XGBClassifier is model_; it is what gets saved for the API
+    (predict_proba and the tree engine both stop at its best_iteration).
+    """
+
+    def __init__(self, n_estimators=1000, max_depth=6, learning_rate=0.1, subsample=1.0,
+                 colsample_bytree=1.0, early_stopping_rounds=20, validation_fraction=0.1,
+                 tree_method='hist', n_jobs=1, random_state=None):
+        self.n_estimators = n_estimators
+        self.max_depth = max_depth
+        self.learning_rate = learning_rate
+        self.subsample = subsample
+        self.colsample_bytree = colsample_bytree
+        self.early_stopping_rounds = early_stopping_rounds
+        self.validation_fraction = validation_fraction
+        self.tree_method = tree_method
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+
+    def fit(self, X, y):
+        X_fit, X_val, y_fit, y_val = train_test_split(X, y, test_size=self.validation_fraction,
+                                                      stratify=y, random_state=self.random_state)
+        self.model_ = XGBClassifier(n_estimators=self.n_estimators, max_depth=self.max_depth,
+                                    learning_rate=self.learning_rate, subsample=self.subsample,
+                                    colsample_bytree=self.colsample_bytree, tree_method=self.tree_method,
+                                    early_stopping_rounds=self.early_stopping_rounds,
+                                    eval_metric='logloss', n_jobs=self.n_jobs,
+                                    random_state=self.random_state)
+        self.model_.fit(X_fit, y_fit, eval_set=[(X_val, y_val)], verbose=False)
+        self.classes_ = self.model_.classes_
+        self.n_features_in_ = self.model_.n_features_in_
+        self.best_iteration_ = int(self.model_.best_iteration)
+        return self
+
+    def predict_proba(self, X):
+        return self.model_.predict_proba(X)
+
+    def predict(self, X):
+        return self.model_.predict(X)
@@ -0,0 +1,76 @@
+"""
+The feature spec: how a raw request becomes a model input row, written by
+training and compiled by the API (api/features.py), so the category codes
+the API uses are the ones the models were trained with.
+
+feature_spec.json holds the training column order, and per base feature its
+request key and either the category -> code table and default code
+(categorical) or the training mean (numeric), plus the derived features'
+formulas.
+"""
+import datetime
+import json
+import pandas as pd
+
+from training.dataset import DERIVED_FEATURES, NUM_COLS, category_codes, clean, preprocess
+
+# Bump when the layout of feature_spec.json changes; the API refuses other versions
+FEATURE_SPEC_VERSION = 1
+
+FEATURE_SPEC_FILE = 'feature_spec.json'
+
+# Request keys that differ from the feature name
+REQUEST_KEYS = {'work/study_hours': 'work_study_hours'}
+
+# Category a categorical feature falls back to when a value is not in its
+# table (the API rejects such requests; offline scoring encodes them as this).
+# Chosen to be neutral, as the API's original maps were (no, 5-6 hours), not
+# the most frequent category: the most frequent suicidal_thoughts is "Yes".
+CATEGORY_DEFAULTS = {
+    'sleep_duration': '5-6 hours',
+    'dietary_habits': 'Others',
+    'degree': 'Others',
+    'suicidal_thoughts': 'No',
+    'illness_history': 'No'
+}
+
+
+def build_feature_spec(raw_data, data_sha256=None):
+    """
+    Feature spec for models trained on raw_data (the CSV as read by pandas).
+    A categorical feature's default is the code of its CATEGORY_DEFAULTS
+    entry; a categorical feature without one is an error.
+    """
+    data = clean(raw_data)
+    codes = category_codes(data)
+    X, _ = preprocess(raw_data)
+    derived = {name for name, _, _ in DERIVED_FEATURES}
+
+    features = []
+    for name in X.columns:
+        if name in derived:
+            continue
+        feature = {'name': name, 'key': REQUEST_KEYS.get(name, name)}
+        if name in codes:
+            feature['type'] = 'categorical'
+            feature['categories'] = codes[name]
+            feature['default'] = codes[name][CATEGORY_DEFAULTS[name]]
+        else:
+            feature['type'] = 'numeric'
+            if name in NUM_COLS:
+                feature['mean'] = float(pd.to_numeric(data[name], errors='coerce').mean())
+        features.append(feature)
+
+    return {
+        'spec_version': FEATURE_SPEC_VERSION,
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'data_sha256': data_sha256,
+        'feature_names': list(X.columns),
+        'features': features,
+        'derived': [{'name': name, 'op': op, 'inputs': list(inputs)} for name, op, inputs in DERIVED_FEATURES]
+    }
+
+
+def write_feature_spec(spec, path):
+    with open(path, 'w') as f:
+        json.dump(spec, f, indent=2)
@@ -0,0 +1,347 @@
+"""
+Training pipeline: hyperparameter searches, evaluation and versioned artifacts.
+
+Mirrors notebooks/depression.ipynb (same preprocessing, split, grids and
+ROC AUC model selection) with three changes to the cost:
+  - the cleaned matrix is computed once and memory-mapped from an on-disk
+    cache afterwards (training/dataset_cache.py)
+  - every search scores accuracy and ROC AUC in the same CV pass, instead of
+    refitting the same folds with cross_val_score afterwards
+  - the searches run concurrently and share one worker pool, so the cores
+    stay busy across all three instead of idling at the end of each sweep
+With search='halving' the exhaustive grids are replaced by successive
+halving, and XGBoost stops boosting early on a validation split.
+"""
+import datetime
+import json
+import os
+import platform
+import shutil
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+import xgboost
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, roc_auc_score
+from sklearn.model_selection import GridSearchCV, HalvingGridSearchCV, StratifiedKFold
+from sklearn.preprocessing import StandardScaler
+from xgboost import XGBClassifier
+
+from training.dataset import RANDOM_STATE, base_path, split_dataset
+from training.dataset_cache import CACHE_DIR, file_sha256, load_cached_dataset
+from training.estimators import EarlyStoppingXGBClassifier
+from training.feature_spec import FEATURE_SPEC_FILE, build_feature_spec, write_feature_spec
+
+# Model key -> (display name, estimator factory, notebook grid, trained on standardized features)
+SEARCHES = {
+    'rf': (
+        'Random Forest',
+        lambda: RandomForestClassifier(random_state=RANDOM_STATE),
+        {
+            'n_estimators': [100, 200],
+            'max_depth': [None, 10, 20],
+            'min_samples_split': [2, 5]
+        },
+        False
+    ),
+    'xgb': (
+        'XGBoost',
+        # One thread per fit: the parallelism comes from running fits side by side
+        lambda: XGBClassifier(random_state=RANDOM_STATE, eval_metric='logloss', n_jobs=1),
+        {
+            'n_estimators': [100, 200],
+            'max_depth': [3, 6, 9],
+            'learning_rate': [0.01, 0.1],
+            'subsample': [0.8, 1.0],
+            'colsample_bytree': [0.8, 1.0]
+        },
+        False
+    ),
+    'lr': (
+        'Logistic Regression',
+        lambda: LogisticRegression(random_state=RANDOM_STATE, max_iter=1000),
+        {
+            'penalty': ['l1', 'l2'],
+            'C': [0.001, 0.01, 0.1, 1, 10, 100],
+            'solver': ['liblinear']
+        },
+        True
+    )
+}
+
+# Successive halving (search='halving'): every candidate is first scored on
+# a small share of the training rows and only the best 1/HALVING_FACTOR go on
+# to HALVING_FACTOR times as many rows. Models listed here also swap their
+# estimator and grid; XGBoost picks n_estimators itself by early stopping,
+# so it leaves the grid and becomes a cap.
+HALVING_FACTOR = 3
+HALVING_SEARCHES = {
+    'xgb': (
+        lambda: EarlyStoppingXGBClassifier(n_estimators=400, random_state=RANDOM_STATE),
+        {
+            'max_depth': [3, 6, 9],
+            'learning_rate': [0.01, 0.1],
+            'subsample': [0.8, 1.0],
+            'colsample_bytree': [0.8, 1.0]
+        }
+    )
+}
+
+SEARCH_STRATEGIES = ('grid', 'halving')
+
+# One point per grid, for smoke runs (--quick)
+QUICK_GRIDS = {
+    'rf': {'n_estimators': [50], 'max_depth': [10], 'min_samples_split': [2]},
+    'xgb': {'n_estimators': [100], 'max_depth': [3], 'learning_rate': [0.1]},
+    'lr': {'penalty': ['l2'], 'C': [1], 'solver': ['liblinear']}
+}
+
+# Artifact file names, as the API expects them in models/
+ARTIFACT_NAMES = {
+    'rf': 'random_forest.pkl',
+    'xgb': 'xgboost.pkl',
+    'lr': 'logistic_regression.pkl',
+    'scaler': 'standard_scaler.pkl'
+}
+
+DEFAULT_CACHE_DIR = CACHE_DIR
+
+SCORING = {'roc_auc': 'roc_auc', 'accuracy': 'accuracy'}
+
+
+def prepare_data(data_path, n_splits=5, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    The notebook's train/test split of the preprocessed dataset (read from
+    cache_dir when cached) and the CV folds over the training rows.
+    Pass cache_dir=None to always preprocess the CSV.
+    """
+    X, y, data_sha256 = load_cached_dataset(data_path, cache_dir)
+    X_train, X_test, y_train, y_test = split_dataset(X, y)
+    # The same splits GridSearchCV(cv=n_splits) makes for a classifier
+    folds = list(StratifiedKFold(n_splits=n_splits).split(X_train, y_train))
+    return data_sha256, (X_train, X_test, y_train, y_test, folds)
+
+
+def search_grid(key, strategy='grid'):
+    """
+    The parameter grid a strategy searches for one model.
+    """
+    if strategy == 'halving' and key in HALVING_SEARCHES:
+        return HALVING_SEARCHES[key][1]
+    return SEARCHES[key][2]
+
+
+def run_search(key, X, y, folds, param_grid, n_jobs, strategy='grid'):
+    """
+    Grid search scoring ROC AUC (used to pick the model, as in the notebook)
+    and accuracy in the same pass over the folds. With strategy='halving',
+    successive halving on ROC AUC alone (it ranks on a single metric).
+    """
+    _, make_estimator, _, _ = SEARCHES[key]
+    if strategy == 'halving':
+        if key in HALVING_SEARCHES:
+            make_estimator = HALVING_SEARCHES[key][0]
+        search = HalvingGridSearchCV(make_estimator(), param_grid, cv=folds, scoring='roc_auc',
+                                     factor=HALVING_FACTOR, random_state=RANDOM_STATE, n_jobs=n_jobs)
+    else:
+        search = GridSearchCV(make_estimator(), param_grid, cv=folds, scoring=SCORING,
+                              refit='roc_auc', n_jobs=n_jobs)
+    started = time.perf_counter()
+    search.fit(X, y)
+    return search, time.perf_counter() - started
+
+
+def run_searches(keys, X_train, X_train_scaled, y_train, folds, grids, n_jobs=-1, concurrent=True,
+                 strategy='grid'):
+    """
+    Run the searches for keys, concurrently by default.
+    Returns {key: (fitted search, wall seconds)}.
+    """
+    def run(key):
+        X = X_train_scaled if SEARCHES[key][3] else X_train
+        return key, run_search(key, X, y_train, folds, grids[key], n_jobs, strategy)
+
+    if not concurrent:
+        return dict(run(key) for key in keys)
+    # Each search hands its fits to joblib's shared worker pool, so the
+    # fits of all three searches interleave
+    with ThreadPoolExecutor(max_workers=len(keys)) as pool:
+        return dict(pool.map(run, keys))
+
+
+def cv_summary(search):
+    """
+    Best parameters and their CV scores, read from the single CV pass.
+    Halving searches score ROC AUC only, on the rows of their last iteration.
+    """
+    best = search.best_index_
+    results = search.cv_results_
+    metric = 'roc_auc' if 'mean_test_roc_auc' in results else 'score'
+    summary = {
+        'best_params': search.best_params_,
+        'cv_roc_auc_mean': float(results[f'mean_test_{metric}'][best]),
+        'cv_roc_auc_std': float(results[f'std_test_{metric}'][best])
+    }
+    if 'mean_test_accuracy' in results:
+        summary['cv_accuracy_mean'] = float(results['mean_test_accuracy'][best])
+        summary['cv_accuracy_std'] = float(results['std_test_accuracy'][best])
+    if isinstance(search, HalvingGridSearchCV):
+        summary['candidates'] = int(search.n_candidates_[0])
+        summary['halving'] = {
+            'candidates': [int(n) for n in search.n_candidates_],
+            'rows': [int(n) for n in search.n_resources_]
+        }
+    else:
+        summary['candidates'] = len(results['params'])
+    summary['fits'] = len(results['params']) * search.n_splits_
+    return summary
+
+
+def serving_model(model):
+    """
+    The estimator that is saved for the API: the plain XGBClassifier inside
+    an early-stopping wrapper, otherwise the model itself.
+    """
+    if isinstance(model, EarlyStoppingXGBClassifier):
+        return model.model_
+    return model
+
+
+def test_metrics(model, X_test, y_test):
+    return {
+        'test_accuracy': float(accuracy_score(y_test, model.predict(X_test))),
+        'test_roc_auc': float(roc_auc_score(y_test, model.predict_proba(X_test)[:, 1]))
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=base_path,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def train(data_path, output_dir, keys=('rf', 'xgb', 'lr'), version=None, n_splits=5, n_jobs=-1,
+          quick=False, concurrent=True, cache_dir=DEFAULT_CACHE_DIR, strategy='grid', log=print):
+    """
+    Train the selected models and write them with a manifest to
+    output_dir/<version>/. Returns the path of that directory.
+    """
+    version = version or datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+    run_dir = os.path.join(output_dir, version)
+    if os.path.exists(run_dir):
+        raise FileExistsError(f"{run_dir} already exists")
+
+    started = time.perf_counter()
+    data_sha256, (X_train, X_test, y_train, y_test, folds) = prepare_data(data_path, n_splits, cache_dir)
+    prepare_seconds = time.perf_counter() - started
+    log(f"Data: {len(X_train) + len(X_test):,} rows, {X_train.shape[1]} features, "
+        f"{n_splits} folds ({prepare_seconds:.2f}s)")
+
+    # Standardize for Logistic Regression, fitted on the training split as in the notebook
+    scaler = StandardScaler().fit(X_train)
+    X_train_scaled = scaler.transform(X_train)
+    X_test_scaled = scaler.transform(X_test)
+
+    grids = QUICK_GRIDS if quick else {key: search_grid(key, strategy) for key in SEARCHES}
+    search_started = time.perf_counter()
+    searches = run_searches(list(keys), X_train, X_train_scaled, y_train, folds, grids, n_jobs, concurrent,
+                            strategy)
+    search_seconds = time.perf_counter() - search_started
+
+    os.makedirs(run_dir)
+    artifacts = {}
+    models = {}
+    fitted = {}
+    for key in keys:
+        search, seconds = searches[key]
+        model = fitted[key] = serving_model(search.best_estimator_)
+        X_eval = X_test_scaled if SEARCHES[key][3] else X_test
+        models[key] = {
+            'name': SEARCHES[key][0],
+            **cv_summary(search),
+            **test_metrics(model, X_eval, y_test),
+            'search_seconds': seconds
+        }
+        if isinstance(search.best_estimator_, EarlyStoppingXGBClassifier):
+            models[key]['best_iteration'] = search.best_estimator_.best_iteration_
+        joblib.dump(model, os.path.join(run_dir, ARTIFACT_NAMES[key]))
+        artifacts[key] = [ARTIFACT_NAMES[key]]
+        log(f"{SEARCHES[key][0]}: {models[key]['best_params']} "
+            f"CV AUC {models[key]['cv_roc_auc_mean']:.4f}, test AUC {models[key]['test_roc_auc']:.4f} "
+            f"({seconds:.1f}s)")
+
+    joblib.dump(scaler, os.path.join(run_dir, ARTIFACT_NAMES['scaler']))
+    artifacts['scaler'] = [ARTIFACT_NAMES['scaler']]
+
+    # How the API must encode requests for these models
+    write_feature_spec(build_feature_spec(pd.read_csv(data_path), data_sha256),
+                       os.path.join(run_dir, FEATURE_SPEC_FILE))
+    artifacts['feature_spec'] = [FEATURE_SPEC_FILE]
+
+    # Serving formats the API prefers: native XGBoost and the compact forest
+    if 'xgb' in keys:
+        fitted['xgb'].save_model(os.path.join(run_dir, 'xgboost.ubj'))
+        artifacts['xgb'].append('xgboost.ubj')
+    if 'rf' in keys:
+        from tree_engine import load_random_forest_ensemble, save_compact_ensemble
+        save_compact_ensemble(load_random_forest_ensemble(fitted['rf']),
+                              os.path.join(run_dir, 'random_forest.npz'),
+                              {'created': datetime.datetime.now().isoformat(timespec='seconds'),
+                               'source': ARTIFACT_NAMES['rf'], 'version': version})
+        artifacts['rf'].append('random_forest.npz')
+
+    manifest = {
+        'version': version,
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'git_commit': git_commit(),
+        'data': {
+            'path': os.path.relpath(data_path, base_path),
+            'sha256': data_sha256,
+            'train_rows': len(X_train),
+            'test_rows': len(X_test),
+            'cv_folds': n_splits,
+            'random_state': RANDOM_STATE
+        },
+        'feature_names': list(X_train.columns),
+        'quick': quick,
+        'search': strategy,
+        'timings': {
+            'prepare_seconds': prepare_seconds,
+            'search_seconds': search_seconds,
+            'total_seconds': time.perf_counter() - started
+        },
+        'models': models,
+        'files': {
+            filename: file_sha256(os.path.join(run_dir, filename))
+            for names in artifacts.values() for filename in names
+        },
+        'environment': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'scikit-learn': sklearn.__version__,
+            'xgboost': xgboost.__version__
+        }
+    }
+    with open(os.path.join(run_dir, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return run_dir
+
+
+def install(run_dir, models_path):
+    """
+    Copy a trained run's artifacts and manifest into models/, where the API loads them.
+    """
+    with open(os.path.join(run_dir, 'manifest.json')) as f:
+        manifest = json.load(f)
+    for filename in list(manifest['files']) + ['manifest.json']:
+        shutil.copy2(os.path.join(run_dir, filename), os.path.join(models_path, filename))
+    return manifest